@@ -0,0 +1,37 @@
+"""
+Alembic environment for the IndoHomz backend
+
+setup.migrate() runs `upgrade head` on its own connection (passed in as
+config.attributes["connection"]); from the command line (`alembic upgrade
+head` in backend/) the app's configured database is used.
+"""
+
+from alembic import context
+
+from app.database import models
+
+config = context.config
+target_metadata = models.Base.metadata
+
+
+def run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations(connection)
+        return
+
+    from app.database.connection import engine
+    with engine.begin() as connection:
+        run_migrations(connection)
+
+
+if context.is_offline_mode():
+    # Revisions inspect the live schema (and share DDL with app/database/fulltext.py)
+    raise RuntimeError("Offline (--sql) migrations are not supported; run them against the database")
+run_migrations_online()
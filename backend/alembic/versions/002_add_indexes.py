@@ -1,16 +1,20 @@
 """Add database indexes for performance
 
 Revision ID: 002
-Revises: 001
+Revises:
 Create Date: 2025-12-23
 
+Base revision: the tables themselves come from the models (create_all in
+app/database/setup.py). Like every revision here it skips what already
+exists, so it applies to new and existing databases alike.
+
 """
 from alembic import op
 
 
 # revision identifiers
 revision = '002'
-down_revision = '001'
+down_revision = None
 branch_labels = None
 depends_on = None
 
@@ -19,36 +23,36 @@ def upgrade():
     """Add performance indexes"""
     
     # Properties table indexes
-    op.create_index('idx_properties_city', 'properties', ['city'])
-    op.create_index('idx_properties_is_available', 'properties', ['is_available'])
-    op.create_index('idx_properties_property_type', 'properties', ['property_type'])
-    op.create_index('idx_properties_created_at', 'properties', ['created_at'])
-    op.create_index('idx_properties_slug', 'properties', ['slug'], unique=True)
+    op.create_index('idx_properties_city', 'properties', ['city'], if_not_exists=True)
+    op.create_index('idx_properties_is_available', 'properties', ['is_available'], if_not_exists=True)
+    op.create_index('idx_properties_property_type', 'properties', ['property_type'], if_not_exists=True)
+    op.create_index('idx_properties_created_at', 'properties', ['created_at'], if_not_exists=True)
+    op.create_index('idx_properties_slug', 'properties', ['slug'], unique=True, if_not_exists=True)
     
     # Composite index for common query (available properties in a city)
     op.create_index(
         'idx_properties_city_available',
         'properties',
-        ['city', 'is_available']
+        ['city', 'is_available'], if_not_exists=True
     )
     
     # Leads table indexes
-    op.create_index('idx_leads_status', 'leads', ['status'])
-    op.create_index('idx_leads_property_id', 'leads', ['property_id'])
-    op.create_index('idx_leads_created_at', 'leads', ['created_at'])
-    op.create_index('idx_leads_phone', 'leads', ['phone'])
+    op.create_index('idx_leads_status', 'leads', ['status'], if_not_exists=True)
+    op.create_index('idx_leads_property_id', 'leads', ['property_id'], if_not_exists=True)
+    op.create_index('idx_leads_created_at', 'leads', ['created_at'], if_not_exists=True)
+    op.create_index('idx_leads_phone', 'leads', ['phone'], if_not_exists=True)
     
     # Composite index for property leads
     op.create_index(
         'idx_leads_property_status',
         'leads',
-        ['property_id', 'status']
+        ['property_id', 'status'], if_not_exists=True
     )
     
     # Bookings table indexes
-    op.create_index('idx_bookings_property_id', 'bookings', ['property_id'])
-    op.create_index('idx_bookings_status', 'bookings', ['status'])
-    op.create_index('idx_bookings_created_at', 'bookings', ['created_at'])
+    op.create_index('idx_bookings_property_id', 'bookings', ['property_id'], if_not_exists=True)
+    op.create_index('idx_bookings_status', 'bookings', ['status'], if_not_exists=True)
+    op.create_index('idx_bookings_created_at', 'bookings', ['created_at'], if_not_exists=True)
 
 
 def downgrade():
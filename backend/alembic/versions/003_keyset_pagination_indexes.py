@@ -0,0 +1,29 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add keyset pagination indexes"""
+    op.create_index('idx_property_created_id', 'properties', ['created_at', 'id'], if_not_exists=True)
+    op.create_index('idx_lead_created_id', 'leads', ['created_at', 'id'], if_not_exists=True)
+    op.create_index('idx_booking_created_id', 'bookings', ['created_at', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    """Remove keyset pagination indexes"""
+    op.drop_index('idx_property_created_id')
+    op.drop_index('idx_lead_created_id')
+    op.drop_index('idx_booking_created_id')
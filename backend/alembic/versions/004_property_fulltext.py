@@ -0,0 +1,40 @@
+"""Add full-text search index for properties
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+PostgreSQL gets a GIN index over a weighted tsvector expression (kept current
+by Postgres itself). SQLite gets an FTS5 external-content table plus triggers.
+The DDL lives in app/database/fulltext.py, which skips what exists and falls
+back to ILIKE search where the index cannot be built.
+"""
+from alembic import op
+
+from app.database.fulltext import ensure_fulltext_index
+
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the full-text index"""
+    ensure_fulltext_index(op.get_bind())
+
+
+def downgrade():
+    """Drop the full-text index"""
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS idx_property_fts")
+    
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_ai")
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_au")
+        op.execute("DROP TABLE IF EXISTS properties_fts")
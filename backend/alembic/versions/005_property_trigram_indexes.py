@@ -0,0 +1,37 @@
+"""Add pg_trgm indexes for city/location substring filters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+PostgreSQL only: B-tree indexes cannot serve ILIKE '%...%', trigram GIN
+indexes can. Other databases are left unchanged.
+"""
+from alembic import op
+
+from app.database.fulltext import ensure_fulltext_index
+
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add trigram indexes"""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    # Created with the full-text index; skipped (with a warning) without the privileges for pg_trgm
+    ensure_fulltext_index(op.get_bind())
+
+
+def downgrade():
+    """Remove trigram indexes"""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute("DROP INDEX IF EXISTS idx_property_city_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_property_location_trgm")
@@ -0,0 +1,38 @@
+"""Add property coordinates and geohash index
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add latitude/longitude and the geohash column used for map search"""
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns('properties')}
+    for column in (
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        # Byte-order comparison for geohash prefix range scans (see app/utils/geo.py)
+        sa.Column('geohash', sa.String(length=12).with_variant(sa.String(length=12, collation='C'), 'postgresql'), nullable=True),
+    ):
+        if column.name not in existing:
+            op.add_column('properties', column)
+    op.create_index('ix_properties_geohash', 'properties', ['geohash'], if_not_exists=True)
+
+
+def downgrade():
+    """Remove coordinates"""
+    op.drop_index('ix_properties_geohash')
+    op.drop_column('properties', 'geohash')
+    op.drop_column('properties', 'longitude')
+    op.drop_column('properties', 'latitude')
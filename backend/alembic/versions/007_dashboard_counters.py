@@ -0,0 +1,33 @@
+"""Add materialized dashboard counters
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create dashboard_counters (filled by the first reconcile on startup)"""
+    op.create_table(
+        'dashboard_counters',
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('metric', 'key'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    """Drop dashboard_counters"""
+    op.drop_table('dashboard_counters')
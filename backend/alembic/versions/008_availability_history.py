@@ -0,0 +1,51 @@
+"""Add availability event log and daily rollups
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create availability_events and availability_daily"""
+    op.create_table(
+        'availability_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('was_available', sa.Boolean(), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_availability_events_id', 'availability_events', ['id'], if_not_exists=True)
+    op.create_index('ix_availability_events_property_id', 'availability_events', ['property_id'], if_not_exists=True)
+    op.create_index('ix_availability_events_created_at', 'availability_events', ['created_at'], if_not_exists=True)
+    
+    op.create_table(
+        'availability_daily',
+        sa.Column('day', sa.String(length=10), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('available', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    """Drop availability history"""
+    op.drop_table('availability_daily')
+    op.drop_index('ix_availability_events_created_at')
+    op.drop_index('ix_availability_events_property_id')
+    op.drop_index('ix_availability_events_id')
+    op.drop_table('availability_events')
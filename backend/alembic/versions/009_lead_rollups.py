@@ -0,0 +1,35 @@
+"""Add hourly lead rollups
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create lead_rollups (filled from leads on first use)"""
+    op.create_table(
+        'lead_rollups',
+        sa.Column('hour', sa.String(length=13), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('hour', 'status', 'source', 'property_id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    """Drop lead_rollups"""
+    op.drop_table('lead_rollups')
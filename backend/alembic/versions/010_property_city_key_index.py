@@ -0,0 +1,30 @@
+"""Add a lower(trim(city)) index for exact city filters
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+Known cities are matched on lower(trim(city)) so every stored spelling
+matches; this expression index serves that comparison.
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the city key index"""
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_property_city_key "
+        "ON properties (lower(trim(city)), is_available)"
+    )
+
+
+def downgrade():
+    """Remove the city key index"""
+    op.execute("DROP INDEX IF EXISTS idx_property_city_key")
@@ -0,0 +1,35 @@
+"""Compare geohashes in byte order on PostgreSQL
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+Map search scans each geohash cell as `cell <= geohash < cell || '{'`, which
+is only correct when the column compares byte by byte. Columns created by 006
+before it declared COLLATE "C" use the database's locale collation; this
+switches them (Postgres rebuilds the index). SQLite already compares bytes.
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Use the C collation for properties.geohash"""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute('ALTER TABLE properties ALTER COLUMN geohash TYPE VARCHAR(12) COLLATE "C"')
+
+
+def downgrade():
+    """Back to the database default collation"""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute("ALTER TABLE properties ALTER COLUMN geohash TYPE VARCHAR(12) COLLATE \"default\"")
@@ -4,15 +4,16 @@ IndoHomz Analytics Router
 Provides dashboard analytics and insights.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import List, Optional
+from datetime import datetime
 
 from app.database.connection import get_db
-from app.database import models
 from app.services.crud import property_service, lead_service
+from app.services.availability import availability_history
+from app.services.dashboard import dashboard_summary
+from app.services.lead_rollups import lead_rollups, GROUP_BY
 from app.core.security import get_current_user
 
 router = APIRouter()
@@ -29,39 +30,28 @@ async def get_dashboard_analytics(
     Requires authentication.
     Returns property stats, lead metrics, and recent activity.
     """
-    property_stats = property_service.get_property_stats(db)
-    lead_stats = lead_service.get_lead_stats(db)
-    
-    # Recent properties (last 7 days)
-    week_ago = datetime.now() - timedelta(days=7)
-    recent_properties = db.query(func.count(models.Property.id)).filter(
-        models.Property.created_at >= week_ago
-    ).scalar() or 0
-    
-    # Recent leads (last 7 days)
-    recent_leads = db.query(func.count(models.Lead.id)).filter(
-        models.Lead.created_at >= week_ago
-    ).scalar() or 0
+    # Materialized counters: one indexed read regardless of table sizes
+    summary = dashboard_summary.get_summary(db)
     
     return {
         "overview": {
-            "total_properties": property_stats["total_properties"],
-            "available_properties": property_stats["available_properties"],
-            "rented_properties": property_stats["rented_properties"],
-            "total_leads": lead_stats["total_leads"],
-            "conversion_rate": lead_stats["conversion_rate"],
+            "total_properties": summary["total_properties"],
+            "available_properties": summary["available_properties"],
+            "rented_properties": summary["rented_properties"],
+            "total_leads": summary["total_leads"],
+            "conversion_rate": summary["conversion_rate"],
         },
         "recent_activity": {
-            "new_properties_this_week": recent_properties,
-            "new_leads_this_week": recent_leads,
+            "new_properties_this_week": summary["new_properties_this_week"],
+            "new_leads_this_week": summary["new_leads_this_week"],
         },
         "property_breakdown": {
-            "by_type": property_stats["property_types"],
-            "by_location": property_stats["top_locations"],
+            "by_type": summary["property_types"],
+            "by_location": summary["top_locations"],
         },
         "lead_breakdown": {
-            "by_status": lead_stats["by_status"],
-            "by_source": lead_stats["by_source"],
+            "by_status": summary["by_status"],
+            "by_source": summary["by_source"],
         },
     }
 
@@ -103,43 +93,9 @@ async def get_price_distribution(
     Requires authentication.
     Returns properties grouped by price ranges.
     """
-    # Note: This is simplified - in production you'd parse the price string
-    properties = db.query(models.Property).all()
-    
-    price_ranges = {
-        "Under ₹50K": 0,
-        "₹50K - ₹1L": 0,
-        "₹1L - ₹2L": 0,
-        "₹2L - ₹3L": 0,
-        "Above ₹3L": 0,
-    }
-    
-    for prop in properties:
-        try:
-            # Extract numeric value from price string
-            price_str = prop.price.replace('₹', '').replace(',', '').replace('/month', '').strip()
-            if 'L' in price_str:
-                price = float(price_str.replace('L', '')) * 100000
-            elif 'K' in price_str:
-                price = float(price_str.replace('K', '')) * 1000
-            else:
-                price = float(price_str)
-            
-            if price < 50000:
-                price_ranges["Under ₹50K"] += 1
-            elif price < 100000:
-                price_ranges["₹50K - ₹1L"] += 1
-            elif price < 200000:
-                price_ranges["₹1L - ₹2L"] += 1
-            elif price < 300000:
-                price_ranges["₹2L - ₹3L"] += 1
-            else:
-                price_ranges["Above ₹3L"] += 1
-        except (ValueError, AttributeError):
-            continue
-    
+    # price_numeric is parsed from the display price on write, so this is one GROUP BY
     return {
-        "distribution": [{"range": k, "count": v} for k, v in price_ranges.items()]
+        "distribution": property_service.get_price_distribution(db)
     }
 
 
@@ -153,23 +109,16 @@ async def get_availability_trend(
     Get property availability trend over time.
     
     Requires authentication.
+    Returns one point per day, from when availability history began.
     """
-    # Simplified - in production you'd track historical availability
-    total = db.query(func.count(models.Property.id)).scalar() or 0
-    available = db.query(func.count(models.Property.id)).filter(
-        models.Property.is_available == True
-    ).scalar() or 0
-    
-    return {
-        "period_days": days,
-        "current_availability_rate": round(available / total * 100, 2) if total > 0 else 0,
-        "total_properties": total,
-        "available_properties": available,
-    }
+    # Daily rollups of the availability event log, plus today's live counts
+    return availability_history.get_trend(db, days)
 
 
 @router.get("/leads/conversion-funnel")
 async def get_conversion_funnel(
+    start_date: Optional[datetime] = Query(None, description="Only leads created from this time"),
+    end_date: Optional[datetime] = Query(None, description="Only leads created up to this time"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -178,7 +127,7 @@ async def get_conversion_funnel(
     
     Requires authentication.
     """
-    stats = lead_service.get_lead_stats(db)
+    stats = lead_service.get_lead_stats(db, start_date, end_date)
     
     stages = ["new", "contacted", "site_visit", "negotiation", "converted"]
     funnel_data = []
@@ -200,6 +149,8 @@ async def get_conversion_funnel(
 
 @router.get("/leads/source-performance")
 async def get_source_performance(
+    start_date: Optional[datetime] = Query(None, description="Only leads created from this time"),
+    end_date: Optional[datetime] = Query(None, description="Only leads created up to this time"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -208,7 +159,7 @@ async def get_source_performance(
     
     Requires authentication.
     """
-    stats = lead_service.get_lead_stats(db)
+    stats = lead_service.get_lead_stats(db, start_date, end_date)
     
     # Calculate conversion rate by source (simplified)
     source_data = []
@@ -225,6 +176,48 @@ async def get_source_performance(
     }
 
 
+@router.get("/leads/timeseries")
+async def get_lead_timeseries(
+    start_date: Optional[datetime] = Query(None, description="Leads created from this time (hour precision)"),
+    end_date: Optional[datetime] = Query(None, description="Leads created up to this time (hour precision)"),
+    bucket: str = Query("day", pattern="^(hour|day|week|month)$", description="Time bucket size"),
+    group_by: List[str] = Query([], description="Break down by status, source and/or property_id"),
+    status: Optional[str] = Query(None, description="Only leads with this status"),
+    source: Optional[str] = Query(None, description="Only leads from this source"),
+    property_id: Optional[int] = Query(None, description="Only leads for this property"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get lead counts per time bucket.
+    
+    Requires authentication.
+    Counts come from hourly lead rollups, so the cost depends on the range
+    and breakdown requested, not on the total number of leads.
+    """
+    unknown = [name for name in group_by if name not in GROUP_BY]
+    if unknown:
+        raise HTTPException(
+            status_code=400,  # `status` is shadowed by the query parameter
+            detail=f"Cannot group by {', '.join(unknown)} (allowed: {', '.join(GROUP_BY)})"
+        )
+    
+    return {
+        "bucket": bucket,
+        "group_by": group_by,
+        "series": lead_rollups.counts(
+            db,
+            start=start_date,
+            end=end_date,
+            bucket=bucket,
+            group_by=list(dict.fromkeys(group_by)),
+            status=status,
+            source=source,
+            property_id=property_id,
+        ),
+    }
+
+
 # Legacy endpoints for backward compatibility
 @router.get("/sales-overview")
 async def legacy_sales_overview(db: Session = Depends(get_db)):
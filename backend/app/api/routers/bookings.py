@@ -0,0 +1,42 @@
+"""
+IndoHomz Bookings Router
+
+Admin endpoints for bookings. Bookings are created and cancelled through
+the booking service; this router exposes them for export.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database.connection import get_db
+from app.services.crud import booking_service
+from app.services.exports import EXPORT_FORMATS, export_filename, stream_export
+from app.core.security import get_current_admin
+
+router = APIRouter()
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_bookings(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    status: Optional[str] = Query(None, description="Filter by status (confirmed, active, completed, cancelled)"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    """
+    Export all matching bookings as a CSV or NDJSON download, newest first.
+    
+    Requires admin. Rows are streamed from a single query as they are read.
+    """
+    query = booking_service.export_bookings(db=db, status=status)
+    return StreamingResponse(
+        stream_export(query, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("bookings", export_format)}"'},
+    )
@@ -4,18 +4,36 @@ IndoHomz Leads Router
 Handles all lead/inquiry endpoints with rate limiting and spam protection.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.database.connection import get_db
-from app.schemas.schemas import Lead, LeadCreate, LeadUpdate
-from app.services.crud import lead_service
+from app.schemas.schemas import Lead, LeadCreate, LeadUpdate, ImportResponse, StreamTicket
+from app.services.crud import lead_service, encode_cursor
+from app.services.events import lead_events
+from app.services.exports import EXPORT_FORMATS, export_filename, stream_export
+from app.services.imports import import_leads
+from app.core.config import settings
 from app.core.rate_limit import rate_limit_lead_submission, rate_limit_moderate
-from app.core.security import require_recaptcha, validate_phone_number, normalize_phone_number, sanitize_html, get_current_user
+from app.core.responses import model_response, select_fields, partial_model
+from app.core.security import require_recaptcha, validate_phone_number, normalize_phone_number, sanitize_html, get_current_user, get_current_admin, get_current_user_for_stream, create_stream_ticket
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Comma-separated Lead fields to return (e.g. id,name,phone,status)"
+
+
+def _selected_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse ?fields= against Lead (400 on unknown names)"""
+    try:
+        return select_fields(Lead, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 # =============================================================================
 # LIST & FILTER
@@ -25,8 +43,10 @@ router = APIRouter()
 async def get_leads(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous X-Next-Cursor header (replaces skip)"),
     status: Optional[str] = Query(None, description="Filter by status (new, contacted, site_visit, etc.)"),
     source: Optional[str] = Query(None, description="Filter by source (website, whatsapp, referral)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -34,13 +54,97 @@ async def get_leads(
     Get all leads with optional filters.
     
     Requires authentication.
+    When more rows may follow, the `X-Next-Cursor` response header carries a
+    cursor; pass it back as `cursor` to page through large exports at constant cost.
     """
-    return lead_service.get_leads(
-        db=db,
-        skip=skip,
-        limit=limit,
-        status=status,
-        source=source,
+    selected = _selected_fields(fields)
+    if cursor:
+        try:
+            leads, next_cursor = lead_service.get_leads_page(
+                db=db,
+                cursor=cursor,
+                limit=limit,
+                status=status,
+                source=source,
+                fields=selected,
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=400,  # `status` is shadowed by the query parameter
+                detail="Invalid cursor"
+            )
+    else:
+        leads = lead_service.get_leads(
+            db=db,
+            skip=skip,
+            limit=limit,
+            status=status,
+            source=source,
+            fields=selected,
+        )
+        next_cursor = encode_cursor(leads[-1].created_at, leads[-1].id) if len(leads) == limit else None
+    
+    return model_response(
+        List[partial_model(Lead, selected) if selected else Lead],
+        leads,
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_leads(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    status: Optional[str] = Query(None, description="Filter by status (new, contacted, site_visit, etc.)"),
+    source: Optional[str] = Query(None, description="Filter by source (website, whatsapp, referral)"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    """
+    Export all matching leads as a CSV or NDJSON download, newest first.
+    
+    Requires admin. Rows are streamed from a single query as they are read,
+    so large exports need neither paging nor server memory.
+    """
+    query = lead_service.export_leads(db=db, status=status, source=source)
+    return StreamingResponse(
+        stream_export(query, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("leads", export_format)}"'},
+    )
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_lead_events(
+    current_user: dict = Depends(get_current_user_for_stream)
+):
+    """
+    Live lead events as Server-Sent Events (text/event-stream).
+    
+    Requires authentication (Authorization header, or `?ticket=` from
+    POST /leads/events/ticket for EventSource). Pushes `lead.created`, `lead.status_changed` and
+    `counters.delta` events as they happen, so dashboards need not poll.
+    """
+    return StreamingResponse(
+        lead_events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/events/ticket", response_model=StreamTicket)
+async def create_lead_events_ticket(
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get a ticket for `GET /leads/events?ticket=...`.
+    
+    Requires authentication. EventSource cannot send an Authorization
+    header, and URLs end up in logs and browser history, so the stream
+    takes this short-lived, stream-only ticket instead of the access token.
+    """
+    return StreamTicket(
+        ticket=create_stream_ticket(current_user),
+        expires_in=settings.STREAM_TICKET_EXPIRE_SECONDS,
     )
 
 
@@ -65,6 +169,7 @@ async def get_leads_by_property(
 @router.get("/{lead_id}", response_model=Lead)
 async def get_lead(
     lead_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -73,12 +178,15 @@ async def get_lead(
     
     Requires authentication.
     """
-    lead = lead_service.get_lead(db=db, lead_id=lead_id)
+    selected = _selected_fields(fields)
+    lead = lead_service.get_lead(db=db, lead_id=lead_id, fields=selected)
     if not lead:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lead not found"
         )
+    if selected:
+        return model_response(partial_model(Lead, selected), lead)
     return lead
 
 
@@ -173,6 +281,29 @@ async def submit_inquiry(
     }
 
 
+@router.post("/import", response_model=ImportResponse)
+async def import_leads_csv(
+    file: UploadFile = File(..., description="CSV with name, phone and optional LeadCreate columns"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    """
+    Import leads from a CSV upload.
+    
+    Requires admin. Rows get the same checks as POST /leads/ and are written
+    in chunks as the file is read; invalid rows are skipped and listed in
+    `errors` by row number.
+    """
+    try:
+        # Parsing and writing block; keep them off the event loop
+        return await asyncio.to_thread(import_leads, db, file.file)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.put("/{lead_id}", response_model=Lead)
 async def update_lead(
     lead_id: int,
@@ -4,26 +4,67 @@ IndoHomz Properties Router
 Handles all property listing endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from math import ceil
 
 from app.database.connection import get_db
 from app.schemas.schemas import (
     Property, 
+    PropertyCard,
     PropertyCreate, 
     PropertyUpdate, 
     PropertyListResponse,
     PropertySearchRequest,
     PropertySearchResponse,
+    PropertyFacetsResponse,
+    PropertyGeoResponse,
+    PropertyWithDistance,
+    PropertyBulkRequest,
+    PropertyBulkResponse,
+    ImportResponse,
 )
-from app.services.crud import property_service
+from app.services.crud import property_service, encode_cursor, bounded_count_limit
+from app.services.exports import EXPORT_FORMATS, export_filename, stream_export
+from app.services.imports import import_properties
+from app.services.search_engine import search_engine
 from app.core.config import settings
 from app.core.security import get_current_user, get_current_admin
+from app.core.responses import (
+    model_response,
+    render_model,
+    cached_payload_response,
+    payload_key,
+    trusted_response,
+    type_adapter,
+    select_fields,
+    partial_model,
+    with_items,
+)
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Comma-separated Property fields to return (e.g. id,title,latitude,longitude)"
+
+
+def _selected_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse ?fields= against Property (400 on unknown names)"""
+    try:
+        return select_fields(Property, fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def _item_model(selected: Optional[Tuple[str, ...]], default=PropertyCard):
+    return partial_model(Property, selected) if selected else default
+
 
 # =============================================================================
 # LIST & SEARCH
@@ -31,6 +72,7 @@ router = APIRouter()
 
 @router.get("/", response_model=PropertyListResponse)
 async def get_properties(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of properties to skip"),
     limit: int = Query(
         default=settings.DEFAULT_PAGE_SIZE,
@@ -38,41 +80,242 @@ async def get_properties(
         le=settings.MAX_PAGE_SIZE,
         description="Max properties to return"
     ),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (replaces skip)"),
     is_available: Optional[bool] = Query(None, description="Filter by availability"),
     city: Optional[str] = Query(None, description="Filter by city"),
     location: Optional[str] = Query(None, description="Search in location"),
     property_type: Optional[str] = Query(None, description="Filter by property type"),
     bedrooms: Optional[int] = Query(None, ge=0, description="Minimum bedrooms"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum monthly price (₹)"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum monthly price (₹)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
     Get all properties with optional filters.
     
     Returns a paginated list with total count for proper pagination UI.
+    Pass `next_cursor` back as `cursor` to page deep result sets at constant cost;
+    cursor pages omit `total` (the first page carries it).
+    Items are property cards unless `fields` selects other columns.
+    The rendered page (and its compressed variants) is cached.
     """
-    properties, total = property_service.get_properties(
+    selected = _selected_fields(fields)
+    response_type = with_items(PropertyListResponse, _item_model(selected)) if selected else PropertyListResponse
+    filters = dict(
+        is_available=is_available,
+        city=city,
+        location=location,
+        property_type=property_type,
+        min_bedrooms=bedrooms,
+        min_price=min_price,
+        max_price=max_price,
+    )
+    
+    def render() -> bytes:
+        if cursor:
+            try:
+                properties, next_cursor = property_service.get_properties_page(
+                    db=db, cursor=cursor, limit=limit, fields=selected, **filters
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            return render_model(response_type, dict(
+                items=properties,
+                total=None,
+                skip=skip,
+                limit=limit,
+                has_more=next_cursor is not None,
+                next_cursor=next_cursor,
+            ))
+        
+        properties, total = property_service.get_properties(
+            db=db,
+            skip=skip,
+            limit=limit,
+            fields=selected,
+            **filters,
+        )
+        
+        has_more = (skip + limit) < total
+        return render_model(response_type, dict(
+            items=properties,
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=has_more,
+            total_is_exact=total < bounded_count_limit(skip, limit),
+            next_cursor=encode_cursor(properties[-1].created_at, properties[-1].id) if has_more and properties else None,
+        ))
+        
+    return cached_payload_response(
+        request, payload_key("properties:payload", request), settings.CACHE_TTL_PROPERTIES, render,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_properties(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    is_available: Optional[bool] = Query(None, description="Filter by availability"),
+    city: Optional[str] = Query(None, description="Filter by city"),
+    location: Optional[str] = Query(None, description="Search in location"),
+    property_type: Optional[str] = Query(None, description="Filter by property type"),
+    bedrooms: Optional[int] = Query(None, ge=0, description="Minimum bedrooms"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum monthly price (₹)"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum monthly price (₹)"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    """
+    Export all matching properties as a CSV or NDJSON download, newest first.
+    
+    Requires admin. Takes the same filters as the listing; rows are streamed
+    from a single query as they are read.
+    """
+    query = property_service.export_properties(
         db=db,
-        skip=skip,
-        limit=limit,
         is_available=is_available,
         city=city,
         location=location,
         property_type=property_type,
         min_bedrooms=bedrooms,
+        min_price=min_price,
+        max_price=max_price,
     )
+    return StreamingResponse(
+        stream_export(query, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("properties", export_format)}"'},
+    )
+
+
+@router.get("/facets", response_model=PropertyFacetsResponse)
+async def get_property_facets(
+    is_available: Optional[bool] = Query(None, description="Filter by availability"),
+    city: Optional[str] = Query(None, description="Filter by city"),
+    location: Optional[str] = Query(None, description="Search in location"),
+    property_type: Optional[str] = Query(None, description="Filter by property type"),
+    bedrooms: Optional[int] = Query(None, ge=0, description="Minimum bedrooms"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum monthly price (₹)"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum monthly price (₹)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get filter sidebar counts for the current filter set.
     
-    return PropertyListResponse(
-        items=properties,
+    Returns counts per property type, bedrooms, furnishing, city and price
+    bucket in one call. Accepts the same filters as the property list.
+    """
+    return property_service.get_property_facets(
+        db=db,
+        is_available=is_available,
+        city=city,
+        location=location,
+        property_type=property_type,
+        min_bedrooms=bedrooms,
+        min_price=min_price,
+        max_price=max_price,
+    )
+
+
+# =============================================================================
+# MAP SEARCH
+# =============================================================================
+
+def _geo_response(pairs, total: int, latitude: float, longitude: float, selected=None):
+    # Each row is validated once as Property (or its selected fields); adding
+    # the distance and the envelope is trusted (model_construct), not re-validated
+    if selected:
+        item_model = partial_model(PropertyWithDistance, (*selected, "distance_km"))
+        response_type = with_items(PropertyGeoResponse, item_model)
+    else:
+        item_model, response_type = PropertyWithDistance, PropertyGeoResponse
+    validate = type_adapter(_item_model(selected, default=Property)).validate_python
+    return trusted_response(response_type, response_type.model_construct(
+        items=[
+            item_model.model_construct(
+                **validate(prop, from_attributes=True).__dict__,
+                distance_km=round(distance, 3),
+            )
+            for prop, distance in pairs
+        ],
         total=total,
-        skip=skip,
+        center={"latitude": latitude, "longitude": longitude},
+    ))
+
+
+@router.get("/nearby", response_model=PropertyGeoResponse)
+async def get_nearby_properties(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the search point"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude of the search point"),
+    radius_km: float = Query(5, gt=0, le=100, description="Search radius in kilometres"),
+    limit: int = Query(50, ge=1, le=200),
+    is_available: Optional[bool] = Query(None, description="Filter by availability"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
+    """
+    Get properties within a radius of a point ("near me"), nearest first.
+    """
+    selected = _selected_fields(fields)
+    pairs, total = property_service.get_properties_near(
+        db=db,
+        latitude=lat,
+        longitude=lng,
+        radius_km=radius_km,
+        limit=limit,
+        is_available=is_available,
+        fields=selected,
+    )
+    return _geo_response(pairs, total, lat, lng, selected)
+
+
+@router.get("/within", response_model=PropertyGeoResponse)
+async def get_properties_within_bounds(
+    south: float = Query(..., ge=-90, le=90, description="Minimum latitude"),
+    west: float = Query(..., ge=-180, le=180, description="Minimum longitude"),
+    north: float = Query(..., ge=-90, le=90, description="Maximum latitude"),
+    east: float = Query(..., ge=-180, le=180, description="Maximum longitude"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Sort by distance from this point (default: box center)"),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(100, ge=1, le=500),
+    is_available: Optional[bool] = Query(None, description="Filter by availability"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
+    """
+    Get properties inside a map viewport (bounding box), nearest to the center first.
+    """
+    selected = _selected_fields(fields)
+    if south > north or west > east:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bounding box must have south <= north and west <= east"
+        )
+    
+    center = (lat, lng) if lat is not None and lng is not None else ((south + north) / 2, (west + east) / 2)
+    pairs, total = property_service.get_properties_in_bounds(
+        db=db,
+        min_lat=south,
+        min_lng=west,
+        max_lat=north,
+        max_lng=east,
         limit=limit,
-        has_more=(skip + limit) < total
+        is_available=is_available,
+        center=center,
+        fields=selected,
     )
+    return _geo_response(pairs, total, *center, selected)
 
 
-@router.get("/featured", response_model=List[Property])
+@router.get("/featured", response_model=List[PropertyCard])
 async def get_featured_properties(
+    request: Request,
     limit: int = Query(6, ge=1, le=12, description="Number of featured properties"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -80,19 +323,33 @@ async def get_featured_properties(
     
     Returns the newest available properties.
     """
-    return property_service.get_featured_properties(db=db, limit=limit)
+    selected = _selected_fields(fields)
+    return cached_payload_response(
+        request,
+        payload_key("properties:payload", request),
+        settings.CACHE_TTL_FEATURED,
+        lambda: render_model(
+            List[_item_model(selected)],
+            property_service.get_featured_properties(db=db, limit=limit, fields=selected),
+        ),
+    )
 
 
-@router.get("/available", response_model=List[Property])
+@router.get("/available", response_model=List[PropertyCard])
 async def get_available_properties(
     skip: int = Query(0, ge=0),
     limit: int = Query(12, ge=1, le=50),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
     Get only available (not rented) properties.
     """
-    return property_service.get_available_properties(db=db, skip=skip, limit=limit)
+    selected = _selected_fields(fields)
+    return model_response(
+        List[_item_model(selected)],
+        property_service.get_available_properties(db=db, skip=skip, limit=limit, fields=selected),
+    )
 
 
 @router.post("/search", response_model=PropertySearchResponse)
@@ -104,6 +361,7 @@ async def search_properties(
     Search properties with text query and filters.
     
     Supports natural language search across title, location, amenities, and description.
+    Results are ranked by relevance using the database full-text index.
     """
     filters = {}
     if search.city:
@@ -114,6 +372,10 @@ async def search_properties(
         filters["bedrooms"] = search.bedrooms
     if search.is_available is not None:
         filters["is_available"] = search.is_available
+    if search.min_price is not None:
+        filters["min_price"] = search.min_price
+    if search.max_price is not None:
+        filters["max_price"] = search.max_price
     
     properties = property_service.search_properties(
         db=db,
@@ -124,58 +386,106 @@ async def search_properties(
     )
     
     # Get total count for pagination
-    total = property_service.get_properties_count(
+    total = property_service.search_properties_count(
         db=db,
-        is_available=search.is_available,
-        city=search.city,
+        query_text=search.query,
+        filters=filters,
     )
     
-    return PropertySearchResponse(
+    return model_response(PropertySearchResponse, dict(
         items=properties,
         total=total,
         page=search.page,
         page_size=search.page_size,
         query=search.query,
         filters_applied=filters,
-    )
+    ))
 
 
 # =============================================================================
 # SINGLE PROPERTY
 # =============================================================================
 
+def _batch_keys(value: str, parse=str) -> list:
+    """Comma-separated ids/slugs, capped at MAX_PAGE_SIZE (400 otherwise)"""
+    try:
+        keys = [parse(key.strip()) for key in value.split(",") if key.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated integers"
+        )
+    if len(keys) > settings.MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_PAGE_SIZE} properties per batch"
+        )
+    return keys
+
+
+@router.get("/batch", response_model=List[Property])
+async def get_properties_batch(
+    ids: Optional[str] = Query(None, description="Comma-separated property IDs, e.g. 12,7,31"),
+    slugs: Optional[str] = Query(None, description="Comma-separated property slugs"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
+    """
+    Get several properties by ID or by slug in one request.
+
+    For favourites, comparisons and recently viewed lists. Results follow
+    the request order; unknown IDs/slugs are left out. `fields` trims the
+    response only: properties are loaded and cached whole.
+    """
+    if (ids is None) == (slugs is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass either ids or slugs"
+        )
+    selected = _selected_fields(fields)
+    if ids is not None:
+        items = property_service.get_properties_by_ids(db=db, property_ids=_batch_keys(ids, int))
+    else:
+        items = property_service.get_properties_by_slugs(db=db, slugs=_batch_keys(slugs))
+    return model_response(List[_item_model(selected, default=Property)], items)
+
+
 @router.get("/{property_id}", response_model=Property)
 async def get_property(
     property_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
     Get a single property by ID.
     """
-    property_obj = property_service.get_property(db=db, property_id=property_id)
+    selected = _selected_fields(fields)
+    property_obj = property_service.get_property(db=db, property_id=property_id, fields=selected)
     if not property_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found"
         )
-    return property_obj
+    return model_response(_item_model(selected, default=Property), property_obj)
 
 
 @router.get("/slug/{slug}", response_model=Property)
 async def get_property_by_slug(
     slug: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
     Get a property by its URL-friendly slug.
     """
-    property_obj = property_service.get_property_by_slug(db=db, slug=slug)
+    selected = _selected_fields(fields)
+    property_obj = property_service.get_property_by_slug(db=db, slug=slug, fields=selected)
     if not property_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found"
         )
-    return property_obj
+    return model_response(_item_model(selected, default=Property), property_obj)
 
 
 # =============================================================================
@@ -196,6 +506,56 @@ async def create_property(
     return property_service.create_property(db=db, property_data=property_data)
 
 
+@router.post("/bulk", response_model=PropertyBulkResponse)
+async def bulk_create_properties(
+    request: PropertyBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Create up to 1000 property listings in one transaction.
+    
+    Requires authentication.
+    With `upsert`, items whose slug (given, or generated from the title)
+    already exists update that property instead. Validation errors reject
+    the whole batch and name the failing item index.
+    """
+    results = property_service.bulk_upsert_properties(
+        db=db,
+        items=request.properties,
+        upsert=request.upsert,
+    )
+    created = sum(1 for r in results if r["created"])
+    return PropertyBulkResponse(
+        created=created,
+        updated=len(results) - created,
+        results=results,
+    )
+
+
+@router.post("/import", response_model=ImportResponse)
+async def import_properties_csv(
+    file: UploadFile = File(..., description="CSV in the properties_template.csv or properties_9.csv layout"),
+    upsert: bool = Query(False, description="Update properties whose slug already exists"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    """
+    Import properties from a CSV upload.
+    
+    Requires admin. Rows are validated and written in chunks as the file is
+    read; invalid rows are skipped and listed in `errors` by row number.
+    """
+    try:
+        # Parsing and writing block; keep them off the event loop
+        return await asyncio.to_thread(import_properties, db, file.file, upsert)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.put("/{property_id}", response_model=Property)
 async def update_property(
     property_id: int,
@@ -240,6 +600,7 @@ async def toggle_property_availability(
     
     property_obj.is_available = is_available
     db.commit()
+    search_engine.index_property(property_obj)
     
     return {"message": f"Property {'available' if is_available else 'unavailable'}", "property_id": property_id}
 
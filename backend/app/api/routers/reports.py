@@ -13,7 +13,9 @@ from app.database.connection import get_db
 from app.database import models
 from app.schemas.schemas import ReportRequest, ReportResponse, ReportType
 from app.services.genai_service import GenAIService
+from app.services import stats
 from app.services.crud import property_service, lead_service
+from app.services.lead_rollups import lead_rollups
 from app.core.security import get_current_user
 
 router = APIRouter()
@@ -136,106 +138,56 @@ async def get_report_data(db: Session, request: ReportRequest):
 
 async def get_property_overview_data(db: Session):
     """Get property overview data for report"""
-    
-    # Total properties
-    total = db.query(func.count(models.Property.id)).scalar() or 0
-    available = db.query(func.count(models.Property.id)).filter(
-        models.Property.is_available == True
-    ).scalar() or 0
-    
-    # Property types distribution
-    type_dist = db.query(
-        models.Property.property_type,
-        func.count(models.Property.id).label("count")
-    ).group_by(models.Property.property_type).all()
-    
-    # Location distribution
-    location_dist = db.query(
-        models.Property.city,
-        func.count(models.Property.id).label("count")
-    ).group_by(models.Property.city).all()
+    agg = stats.property_stats(db)
+    total = agg.total()
+    available = agg.get("is_available", True)
     
     return {
         "total_properties": total,
         "available_properties": available,
         "rented_properties": total - available,
-        "occupancy_rate": round((total - available) / total * 100, 2) if total > 0 else 0,
-        "property_types": [{"type": t or "Unknown", "count": c} for t, c in type_dist],
-        "locations": [{"city": c or "Unknown", "count": cnt} for c, cnt in location_dist],
+        "occupancy_rate": stats.rate(total - available, total),
+        "property_types": [{"type": t or "Unknown", "count": c} for (t,), c in agg.by("property_type")],
+        "locations": [{"city": city or "Unknown", "count": c} for (city,), c in agg.by("city")],
     }
 
 
 async def get_availability_data(db: Session):
     """Get availability status data for report"""
-    
-    # Current availability
-    total = db.query(func.count(models.Property.id)).scalar() or 0
-    available = db.query(func.count(models.Property.id)).filter(
-        models.Property.is_available == True
-    ).scalar() or 0
-    
-    # Properties by type and availability
-    availability_by_type = db.query(
-        models.Property.property_type,
-        models.Property.is_available,
-        func.count(models.Property.id).label("count")
-    ).group_by(
-        models.Property.property_type, 
-        models.Property.is_available
-    ).all()
+    agg = stats.property_stats(db)
+    total = agg.total()
+    available = agg.get("is_available", True)
     
     return {
         "total_properties": total,
         "available_now": available,
         "currently_rented": total - available,
-        "availability_rate": round(available / total * 100, 2) if total > 0 else 0,
+        "availability_rate": stats.rate(available, total),
         "by_type": [
             {
                 "type": t or "Unknown",
                 "available": a,
                 "count": c
-            } for t, a, c in availability_by_type
+            } for (t, a), c in agg.by("property_type", "is_available")
         ],
     }
 
 
 async def get_lead_insights_data(db: Session, start_date: datetime, end_date: datetime):
     """Get lead insights data for report"""
-    
-    # Total leads
-    total_leads = db.query(func.count(models.Lead.id)).scalar() or 0
-    
-    # Leads in period
-    period_leads = db.query(func.count(models.Lead.id)).filter(
-        models.Lead.created_at >= start_date,
-        models.Lead.created_at <= end_date
-    ).scalar() or 0
-    
-    # Lead status distribution
-    status_dist = db.query(
-        models.Lead.status,
-        func.count(models.Lead.id).label("count")
-    ).group_by(models.Lead.status).all()
-    
-    # Lead source distribution
-    source_dist = db.query(
-        models.Lead.source,
-        func.count(models.Lead.id).label("count")
-    ).group_by(models.Lead.source).all()
-    
-    # Conversion rate
-    converted = db.query(func.count(models.Lead.id)).filter(
-        models.Lead.status == "converted"
-    ).scalar() or 0
+    # Hourly lead rollups: cost depends on the period length, not the lead count
+    agg = lead_rollups.aggregate(db)
+    total_leads = agg.total()
+    converted = agg.get("status", "converted")
     
     return {
         "period": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
         "total_leads": total_leads,
-        "leads_in_period": period_leads,
+        "leads_in_period": lead_rollups.aggregate(db, start_date, end_date, group_by=()).total(),
         "converted_leads": converted,
-        "conversion_rate": round(converted / total_leads * 100, 2) if total_leads > 0 else 0,
-        "by_status": [{"status": s or "Unknown", "count": c} for s, c in status_dist],
-        "by_source": [{"source": src or "Unknown", "count": c} for src, c in source_dist],
+        "conversion_rate": stats.rate(converted, total_leads),
+        "by_status": [{"status": s or "Unknown", "count": c} for (s,), c in agg.by("status")],
+        "by_source": [{"source": src or "Unknown", "count": c} for (src,), c in agg.by("source")],
     }
 
 
@@ -268,20 +220,12 @@ async def get_listing_performance_data(db: Session, start_date: datetime, end_da
 async def get_market_analysis_data(db: Session):
     """Get market analysis data for report"""
     
-    # Price analysis by type (simplified - prices are strings)
-    properties = db.query(models.Property).all()
-    
-    type_counts = {}
-    for p in properties:
-        t = p.property_type or "Unknown"
-        if t not in type_counts:
-            type_counts[t] = 0
-        type_counts[t] += 1
+    agg = stats.property_stats(db)
     
     return {
-        "total_properties": len(properties),
+        "total_properties": agg.total(),
         "property_type_distribution": [
-            {"type": k, "count": v} for k, v in type_counts.items()
+            {"type": t or "Unknown", "count": c} for (t,), c in agg.by("property_type")
         ],
         "market_summary": "Market analysis based on current property listings.",
     }
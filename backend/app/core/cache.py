@@ -18,6 +18,7 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 from app.core.config import settings
+from app.core.timing import timed
 
 # In-memory cache fallback
 _memory_cache = {}
@@ -27,6 +28,7 @@ _cache_expiry = {}
 class CacheService:
     def __init__(self):
         self.redis_client = None
+        self.redis_binary = None  # Same server, no response decoding (byte payloads)
         self.enabled = settings.REDIS_ENABLED
         
         if self.enabled and REDIS_AVAILABLE:
@@ -38,10 +40,12 @@ class CacheService:
                 )
                 # Test connection
                 self.redis_client.ping()
+                self.redis_binary = redis.from_url(settings.REDIS_URL, socket_connect_timeout=2)
                 print("✓ Redis cache connected")
             except Exception as e:
                 print(f"⚠️ Redis connection failed, using in-memory cache: {e}")
                 self.redis_client = None
+                self.redis_binary = None
     
     def _make_key(self, prefix: str, **kwargs) -> str:
         """Generate cache key from parameters"""
@@ -56,6 +60,10 @@ class CacheService:
         if not self.enabled:
             return None
         
+        with timed("cache"):
+            return self._get(key)
+    
+    def _get(self, key: str) -> Optional[Any]:
         try:
             # Try Redis first
             if self.redis_client:
@@ -82,6 +90,10 @@ class CacheService:
         if not self.enabled:
             return
         
+        with timed("cache"):
+            self._set(key, value, ttl)
+    
+    def _set(self, key: str, value: Any, ttl: int):
         try:
             serialized = json.dumps(value, default=str)
             
@@ -95,6 +107,36 @@ class CacheService:
         except Exception as e:
             print(f"Cache set error: {e}")
     
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a raw byte payload (e.g. a rendered response) from cache"""
+        if not self.enabled:
+            return None
+        
+        with timed("cache"):
+            try:
+                if self.redis_binary:
+                    return self.redis_binary.get(key)
+                if key in _memory_cache and datetime.now() < _cache_expiry.get(key, datetime.min):
+                    return _memory_cache[key]
+            except Exception as e:
+                print(f"Cache get error: {e}")
+        return None
+    
+    def set_bytes(self, key: str, value: bytes, ttl: int = 300):
+        """Set a raw byte payload in cache with TTL (seconds)"""
+        if not self.enabled:
+            return
+        
+        with timed("cache"):
+            try:
+                if self.redis_binary:
+                    self.redis_binary.setex(key, ttl, value)
+                else:
+                    _memory_cache[key] = value
+                    _cache_expiry[key] = datetime.now() + timedelta(seconds=ttl)
+            except Exception as e:
+                print(f"Cache set error: {e}")
+    
     def delete(self, key: str):
         """Delete key from cache"""
         if not self.enabled:
@@ -41,6 +41,7 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # 7 days
+    STREAM_TICKET_EXPIRE_SECONDS: int = 60  # ?ticket= for event streams
     
     # ==========================================================================
     # AI / LLM CONFIGURATION
@@ -98,6 +99,19 @@ class Settings(BaseSettings):
         # Auto-detect: DEBUG=True in development, False in production
         return self.ENVIRONMENT.lower() != "production"
     
+    @property
+    def STARTUP_MIGRATIONS(self) -> bool:
+        """
+        Create missing tables and indexes (and the admin user) on app startup.
+        On in development; in production run `python migrate.py` once per
+        deploy instead, so workers start without schema checks. Set
+        STARTUP_MIGRATIONS=true/false to override.
+        """
+        value = os.getenv("STARTUP_MIGRATIONS")
+        if value is not None:
+            return value.lower() == "true"
+        return self.ENVIRONMENT.lower() != "production"
+    
     # ==========================================================================
     # CORS
     # ==========================================================================
@@ -146,6 +160,7 @@ class Settings(BaseSettings):
     # ==========================================================================
     DEFAULT_PAGE_SIZE: int = 12
     MAX_PAGE_SIZE: int = 50
+    LIST_COUNT_CAP: int = int(os.getenv("LIST_COUNT_CAP", "5000"))  # Totals above this are reported as a lower bound
     
     # ==========================================================================
     # REDIS CACHING
@@ -156,6 +171,28 @@ class Settings(BaseSettings):
     CACHE_TTL_ANALYTICS: int = 600  # 10 minutes
     CACHE_TTL_FEATURED: int = 900  # 15 minutes
 
+    # ==========================================================================
+    # COMPRESSION
+    # ==========================================================================
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # Bytes; smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # 11 is far slower for little gain on dynamic responses
+
+    # ==========================================================================
+    # SEARCH
+    # ==========================================================================
+    # "database" uses the DB full-text index (ILIKE fallback); "memory" uses the
+    # in-process BM25 index in app/services/search_engine.py
+    SEARCH_ENGINE: str = os.getenv("SEARCH_ENGINE", "database")
+    SEARCH_INDEX_REFRESH_SECONDS: int = int(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))
+    
+    # ==========================================================================
+    # ANALYTICS
+    # ==========================================================================
+    # Dashboard counters and lead rollups are updated on every write; this
+    # periodic rebuild catches bulk and out-of-band writes
+    ANALYTICS_RECONCILE_SECONDS: int = int(os.getenv("ANALYTICS_RECONCILE_SECONDS", "3600"))
+
 
 # Create settings instance
 settings = Settings()
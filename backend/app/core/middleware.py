@@ -0,0 +1,144 @@
+"""
+IndoHomz Middleware
+
+Pure ASGI middleware. Unlike @app.middleware("http") (BaseHTTPMiddleware),
+these wrap the ASGI send callable directly: no extra task or memory stream
+per request, and headers are added to the response-start message as it
+passes through.
+"""
+
+import time
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import timing
+from app.core.compression import StreamCompressor, compress, is_compressible, negotiate
+from app.core.config import settings
+
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+
+
+class SecurityHeadersMiddleware:
+    """
+    Add the security headers, X-Process-Time (seconds) and Server-Timing
+    (cache, db and serialize time, in ms; see app.core.timing) to every
+    HTTP response.
+    """
+
+    def __init__(self, app: ASGIApp, hsts: bool = False):
+        self.app = app
+        self.headers = list(SECURITY_HEADERS.items())
+        if hsts:
+            self.headers.insert(0, HSTS_HEADER)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = timing.start_request()
+        timings = timing.current_timings()
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                for name, value in self.headers:
+                    headers.append(name, value)
+                headers.append("X-Process-Time", str(elapsed))
+                headers.append("Server-Timing", timing.server_timing(timings, elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            timing.end_request(token)
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best encoding the client accepts
+    (brotli or gzip). Bodies under minimum_size, non-text content types and
+    responses that already carry a Content-Encoding (e.g. precompressed
+    cached payloads) pass through untouched. Streamed bodies are compressed
+    chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message.get("headers", []))
+            self.passthrough = "content-encoding" in headers or not is_compressible(headers.get("content-type"))
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self._begin(start, message)
+        elif self.compressor is not None:
+            body = self.compressor.compress(message.get("body", b""))
+            if not message.get("more_body", False):
+                body += self.compressor.finish()
+            await self._send({**message, "body": body})
+        else:
+            await self._send(message)
+
+    async def _begin(self, start: Message, message: Message):
+        """Send the held response start and the first body message"""
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.passthrough or (not more_body and len(body) < self.minimum_size):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(scope=start)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+            self.compressor = StreamCompressor(self.encoding)
+            body = self.compressor.compress(body)
+        else:
+            with timing.timed("compress"):
+                body = compress(body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+        await self._send(start)
+        await self._send({**message, "body": body})
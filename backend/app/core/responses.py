@@ -0,0 +1,163 @@
+"""
+IndoHomz Response Layer
+
+Fast JSON rendering for API responses.
+
+FastJSONResponse is the app's default response class: it renders with orjson
+when installed (stdlib json otherwise).
+
+For hot endpoints, FastAPI's own path validates the returned ORM objects
+against response_model, dumps the result to Python dicts, then encodes those
+to JSON. model_response() instead validates once with a cached TypeAdapter
+and serializes straight to JSON bytes in pydantic-core; trusted_response()
+skips validation for values the service layer has already built as the
+response model. Routes keep response_model for the OpenAPI schema; returning
+a Response bypasses FastAPI's second pass.
+
+cached_payload_response() caches a response as its rendered JSON bytes and,
+next to them, the compressed variant for each encoding clients ask for, so a
+repeat hit is neither rendered nor compressed again (CompressionMiddleware
+passes responses that already have a Content-Encoding through).
+
+Sparse fieldsets (?fields=id,title,...) are parsed by select_fields() and
+served through partial_model(), a cached copy of the response model holding
+only those fields.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, List, Mapping, Optional, Tuple, Type
+from urllib.parse import urlencode
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from app.core.cache import cache
+from app.core.compression import compress, negotiate
+from app.core.config import settings
+from app.core.timing import timed
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            return json.dumps(
+                content,
+                ensure_ascii=False,
+                allow_nan=False,
+                indent=None,
+                separators=(",", ":"),
+            ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """Cached TypeAdapter per response type (building one compiles a validator)"""
+    return TypeAdapter(response_type)
+
+
+def render_model(response_type: Any, data: Any) -> bytes:
+    """Validate data (ORM objects and/or dicts) as response_type once and serialize it to JSON"""
+    adapter = type_adapter(response_type)
+    with timed("serialize"):
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def model_response(
+    response_type: Any,
+    data: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Validate data (ORM objects and/or dicts) as response_type once and serialize it"""
+    content = render_model(response_type, data)
+    return Response(content, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def trusted_response(
+    response_type: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serialize a value already shaped as response_type, without validating it"""
+    with timed("serialize"):
+        content = type_adapter(response_type).dump_json(value)
+    return Response(content, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def payload_key(prefix: str, request: Request) -> str:
+    """Cache key for a GET response: prefix, path and the sorted query string"""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{prefix}:{request.url.path}?{query}"
+
+
+def cached_payload_response(request: Request, key: str, ttl: int, render: Callable[[], bytes]) -> Response:
+    """
+    JSON response cached as the bytes render() returns. The compressed
+    variant for the request's negotiated encoding is cached next to them
+    (key:br, key:gzip), so each encoding is compressed once per entry.
+    """
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    vary = {"Vary": "Accept-Encoding"}
+    if encoding:
+        content = cache.get_bytes(f"{key}:{encoding}")
+        if content is not None:
+            return Response(content, headers={**vary, "Content-Encoding": encoding}, media_type=JSON_MEDIA_TYPE)
+
+    content = cache.get_bytes(key)
+    if content is None:
+        content = render()
+        cache.set_bytes(key, content, ttl)
+    if not encoding or len(content) < settings.COMPRESSION_MIN_SIZE:
+        return Response(content, headers=vary, media_type=JSON_MEDIA_TYPE)
+
+    with timed("compress"):
+        content = compress(content, encoding)
+    cache.set_bytes(f"{key}:{encoding}", content, ttl)
+    return Response(content, headers={**vary, "Content-Encoding": encoding}, media_type=JSON_MEDIA_TYPE)
+
+
+def select_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated fields parameter against schema. Returns the
+    names in schema order, id first and always included (a stable cache key), or
+    None when no fields were requested. Raises ValueError for unknown names.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ("id",) + tuple(name for name in schema.model_fields if name in requested and name != "id")
+
+
+@lru_cache(maxsize=256)
+def partial_model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """schema restricted to fields (one model per field set)"""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def with_items(envelope: Type[BaseModel], item_model: Type[BaseModel]) -> Type[BaseModel]:
+    """A list envelope (items + paging fields) whose items are item_model"""
+    return create_model(envelope.__name__, __base__=envelope, items=(List[item_model], ...))
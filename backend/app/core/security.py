@@ -86,6 +86,18 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return encoded_jwt
 
 
+def create_stream_ticket(user: Dict[str, Any]) -> str:
+    """
+    Create a short-lived ticket that only opens event streams. EventSource
+    cannot send headers, so the ticket travels in the URL; unlike an access
+    token it is useless elsewhere and expires within a minute.
+    """
+    to_encode = {key: user[key] for key in ("user_id", "email", "role") if key in user}
+    expire = datetime.utcnow() + timedelta(seconds=settings.STREAM_TICKET_EXPIRE_SECONDS)
+    to_encode.update({"exp": expire, "type": "stream"})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """Verify and decode a JWT token"""
     try:
@@ -158,6 +170,33 @@ async def get_current_user_optional(request: Request) -> Optional[Dict[str, Any]
     return verify_token(token)
 
 
+async def get_current_user_for_stream(
+    request: Request,
+    ticket: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    get_current_user for Server-Sent Event streams. Browsers' EventSource
+    cannot send an Authorization header, so a stream ticket (see
+    create_stream_ticket) may be passed as ?ticket= instead. Access tokens
+    are never accepted in the URL.
+    """
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        token, token_type = auth_header[len("Bearer "):], "access"
+    else:
+        token, token_type = ticket, "stream"
+    payload = verify_token(token) if token else None
+    
+    if payload is None or payload.get("type") != token_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return payload
+
+
 # =============================================================================
 # RECAPTCHA VERIFICATION
 # =============================================================================
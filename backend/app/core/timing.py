@@ -0,0 +1,78 @@
+"""
+IndoHomz Request Timing
+
+Per-request time spent in the cache, the database, response serialization
+and compression, reported in the Server-Timing header.
+
+The middleware starts a request with start_request(); code on the request
+path adds to its totals with timed("cache") / record("db", seconds). Totals
+live in a context variable, so they follow the request into the threadpool
+that runs sync endpoints, and recording outside a request is a no-op.
+Database time is measured for every engine by cursor execute events.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+METRICS = ("cache", "db", "serialize", "compress")
+
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> Token:
+    """Begin collecting timings for the current request"""
+    return _request_timings.set(dict.fromkeys(METRICS, 0.0))
+
+
+def end_request(token: Token):
+    _request_timings.reset(token)
+
+
+def current_timings() -> Optional[Dict[str, float]]:
+    return _request_timings.get()
+
+
+def record(metric: str, seconds: float):
+    """Add seconds to metric for the current request, if any"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[metric] = timings.get(metric, 0.0) + seconds
+
+
+@contextmanager
+def timed(metric: str):
+    """Time a block as part of metric"""
+    if _request_timings.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(metric, time.perf_counter() - start)
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    """Server-Timing header value (durations in milliseconds)"""
+    parts = [f"{metric};dur={seconds * 1000:.1f}" for metric, seconds in timings.items() if seconds]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _request_timings.get() is not None:
+        context._timing_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_timing_start", None)
+    if start is not None:
+        record("db", time.perf_counter() - start)
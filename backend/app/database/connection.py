@@ -65,10 +65,10 @@ def init_db():
     """
     Initialize database tables.
     
-    Call this on application startup to ensure all tables exist.
+    Same as `python migrate.py` without the admin user and counters.
     """
-    from app.database import models  # Import models to register them
-    Base.metadata.create_all(bind=engine)
+    from app.database.setup import migrate
+    migrate(engine)
 
 
 def get_db_info() -> dict:
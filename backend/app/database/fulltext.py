@@ -0,0 +1,181 @@
+"""
+IndoHomz Full-Text Search Index
+
+Dialect-specific full-text indexing for property search.
+
+- PostgreSQL: a GIN index over a weighted tsvector expression. Postgres keeps
+  expression indexes current on every write, so no extra sync is needed.
+- SQLite: an FTS5 external-content table kept in sync by triggers on the
+  properties table.
+
+On Postgres this also creates pg_trgm GIN indexes on city and location so
+substring filters in property listings can use an index.
+
+Queries that cannot use either index fall back to the ILIKE search in crud.
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import Float, Integer, inspect, literal_column, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+
+TS_CONFIG = "english"
+FTS_TABLE = "properties_fts"
+
+# Columns indexed for search, highest weight first
+SEARCH_COLUMNS = ["title", "location", "area", "amenities", "description"]
+
+# Relative column weights for ranking (title matches rank highest)
+SQLITE_BM25_WEIGHTS = [10.0, 5.0, 5.0, 2.0, 1.0]
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {", ".join(SEARCH_COLUMNS)},
+        content='properties',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON properties BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES (new.id, {", ".join("new." + c for c in SEARCH_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON properties BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in SEARCH_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {", ".join(SEARCH_COLUMNS)} ON properties BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in SEARCH_COLUMNS)});
+        INSERT INTO {FTS_TABLE}(rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES (new.id, {", ".join("new." + c for c in SEARCH_COLUMNS)});
+    END
+    """,
+]
+
+# Must match the query-side expression in pg_search_vector() exactly,
+# otherwise Postgres will not use the index.
+_PG_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(location, '') || ' ' || coalesce(area, '')), 'B') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(amenities, '')), 'C') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(description, '')), 'D')"
+)
+
+_PG_DDL = [
+    f"CREATE INDEX IF NOT EXISTS idx_property_fts ON properties USING GIN (({_PG_VECTOR_SQL}))",
+]
+
+# Trigram indexes let Postgres serve ILIKE '%...%' city/location filters
+_PG_TRGM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_property_city_trgm ON properties USING GIN (city gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_property_location_trgm ON properties USING GIN (location gin_trgm_ops)",
+]
+
+
+def ensure_fulltext_index(bind) -> bool:
+    """
+    Create the full-text index for the current database if it is missing.
+
+    Safe to call on every startup. On SQLite the FTS table is rebuilt from
+    the properties table when first created. Returns True if full-text
+    search is available.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            return ensure_fulltext_index(conn)
+
+    conn: Connection = bind
+    dialect = conn.dialect.name
+    key = conn.engine
+    _availability[key] = False
+
+    if dialect == "postgresql":
+        for ddl in _PG_DDL:
+            conn.execute(text(ddl))
+        _availability[key] = True
+        try:
+            with conn.begin_nested():
+                for ddl in _PG_TRGM_DDL:
+                    conn.execute(text(ddl))
+        except Exception as e:
+            # pg_trgm may need elevated privileges; substring filters still work, unindexed
+            print(f"⚠ Trigram indexes unavailable: {e}")
+
+    elif dialect == "sqlite":
+        existed = inspect(conn).has_table(FTS_TABLE)
+        try:
+            for ddl in _SQLITE_DDL:
+                conn.execute(text(ddl))
+        except Exception as e:
+            # SQLite builds without FTS5 fall back to ILIKE search
+            print(f"⚠ Full-text index unavailable: {e}")
+            return False
+        if not existed:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        _availability[key] = True
+
+    return _availability[key]
+
+
+# Per-engine cache of fulltext_available() results
+_availability = {}
+
+
+def fulltext_available(db: Session) -> bool:
+    """Check whether the full-text index exists for this session's database"""
+    bind = db.get_bind()
+    key = getattr(bind, "engine", bind)
+    if key not in _availability:
+        if bind.dialect.name == "postgresql":
+            _availability[key] = True
+        elif bind.dialect.name == "sqlite":
+            _availability[key] = inspect(bind).has_table(FTS_TABLE)
+        else:
+            _availability[key] = False
+    return _availability[key]
+
+
+def tokenize_query(query_text: str) -> List[str]:
+    """Split user input into plain word tokens (drops FTS operators and punctuation)"""
+    return re.findall(r"\w+", (query_text or "").lower())
+
+
+def sqlite_match_expression(query_text: str) -> Optional[str]:
+    """Build an FTS5 MATCH expression: every token must match, as a prefix"""
+    tokens = tokenize_query(query_text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def pg_tsquery_expression(query_text: str) -> Optional[str]:
+    """Build a to_tsquery() string: every token must match, as a prefix"""
+    tokens = tokenize_query(query_text)
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def pg_search_vector():
+    """Weighted tsvector expression matching the idx_property_fts index"""
+    return literal_column(f"({_PG_VECTOR_SQL})")
+
+
+def sqlite_match_subquery(match: str):
+    """Subquery of (id, rank) for FTS5 matches; lower rank is more relevant"""
+    weights = ", ".join(str(w) for w in SQLITE_BM25_WEIGHTS)
+    return text(
+        f"SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match).columns(id=Integer, rank=Float).subquery("fts")
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.connection import Base
+from app.utils.geo import geohash_for
+from app.utils.pricing import parse_price
 
 
 # =============================================================================
@@ -55,12 +57,17 @@ class Property(Base):
     
     # Pricing
     price = Column(String(100), nullable=False)  # Display format: "₹15,000/month"
-    price_numeric = Column(Float, nullable=True, index=True)  # Numeric value for sorting/filtering
+    price_numeric = Column(Float, nullable=True, index=True)  # Parsed from price on write, for sorting/filtering
     
     # Location
     location = Column(String(255), nullable=False, default="Gurgaon")
     area = Column(String(100), nullable=True)  # e.g., "Sector 45", "Cyberhub"
     city = Column(String(100), nullable=False, default="Gurgaon")
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # Derived from coordinates for map search. Prefix range scans need byte-order
+    # comparison: "C" collation on Postgres, SQLite's default BINARY elsewhere
+    geohash = Column(String(12).with_variant(String(12, collation="C"), "postgresql"), nullable=True, index=True)
     
     # Property Details
     property_type = Column(String(50), default="apartment")  # apartment, villa, studio, penthouse, pg
@@ -93,9 +100,22 @@ class Property(Base):
         Index('idx_property_city_available', 'city', 'is_available'),
         Index('idx_property_type_available', 'property_type', 'is_available'),
         Index('idx_property_price_available', 'price_numeric', 'is_available'),
+        Index('idx_property_created_id', 'created_at', 'id'),  # Keyset pagination
     )
 
 
+# Case/whitespace-insensitive city equality (crud.city_filter)
+Index('idx_property_city_key', func.lower(func.trim(Property.city)), Property.is_available)
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _sync_property_derived_columns(mapper, connection, target):
+    """Keep geohash and price_numeric in step with their source columns on every write path"""
+    target.geohash = geohash_for(target.latitude, target.longitude)
+    target.price_numeric = parse_price(target.price)
+
+
 # =============================================================================
 # LEAD MODEL
 # =============================================================================
@@ -135,6 +155,7 @@ class Lead(Base):
     __table_args__ = (
         Index('idx_lead_status_created', 'status', 'created_at'),
         Index('idx_lead_property_status', 'property_id', 'status'),
+        Index('idx_lead_created_id', 'created_at', 'id'),  # Keyset pagination
     )
 
 
@@ -176,3 +197,72 @@ class Booking(Base):
     # Relationships
     property = relationship("Property", backref="bookings")
     lead = relationship("Lead", backref="bookings")
+    
+    # Composite indexes for common queries
+    __table_args__ = (
+        Index('idx_booking_created_id', 'created_at', 'id'),  # Keyset pagination
+    )
+
+
+# =============================================================================
+# AVAILABILITY HISTORY
+# =============================================================================
+
+class AvailabilityEvent(Base):
+    """
+    One change of a property's availability.
+    Written by app.services.availability on every flush that creates,
+    deletes or changes the availability of a property.
+    """
+    __tablename__ = "availability_events"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    property_id = Column(Integer, nullable=False, index=True)  # No FK: outlives hard deletes
+    was_available = Column(Boolean, nullable=True)  # Null: property did not exist yet
+    is_available = Column(Boolean, nullable=True)  # Null: property was deleted
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class AvailabilityDaily(Base):
+    """End-of-day property totals, rolled up from AvailabilityEvent"""
+    __tablename__ = "availability_daily"
+    
+    day = Column(String(10), primary_key=True)  # ISO date (UTC)
+    total = Column(Integer, nullable=False)
+    available = Column(Integer, nullable=False)
+
+
+# =============================================================================
+# LEAD ROLLUPS
+# =============================================================================
+
+class LeadRollup(Base):
+    """
+    Lead counts per creation hour, status, source and property.
+    Kept current by app.services.lead_rollups as leads are written; a lead
+    moves between status rows as its status changes.
+    """
+    __tablename__ = "lead_rollups"
+    
+    hour = Column(String(13), primary_key=True)  # UTC creation hour, "YYYY-MM-DDTHH"
+    status = Column(String(50), primary_key=True)  # "" for NULL
+    source = Column(String(50), primary_key=True)  # "" for NULL
+    property_id = Column(Integer, primary_key=True)  # 0 for leads without a property
+    count = Column(Integer, nullable=False, default=0)
+
+
+# =============================================================================
+# DASHBOARD SUMMARY
+# =============================================================================
+
+class DashboardCounter(Base):
+    """
+    Materialized dashboard count, one row per (metric, key).
+    Kept current by app.services.dashboard on every flush and rebuilt
+    periodically by its reconcile job.
+    """
+    __tablename__ = "dashboard_counters"
+    
+    metric = Column(String(50), primary_key=True)  # e.g. "property_city", "lead_status"
+    key = Column(String(100), primary_key=True)  # Dimension value ("" for NULL)
+    count = Column(Integer, nullable=False, default=0)
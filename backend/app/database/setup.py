@@ -0,0 +1,67 @@
+"""
+IndoHomz Database Setup
+
+Schema migrations and admin provisioning, run as an explicit step
+(`python migrate.py`, once per deploy) rather than on every worker start.
+The app only runs them at startup when settings.STARTUP_MIGRATIONS is on
+(development, by default).
+"""
+
+import os
+from datetime import datetime
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.orm import Session
+
+from app.database import models
+from app.database.fulltext import ensure_fulltext_index
+
+ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@indohomz.com")
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "Admin@2024")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def migrate(engine) -> bool:
+    """
+    Create missing tables, then apply the Alembic revisions (indexes and
+    columns that create_all does not add to existing tables). Returns
+    whether full-text search is available.
+    """
+    models.Base.metadata.create_all(bind=engine)
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    return ensure_fulltext_index(engine)
+
+
+def ensure_admin_user(db: Session, reset_password: bool = False) -> str:
+    """
+    Create the admin user if missing. An existing admin is left alone (no
+    bcrypt hash, no write) unless reset_password is set. Returns "created",
+    "reset" or "exists".
+    """
+    from app.core.security import get_password_hash
+
+    admin = db.query(models.User).filter(models.User.email == ADMIN_EMAIL).first()
+    if admin is None:
+        db.add(models.User(
+            email=ADMIN_EMAIL,
+            password_hash=get_password_hash(ADMIN_PASSWORD),
+            name="Admin User",
+            role="admin",
+            is_active=True,
+            is_verified=True,
+            created_at=datetime.utcnow(),
+        ))
+        db.commit()
+        return "created"
+    if reset_password:
+        admin.password_hash = get_password_hash(ADMIN_PASSWORD)
+        db.commit()
+        return "reset"
+    return "exists"
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union
 from enum import Enum
 
 
@@ -60,6 +60,11 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int  # Seconds
+
+
 class TokenPayload(BaseModel):
     user_id: int
     email: str
@@ -95,6 +100,8 @@ class PropertyBase(BaseModel):
     location: str = Field(default="Gurgaon", max_length=255)
     area: Optional[str] = Field(None, max_length=100)
     city: str = Field(default="Gurgaon", max_length=100)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     
     # Property Details
     property_type: Optional[str] = Field(default="apartment", max_length=50)
@@ -129,6 +136,8 @@ class PropertyUpdate(BaseModel):
     location: Optional[str] = Field(None, max_length=255)
     area: Optional[str] = Field(None, max_length=100)
     city: Optional[str] = Field(None, max_length=100)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     property_type: Optional[str] = Field(None, max_length=50)
     bedrooms: Optional[int] = Field(None, ge=0, le=10)
     bathrooms: Optional[int] = Field(None, ge=0, le=10)
@@ -153,13 +162,98 @@ class Property(PropertyBase):
         from_attributes = True
 
 
+class PropertyCard(BaseModel):
+    """Listing card: the fields list views render (detail routes return Property)"""
+    id: int
+    slug: Optional[str] = None
+    title: str
+    price: str
+    location: str
+    area: Optional[str] = None
+    city: str
+    property_type: Optional[str] = None
+    bedrooms: Optional[int] = None
+    bathrooms: Optional[int] = None
+    area_sqft: Optional[int] = None
+    image_url: Optional[str] = None
+    amenities: Optional[str] = None  # Cards show amenity badges
+    is_available: bool
+
+    class Config:
+        from_attributes = True
+
+
 class PropertyListResponse(BaseModel):
     """Paginated property list response"""
-    items: List[Property]
-    total: int
+    items: List[PropertyCard]
+    total: Optional[int] = None  # Omitted on cursor pages, which would otherwise re-count every page
     skip: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for keyset pagination
+    total_is_exact: bool = True  # False when total hit the count cap (lower bound)
+
+
+class PropertyWithDistance(Property):
+    """Property plus its distance from the map search point"""
+    distance_km: float
+
+
+class PropertyGeoResponse(BaseModel):
+    """Map search results, nearest first"""
+    items: List[PropertyWithDistance]
+    total: int
+    center: dict  # {"latitude": ..., "longitude": ...} distances are measured from
+
+
+class FacetCount(BaseModel):
+    """One facet value and how many properties have it"""
+    value: Union[str, int]
+    count: int
+
+
+class PriceFacetCount(FacetCount):
+    """Price bucket facet; min is inclusive, max exclusive (None = open-ended)"""
+    label: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class PropertyFacets(BaseModel):
+    property_type: List[FacetCount]
+    bedrooms: List[FacetCount]
+    furnishing: List[FacetCount]
+    city: List[FacetCount]
+    price: List[PriceFacetCount]
+
+
+class PropertyFacetsResponse(BaseModel):
+    """Filter sidebar counts for the current filter set"""
+    total: int
+    facets: PropertyFacets
+
+
+class PropertyBulkItem(PropertyCreate):
+    """Property in a bulk request; slug defaults to one generated from the title"""
+    slug: Optional[str] = Field(None, min_length=1, max_length=255)
+
+
+class PropertyBulkRequest(BaseModel):
+    properties: List[PropertyBulkItem] = Field(..., min_length=1, max_length=1000)
+    upsert: bool = False  # Update properties whose slug already exists instead of creating new ones
+
+
+class PropertyBulkResult(BaseModel):
+    id: int
+    slug: str
+    created: bool  # False when an existing property was updated
+
+
+class PropertyBulkResponse(BaseModel):
+    """Per-item results, in request order"""
+    created: int
+    updated: int
+    results: List[PropertyBulkResult]
 
 
 # =============================================================================
@@ -267,6 +361,30 @@ class Booking(BookingBase):
         from_attributes = True
 
 
+# =============================================================================
+# IMPORT SCHEMAS (CSV uploads)
+# =============================================================================
+
+class ImportFieldError(BaseModel):
+    field: str
+    message: str
+
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row (the header is not counted)
+    errors: List[ImportFieldError]
+
+
+class ImportResponse(BaseModel):
+    """Outcome of a CSV import; rows listed in errors were not written"""
+    rows: int
+    created: int
+    updated: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = False  # More rows failed than are listed
+
+
 # =============================================================================
 # ANALYTICS SCHEMAS (IndoHomz Dashboard)
 # =============================================================================
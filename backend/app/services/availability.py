@@ -0,0 +1,172 @@
+"""
+IndoHomz Availability History
+
+Event log and daily rollups behind GET /analytics/properties/availability-trend.
+
+An after_flush hook logs an AvailabilityEvent whenever a property is created,
+deleted, or has is_available changed, whichever path made the change: the
+availability toggle, bookings and their cancellation, soft and hard deletes,
+and updates.
+
+AvailabilityDaily stores end-of-day (UTC) totals, written by roll_up() in
+migrate.py and the periodic reconcile task, never by a read. Rollups are
+computed backwards from COUNT(*) over properties: the end of day D is the
+current state minus every event logged after D. That costs one grouped query
+per rollup run however many days it covers, and re-anchors on the table each
+time, so writes that bypassed the log cannot make the series drift.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, insert, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import models
+from app.services import counters, stats
+from app.services.dashboard import dashboard_summary
+
+
+_events = models.AvailabilityEvent.__table__
+
+
+def _was_available(obj) -> Optional[bool]:
+    history = inspect(obj).attrs.is_available.history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    # Old value was never loaded; a change of a boolean can only be a flip
+    return not obj.is_available
+
+
+@event.listens_for(Session, "after_flush")
+def _log_availability_changes(session, flush_context):
+    """Record availability transitions made by this flush"""
+    rows = []
+
+    for obj in session.new:
+        if isinstance(obj, models.Property):
+            rows.append({"property_id": obj.id, "was_available": None, "is_available": obj.is_available})
+
+    for obj in session.deleted:
+        if isinstance(obj, models.Property):
+            rows.append({"property_id": obj.id, "was_available": _was_available(obj), "is_available": None})
+
+    for obj in session.dirty:
+        if isinstance(obj, models.Property) and inspect(obj).attrs.is_available.history.has_changes():
+            was = _was_available(obj)
+            if was != obj.is_available:
+                rows.append({"property_id": obj.id, "was_available": was, "is_available": obj.is_available})
+
+    if rows:
+        connection = session.connection()
+        if counters.table_present(connection, _events):
+            connection.execute(insert(_events), rows)
+
+
+class AvailabilityHistory:
+    """Daily availability rollups and the trend read from them"""
+
+    def _live_counts(self, db: Session) -> Tuple[int, int]:
+        # Materialized dashboard counters: an indexed read, not a properties scan
+        summary = dashboard_summary.get_summary(db)
+        return summary["total_properties"], summary["available_properties"]
+
+    def _table_counts(self, db: Session) -> Tuple[int, int]:
+        # Stored history is anchored on the table itself, so counter drift is never persisted
+        P = models.Property
+        total, available = db.query(
+            func.count(P.id), func.sum(case((P.is_available == True, 1), else_=0))
+        ).one()
+        return total or 0, available or 0
+
+    def _net_changes_by_day(self, db: Session, since: date) -> Dict[str, Tuple[int, int]]:
+        """Per-day (total delta, available delta) of events on or after since"""
+        E = models.AvailabilityEvent
+        day = func.substr(counters.hour_expression(db, E.created_at), 1, 10)  # UTC day
+        rows = db.query(
+            day,
+            func.sum(case((E.is_available.isnot(None), 1), else_=0))
+            - func.sum(case((E.was_available.isnot(None), 1), else_=0)),
+            func.sum(case((E.is_available == True, 1), else_=0))
+            - func.sum(case((E.was_available == True, 1), else_=0)),
+        ).filter(
+            # The created_at bound (a day early, for time zones) uses the index; the day bound is exact
+            E.created_at >= datetime.combine(since, datetime.min.time()) - timedelta(days=1),
+            day >= since.isoformat(),
+        ).group_by(day).all()
+        return {str(d): (total or 0, available or 0) for d, total, available in rows}
+
+    def roll_up(self, db: Session, today: Optional[date] = None):
+        """Write AvailabilityDaily rows for every finished day not yet rolled up"""
+        today = today or datetime.utcnow().date()
+        yesterday = today - timedelta(days=1)
+
+        D = models.AvailabilityDaily
+        last = db.query(func.max(D.day)).scalar()
+        if last:
+            start = date.fromisoformat(last) + timedelta(days=1)
+        else:
+            # Nothing is known before the first logged event
+            first = db.query(func.min(models.AvailabilityEvent.created_at)).scalar()
+            start = min(date.fromisoformat(counters.hour_key(first)[:10]), yesterday) if first else yesterday
+        if start > yesterday:
+            return
+
+        total, available = self._table_counts(db)
+        net = self._net_changes_by_day(db, start)
+
+        # Walk back from now: end of day D = state at end of D+1 minus D+1's changes
+        rows = []
+        day = today
+        while day > start - timedelta(days=1):
+            delta_total, delta_available = net.get(day.isoformat(), (0, 0))
+            total, available = total - delta_total, available - delta_available
+            day -= timedelta(days=1)
+            if day >= start:
+                rows.append({"day": day.isoformat(), "total": total, "available": available})
+
+        try:
+            db.execute(insert(D.__table__), rows)
+            db.commit()
+        except IntegrityError:
+            # Another worker rolled up the same days
+            db.rollback()
+
+    def get_trend(self, db: Session, days: int, today: Optional[date] = None) -> dict:
+        """
+        Daily availability for the last `days` days, ending with today's live
+        counts. Read-only: days not yet rolled up are missing until the next
+        reconcile.
+        """
+        today = today or datetime.utcnow().date()
+
+        D = models.AvailabilityDaily
+        since = (today - timedelta(days=days - 1)).isoformat()
+        history = db.query(D.day, D.total, D.available).filter(D.day >= since).order_by(D.day).all()
+        total, available = self._live_counts(db)
+
+        points: List[dict] = [
+            {"date": day, "total": t, "available": a, "availability_rate": stats.rate(a, t)}
+            for day, t, a in history
+        ]
+        points.append({
+            "date": today.isoformat(),
+            "total": total,
+            "available": available,
+            "availability_rate": stats.rate(available, total),
+        })
+
+        return {
+            "period_days": days,
+            "current_availability_rate": stats.rate(available, total),
+            "total_properties": total,
+            "available_properties": available,
+            "trend": points,
+        }
+
+
+# Global availability history instance
+availability_history = AvailabilityHistory()
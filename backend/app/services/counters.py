@@ -0,0 +1,138 @@
+"""
+IndoHomz Counter Tables
+
+Helpers shared by the materialized count tables (dashboard counters, lead
+rollups) that session hooks keep current as rows are written.
+"""
+
+import asyncio
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Table, func, insert, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def current_value(obj, attr: str):
+    """Attribute value as it will be written (column defaults apply to None on insert)"""
+    value = getattr(obj, attr)
+    if value is None:
+        default = obj.__table__.c[attr].default
+        if default is not None and default.is_scalar:
+            return default.arg
+    return value
+
+
+def previous_value(obj, attr: str):
+    """Attribute value as last loaded from the database"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+
+def changed(obj, attrs) -> bool:
+    """Whether any of attrs has a pending change"""
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def hour_key(value: Optional[datetime]) -> str:
+    """UTC hour bucket of a timestamp, "YYYY-MM-DDTHH" (rows being inserted count as now)"""
+    value = value or datetime.utcnow()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H")
+
+
+def hour_expression(db, column):
+    """SQL equivalent of hour_key() for the session's dialect"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(func.timezone("UTC", column), 'YYYY-MM-DD"T"HH24')
+    return func.strftime("%Y-%m-%dT%H", column)
+
+
+def lock_for_rebuild(db, table: Table) -> bool:
+    """
+    Prepare db to rebuild table from its source rows; False means skip.
+
+    On PostgreSQL, only one session rebuilds a table at a time (a transaction
+    advisory lock; other workers skip), and the table is then locked against
+    hook deltas until commit, so no delta committed in between is lost to the
+    delete-and-reinsert. Elsewhere (SQLite) the rebuild's first statement, a
+    delete, takes the database write lock instead.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    if not db.execute(select(func.pg_try_advisory_xact_lock(zlib.crc32(table.name.encode())))).scalar():
+        return False
+    db.execute(text(f"LOCK TABLE {table.name} IN SHARE ROW EXCLUSIVE MODE"))
+    return True
+
+
+# (engine, table) pairs known to exist
+_table_present = set()
+
+
+def table_present(connection, table: Table) -> bool:
+    """
+    Whether table exists. Only a positive answer is cached (per engine): a
+    worker started before migrate.py created the table picks it up on the
+    next write instead of skipping counts until it restarts.
+    """
+    key = (connection.engine, table.name)
+    if key not in _table_present:
+        if not inspect(connection).has_table(table.name):
+            return False
+        _table_present.add(key)
+    return True
+
+
+def add_counts(connection, table: Table, key_columns: List[str], deltas: Dict[tuple, int]):
+    """Add deltas to table.count for each key tuple, creating missing rows"""
+    # Sorted so concurrent transactions lock rows in the same order
+    rows = [
+        {**dict(zip(key_columns, key)), "count": delta}
+        for key, delta in sorted(deltas.items())
+    ]
+    dialect = connection.dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={"count": table.c.count + stmt.excluded["count"]},
+        )
+        connection.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(*[table.c[column] == row[column] for column in key_columns])
+            .values(count=table.c.count + row["count"])
+        )
+        if not result.rowcount:
+            connection.execute(insert(table).values(**row))
+
+
+async def reconcile_periodically(session_factory, interval_seconds: int, jobs: List[Callable]):
+    """Background task: run each reconcile job(db) every interval_seconds"""
+    def run():
+        db = session_factory()
+        try:
+            for job in jobs:
+                job(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run)
+        except Exception as e:
+            print(f"⚠ Counter reconcile failed: {e}")
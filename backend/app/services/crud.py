@@ -3,16 +3,26 @@ IndoHomz CRUD Services
 Handles all database operations for properties, leads, and bookings.
 """
 
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import and_, or_, func, desc, select
-from typing import List, Optional, Dict, Tuple
-from datetime import datetime
+from sqlalchemy.orm import Session, Query, aliased, load_only, selectinload
+from sqlalchemy import and_, or_, func, desc, select, case, null
+from typing import List, Optional, Dict, Sequence, Set, Tuple
+from collections import Counter
+from datetime import datetime, timedelta
+import base64
+import json
 import re
 
-from app.database import models
+from app.database import models, fulltext
+from app.database.fulltext import fulltext_available
 from app.schemas import schemas
 from app.core.cache import cache, cached, invalidate_cache
 from app.core.config import settings
+from app.core.responses import partial_model
+from app.services import events, stats
+from app.services.exports import export_query
+from app.services.lead_rollups import lead_rollups
+from app.services.search_engine import search_engine
+from app.utils import geo
 
 
 def generate_slug(title: str) -> str:
@@ -24,6 +34,10 @@ def generate_slug(title: str) -> str:
     return slug
 
 
+# LIKE patterns per slug lookup query in bulk_upsert_properties
+BULK_SLUG_PATTERN_CHUNK = 200
+
+
 def escape_like_pattern(pattern: str) -> str:
     r"""
     Escape special characters in SQL LIKE patterns to prevent injection.
@@ -38,6 +52,188 @@ def escape_like_pattern(pattern: str) -> str:
     return pattern
 
 
+def bounded_count_limit(skip: int, limit: int) -> int:
+    """
+    Row cap for listing totals.
+    
+    Totals are exact up to settings.LIST_COUNT_CAP (or just past the requested
+    page, if deeper); a total equal to the cap is a lower bound, not exact.
+    """
+    return max(settings.LIST_COUNT_CAP, skip + limit + 1)
+
+
+# =============================================================================
+# CITY / LOCATION MATCHING
+# =============================================================================
+
+# Per-engine snapshot of distinct city keys: {engine: (expires_at, {lower(trim(city))})}
+_known_cities: Dict[object, Tuple[datetime, Set[str]]] = {}
+
+
+def city_key(column=models.Property.city):
+    """Normalized city expression, lower(trim(city)); served by idx_property_city_key"""
+    return func.lower(func.trim(column))
+
+
+def known_cities(db: Session) -> Set[str]:
+    """
+    Lowercase, trimmed city names present in the properties table, refreshed
+    every CACHE_TTL_PROPERTIES seconds. Only used to choose between exact and
+    substring matching; a city missing from a stale snapshot falls through to
+    substring matching, which still returns its rows.
+    """
+    bind = db.get_bind()
+    key = getattr(bind, "engine", bind)
+    now = datetime.now()
+    
+    snapshot = _known_cities.get(key)
+    if snapshot is None or snapshot[0] < now:
+        cities = db.query(city_key()).distinct().all()
+        values = {c for (c,) in cities if c}
+        snapshot = (now + timedelta(seconds=settings.CACHE_TTL_PROPERTIES), values)
+        _known_cities[key] = snapshot
+    return snapshot[1]
+
+
+def contains_filter(column, value: str):
+    """
+    Case-insensitive substring match.
+    Served by the pg_trgm GIN indexes on Postgres (see fulltext.py).
+    """
+    escaped = escape_like_pattern(value.strip())
+    return column.ilike(f"%{escaped}%", escape='\\')
+
+
+def city_filter(db: Session, city: str):
+    """
+    Filter clause for a city parameter.
+    
+    A value naming a known city becomes an equality match on lower(trim(city)),
+    so every stored spelling ("Gurgaon", "gurgaon ") matches, served by the
+    idx_property_city_key expression index. Anything else ("gurg", "new delhi
+    ncr") is a substring match backed by the trigram index.
+    """
+    key = city.strip().lower()
+    if key in known_cities(db):
+        return city_key() == key
+    return contains_filter(models.Property.city, city)
+
+
+# =============================================================================
+# FACETS
+# =============================================================================
+
+# Price buckets are (key, label, min inclusive, max exclusive); None = open-ended
+
+# Monthly rent buckets for the filter sidebar
+PRICE_BUCKETS = [
+    ("under_10k", "Under ₹10K", None, 10000),
+    ("10k_20k", "₹10K - ₹20K", 10000, 20000),
+    ("20k_30k", "₹20K - ₹30K", 20000, 30000),
+    ("30k_50k", "₹30K - ₹50K", 30000, 50000),
+    ("50k_1l", "₹50K - ₹1L", 50000, 100000),
+    ("above_1l", "Above ₹1L", 100000, None),
+]
+
+
+# Wider ranges used by the analytics price distribution
+PRICE_DISTRIBUTION_BUCKETS = [
+    ("Under ₹50K", "Under ₹50K", None, 50000),
+    ("₹50K - ₹1L", "₹50K - ₹1L", 50000, 100000),
+    ("₹1L - ₹2L", "₹1L - ₹2L", 100000, 200000),
+    ("₹2L - ₹3L", "₹2L - ₹3L", 200000, 300000),
+    ("Above ₹3L", "Above ₹3L", 300000, None),
+]
+
+
+def price_bucket_expression(buckets=PRICE_BUCKETS):
+    """SQL CASE mapping price_numeric to a bucket key (NULL when unknown)"""
+    whens = [(models.Property.price_numeric.is_(None), null())]
+    whens += [
+        (models.Property.price_numeric < upper, key)
+        for key, _, _, upper in buckets if upper is not None
+    ]
+    return case(*whens, else_=buckets[-1][0])
+
+
+# =============================================================================
+# KEYSET (CURSOR) PAGINATION
+# =============================================================================
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe cursor token"""
+    payload = json.dumps(
+        [created_at.isoformat() if created_at else None, row_id],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor token produced by encode_cursor.
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def paginate_keyset(
+    query: Query,
+    model,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page ordered by (created_at DESC, id DESC), starting after `cursor`.
+    
+    Unlike OFFSET, the database seeks straight to the cursor position, so page
+    N costs the same as page 1. Returns the rows and the cursor for the next
+    page (None when there are no more rows).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Compare against the stored value of the anchor row so the comparison
+        # is exact on every backend; fall back to the encoded timestamp if the
+        # anchor row has since been deleted.
+        anchor = select(model.created_at).where(model.id == row_id).scalar_subquery()
+        if created_at is not None:
+            anchor = func.coalesce(anchor, created_at)
+        query = query.filter(
+            or_(
+                model.created_at < anchor,
+                and_(model.created_at == anchor, model.id < row_id),
+            )
+        )
+    
+    rows = query.order_by(desc(model.created_at), desc(model.id)).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def load_fields(entity, names: Sequence[str]):
+    """load_only() option for the named columns of entity"""
+    return load_only(*[getattr(entity, name) for name in dict.fromkeys(names)])
+
+
+def card_columns(entity=models.Property, fields: Optional[Sequence[str]] = None):
+    """
+    load_only() option for property listings: the requested fields (a
+    sparse fieldset), or the PropertyCard fields, plus created_at for
+    cursors. Listing queries skip description, images and the other
+    detail-only columns.
+    """
+    return load_fields(entity, [*(fields or schemas.PropertyCard.model_fields), "created_at"])
+
+
 # =============================================================================
 # PROPERTY SERVICE
 # =============================================================================
@@ -45,14 +241,64 @@ def escape_like_pattern(pattern: str) -> str:
 class PropertyService:
     """Service for Property CRUD operations"""
     
-    def get_property(self, db: Session, property_id: int) -> Optional[models.Property]:
-        """Get a single property by ID"""
-        return db.query(models.Property).filter(models.Property.id == property_id).first()
-    
-    def get_property_by_slug(self, db: Session, slug: str) -> Optional[models.Property]:
-        """Get a property by its URL slug"""
-        return db.query(models.Property).filter(models.Property.slug == slug).first()
+    def get_property(
+        self,
+        db: Session,
+        property_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[models.Property]:
+        """Get a single property by ID (only the given columns, if any)"""
+        query = db.query(models.Property)
+        if fields:
+            query = query.options(load_fields(models.Property, fields))
+        return query.filter(models.Property.id == property_id).first()
     
+    def get_property_by_slug(
+        self,
+        db: Session,
+        slug: str,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[models.Property]:
+        """Get a property by its URL slug (only the given columns, if any)"""
+        query = db.query(models.Property)
+        if fields:
+            query = query.options(load_fields(models.Property, fields))
+        return query.filter(models.Property.slug == slug).first()
+
+    def _get_properties_by(self, db: Session, column: str, keys: Sequence) -> List[dict]:
+        """
+        Properties whose column (id or slug) is in keys, in keys order (unknown
+        keys skipped). Each property is cached on its own as its full Property
+        payload; the misses are fetched in one IN query. Full rows are always
+        loaded so every cached entry can serve any fieldset: a fields= selection
+        is applied only when the router serializes the payloads.
+        """
+        keys = list(dict.fromkeys(keys))
+        cache_keys = {key: cache._make_key(f"properties:item:{column}", key=key) for key in keys}
+        found = {}
+        for key in keys:
+            cached_item = cache.get(cache_keys[key])
+            if cached_item:
+                found[key] = cached_item
+
+        misses = [key for key in keys if key not in found]
+        if misses:
+            attr = getattr(models.Property, column)
+            for prop in db.query(models.Property).filter(attr.in_(misses)):
+                item = schemas.Property.model_validate(prop).model_dump(mode="json")
+                found[getattr(prop, column)] = item
+                cache.set(cache_keys[getattr(prop, column)], item, ttl=settings.CACHE_TTL_PROPERTIES)
+
+        return [found[key] for key in keys if key in found]
+
+    def get_properties_by_ids(self, db: Session, property_ids: Sequence[int]) -> List[dict]:
+        """Properties by ID in request order (cached per property)"""
+        return self._get_properties_by(db, "id", property_ids)
+
+    def get_properties_by_slugs(self, db: Session, slugs: Sequence[str]) -> List[dict]:
+        """Properties by slug in request order (cached per property)"""
+        return self._get_properties_by(db, "slug", slugs)
+
     def get_properties(
         self,
         db: Session,
@@ -63,9 +309,14 @@ class PropertyService:
         location: Optional[str] = None,
         property_type: Optional[str] = None,
         min_bedrooms: Optional[int] = None,
-        max_price: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> Tuple[List[models.Property], int]:
-        """Get properties with optional filters and total count (with caching)"""
+        """
+        Get properties with optional filters and total count (with caching).
+        Loads only the card columns, or the given fields.
+        """
         
         # Generate cache key
         cache_key = cache._make_key(
@@ -77,7 +328,9 @@ class PropertyService:
             location=location,
             type=property_type,
             bedrooms=min_bedrooms,
-            price=max_price
+            price_min=min_price,
+            price=max_price,
+            fields=",".join(fields) if fields else None,
         )
         
         # Try cache first
@@ -85,107 +338,504 @@ class PropertyService:
         if cached_result:
             return cached_result["items"], cached_result["total"]
         
-        # Build query with eager loading to prevent N+1
-        query = db.query(models.Property)
-        count_query = db.query(func.count(models.Property.id))
+        query = self._filter_properties(
+            db.query(models.Property),
+            is_available=is_available,
+            city=city,
+            location=location,
+            property_type=property_type,
+            min_bedrooms=min_bedrooms,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        
+        # Page and total in one round trip: the filtered rows are capped at
+        # count_limit (index-ordered, so the cap is cheap), then a window
+        # COUNT over the capped set rides along with the requested page.
+        count_limit = bounded_count_limit(skip, limit)
+        capped = query.order_by(
+            desc(models.Property.created_at), desc(models.Property.id)
+        ).limit(count_limit).subquery()
+        prop = aliased(models.Property, capped)
+        
+        rows = db.query(prop, func.count().over().label("total")).options(
+            card_columns(prop, fields)
+        ).order_by(
+            desc(prop.created_at), desc(prop.id)
+        ).offset(skip).limit(limit).all()
+        
+        items = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        else:
+            # Page past the end: no row to carry the window count
+            total = min(
+                self.get_properties_count(
+                    db,
+                    is_available=is_available,
+                    city=city,
+                    location=location,
+                    property_type=property_type,
+                    min_bedrooms=min_bedrooms,
+                    min_price=min_price,
+                    max_price=max_price,
+                ),
+                count_limit,
+            )
         
+        # Cache result
+        result = {"items": items, "total": total}
+        cache.set(cache_key, result, ttl=settings.CACHE_TTL_PROPERTIES)
+        
+        return items, total
+    
+    def _filter_properties(
+        self,
+        query: Query,
+        is_available: Optional[bool] = None,
+        city: Optional[str] = None,
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_bedrooms: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> Query:
+        """Apply the standard listing filters to a property query"""
         if is_available is not None:
             query = query.filter(models.Property.is_available == is_available)
-            count_query = count_query.filter(models.Property.is_available == is_available)
         if city:
-            escaped_city = escape_like_pattern(city)
-            query = query.filter(models.Property.city.ilike(f"%{escaped_city}%", escape='\\'))
-            count_query = count_query.filter(models.Property.city.ilike(f"%{escaped_city}%", escape='\\'))
+            query = query.filter(city_filter(query.session, city))
         if location:
-            escaped_location = escape_like_pattern(location)
-            query = query.filter(models.Property.location.ilike(f"%{escaped_location}%", escape='\\'))
-            count_query = count_query.filter(models.Property.location.ilike(f"%{escaped_location}%", escape='\\'))
+            query = query.filter(contains_filter(models.Property.location, location))
         if property_type:
             query = query.filter(models.Property.property_type == property_type)
-            count_query = count_query.filter(models.Property.property_type == property_type)
         if min_bedrooms is not None:
             query = query.filter(models.Property.bedrooms >= min_bedrooms)
-            count_query = count_query.filter(models.Property.bedrooms >= min_bedrooms)
+        if min_price is not None:
+            query = query.filter(models.Property.price_numeric >= min_price)
+        if max_price is not None:
+            query = query.filter(models.Property.price_numeric <= max_price)
+        return query
+    
+    def get_properties_page(
+        self,
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 12,
+        is_available: Optional[bool] = None,
+        city: Optional[str] = None,
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_bedrooms: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Get one page of properties using keyset pagination (newest first).
+        Returns the page, serialized as PropertyCard payloads (or just the
+        given fields) so it can be cached in Redis, and the cursor for the
+        next page. Loads only the card columns, or the given fields.
+        """
+        cache_key = cache._make_key(
+            "properties:page",
+            cursor=cursor,
+            limit=limit,
+            available=is_available,
+            city=city,
+            location=location,
+            type=property_type,
+            bedrooms=min_bedrooms,
+            price_min=min_price,
+            price=max_price,
+            fields=",".join(fields) if fields else None,
+        )
         
-        # Get total count
-        total = count_query.scalar() or 0
+        cached_result = cache.get(cache_key)
+        if cached_result:
+            return cached_result["items"], cached_result["next_cursor"]
         
-        # Order by newest first
-        query = query.order_by(desc(models.Property.created_at))
-        items = query.offset(skip).limit(limit).all()
+        query = self._filter_properties(
+            db.query(models.Property).options(card_columns(fields=fields)),
+            is_available=is_available,
+            city=city,
+            location=location,
+            property_type=property_type,
+            min_bedrooms=min_bedrooms,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        rows, next_cursor = paginate_keyset(query, models.Property, cursor, limit)
+        item_model = partial_model(schemas.Property, tuple(fields)) if fields else schemas.PropertyCard
+        items = [item_model.model_validate(row).model_dump(mode="json") for row in rows]
         
-        # Cache result
-        result = {"items": items, "total": total}
-        cache.set(cache_key, result, ttl=settings.CACHE_TTL_PROPERTIES)
+        cache.set(
+            cache_key,
+            {"items": items, "next_cursor": next_cursor},
+            ttl=settings.CACHE_TTL_PROPERTIES,
+        )
+        return items, next_cursor
+    
+    def _properties_in_box(
+        self,
+        db: Session,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        is_available: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[models.Property]:
+        """
+        Properties inside a bounding box, found via geohash-prefix range scans
+        (which assume byte-order comparison of geohash: COLLATE "C" on Postgres)
+        """
+        cells = geo.covering_cells(min_lat, min_lng, max_lat, max_lng)
+        query = db.query(models.Property)
+        if fields:
+            # Coordinates are always needed for the distance
+            query = query.options(load_fields(models.Property, [*fields, "latitude", "longitude"]))
+        query = query.filter(
+            or_(*[
+                and_(
+                    models.Property.geohash >= cell,
+                    models.Property.geohash < cell + geo.PREFIX_RANGE_END,
+                )
+                for cell in cells
+            ]),
+            models.Property.latitude.between(min_lat, max_lat),
+            models.Property.longitude.between(min_lng, max_lng),
+        )
+        if is_available is not None:
+            query = query.filter(models.Property.is_available == is_available)
+        return query.all()
+    
+    def get_properties_near(
+        self,
+        db: Session,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 50,
+        is_available: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Tuple[models.Property, float]], int]:
+        """
+        Properties within radius_km of a point, nearest first.
+        Returns (property, distance_km) pairs and the total number in range.
+        """
+        box = geo.bounding_box(latitude, longitude, radius_km)
+        in_range = []
+        for prop in self._properties_in_box(db, *box, is_available=is_available, fields=fields):
+            distance = geo.haversine_km(latitude, longitude, prop.latitude, prop.longitude)
+            if distance <= radius_km:
+                in_range.append((prop, distance))
         
-        return items, total
+        in_range.sort(key=lambda pair: pair[1])
+        return in_range[:limit], len(in_range)
+    
+    def get_properties_in_bounds(
+        self,
+        db: Session,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        limit: int = 100,
+        is_available: Optional[bool] = None,
+        center: Optional[Tuple[float, float]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Tuple[models.Property, float]], int]:
+        """
+        Properties inside a map viewport, nearest to `center` first
+        (defaults to the middle of the box).
+        Returns (property, distance_km) pairs and the total number in bounds.
+        """
+        if center is None:
+            center = ((min_lat + max_lat) / 2, (min_lng + max_lng) / 2)
+        
+        in_bounds = [
+            (prop, geo.haversine_km(center[0], center[1], prop.latitude, prop.longitude))
+            for prop in self._properties_in_box(
+                db, min_lat, min_lng, max_lat, max_lng, is_available=is_available, fields=fields
+            )
+        ]
+        in_bounds.sort(key=lambda pair: pair[1])
+        return in_bounds[:limit], len(in_bounds)
+    
+    def get_property_facets(
+        self,
+        db: Session,
+        is_available: Optional[bool] = None,
+        city: Optional[str] = None,
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_bedrooms: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> dict:
+        """
+        Facet counts (type, bedrooms, furnishing, city, price bucket) for a filter set.
+        
+        One GROUP BY over every facet column at once returns one row per
+        distinct combination; the per-facet counts are rolled up from those
+        rows in Python. Cached per normalized filter set.
+        """
+        cache_key = cache._make_key(
+            "properties:facets",
+            available=is_available,
+            city=city.strip().lower() if city else None,
+            location=location.strip().lower() if location else None,
+            type=property_type,
+            bedrooms=min_bedrooms,
+            price_min=min_price,
+            price=max_price,
+        )
+        cached_result = cache.get(cache_key)
+        if cached_result:
+            return cached_result
+        
+        price_bucket = price_bucket_expression().label("price_bucket")
+        columns = [
+            models.Property.property_type,
+            models.Property.bedrooms,
+            models.Property.furnishing,
+            models.Property.city,
+            price_bucket,
+        ]
+        query = self._filter_properties(
+            db.query(*columns, func.count(models.Property.id)),
+            is_available=is_available,
+            city=city,
+            location=location,
+            property_type=property_type,
+            min_bedrooms=min_bedrooms,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        rows = query.group_by(*columns).all()
+        
+        names = ["property_type", "bedrooms", "furnishing", "city", "price"]
+        counts = {name: {} for name in names}
+        total = 0
+        for *values, count in rows:
+            total += count
+            for name, value in zip(names, values):
+                if value is not None:
+                    counts[name][value] = counts[name].get(value, 0) + count
+        
+        def ranked(facet: dict) -> List[dict]:
+            return [
+                {"value": value, "count": count}
+                for value, count in sorted(facet.items(), key=lambda item: (-item[1], str(item[0])))
+            ]
+        
+        result = {
+            "total": total,
+            "facets": {
+                "property_type": ranked(counts["property_type"]),
+                "bedrooms": [
+                    {"value": value, "count": counts["bedrooms"][value]}
+                    for value in sorted(counts["bedrooms"])
+                ],
+                "furnishing": ranked(counts["furnishing"]),
+                "city": ranked(counts["city"]),
+                "price": [
+                    {
+                        "value": key,
+                        "label": label,
+                        "min": lower,
+                        "max": upper,
+                        "count": counts["price"].get(key, 0),
+                    }
+                    for key, label, lower, upper in PRICE_BUCKETS
+                ],
+            },
+        }
+        
+        cache.set(cache_key, result, ttl=settings.CACHE_TTL_PROPERTIES)
+        return result
     
     def get_properties_count(
         self,
         db: Session,
         is_available: Optional[bool] = None,
         city: Optional[str] = None,
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_bedrooms: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
     ) -> int:
         """Get total count of properties with filters"""
-        query = db.query(func.count(models.Property.id))
-        
-        if is_available is not None:
-            query = query.filter(models.Property.is_available == is_available)
-        if city:
-            escaped_city = escape_like_pattern(city)
-            query = query.filter(models.Property.city.ilike(f"%{escaped_city}%", escape='\\'))
-        
+        query = self._filter_properties(
+            db.query(func.count(models.Property.id)),
+            is_available=is_available,
+            city=city,
+            location=location,
+            property_type=property_type,
+            min_bedrooms=min_bedrooms,
+            min_price=min_price,
+            max_price=max_price,
+        )
         return query.scalar() or 0
     
-    def get_available_properties(self, db: Session, skip: int = 0, limit: int = 12):
-        """Get only available properties (with caching)"""
-        return self.get_properties(db, skip=skip, limit=limit, is_available=True)
+    def export_properties(
+        self,
+        db: Session,
+        is_available: Optional[bool] = None,
+        city: Optional[str] = None,
+        location: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_bedrooms: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> Query:
+        """Column query for a streaming export, with the listing filters"""
+        return self._filter_properties(
+            export_query(db, models.Property, schemas.Property),
+            is_available=is_available,
+            city=city,
+            location=location,
+            property_type=property_type,
+            min_bedrooms=min_bedrooms,
+            min_price=min_price,
+            max_price=max_price,
+        )
+    
+    def get_available_properties(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 12,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[models.Property]:
+        """Get only available properties, card columns or the given fields (with caching)"""
+        items, _ = self.get_properties(db, skip=skip, limit=limit, is_available=True, fields=fields)
+        return items
     
     @cached(ttl=300, key_prefix="properties:featured")
-    def get_featured_properties(self, db: Session, limit: int = 6) -> List[models.Property]:
-        """Get featured/highlighted properties for homepage (cached)"""
-        return db.query(models.Property).filter(
+    def get_featured_properties(
+        self,
+        db: Session,
+        limit: int = 6,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[models.Property]:
+        """Get featured/highlighted properties for homepage, card columns or the given fields (cached)"""
+        return db.query(models.Property).options(card_columns(fields=fields)).filter(
             models.Property.is_available == True
         ).order_by(desc(models.Property.created_at)).limit(limit).all()
     
-    def search_properties(
+    def _search_query(
         self,
         db: Session,
         query_text: Optional[str] = None,
         filters: Optional[dict] = None,
-        skip: int = 0,
-        limit: int = 12,
-    ) -> List[models.Property]:
-        """Search properties by text and filters"""
+    ) -> Tuple[Query, list]:
+        """
+        Build the filtered search query and its ordering.
+        
+        Text queries use the full-text index (ranked by relevance) when the
+        database has one, and fall back to ILIKE across the text columns.
+        """
         query = db.query(models.Property)
+        order_by = [desc(models.Property.created_at), desc(models.Property.id)]
         
         # Text search across multiple fields
         if query_text:
-            escaped_text = escape_like_pattern(query_text)
-            search_term = f"%{escaped_text}%"
-            query = query.filter(
-                or_(
-                    models.Property.title.ilike(search_term, escape='\\'),
-                    models.Property.location.ilike(search_term, escape='\\'),
-                    models.Property.area.ilike(search_term, escape='\\'),
-                    models.Property.amenities.ilike(search_term, escape='\\'),
-                    models.Property.description.ilike(search_term, escape='\\'),
+            dialect = db.get_bind().dialect.name
+            if fulltext_available(db) and dialect == "sqlite":
+                match = fulltext.sqlite_match_expression(query_text)
+                if match:
+                    fts = fulltext.sqlite_match_subquery(match)
+                    query = query.join(fts, fts.c.id == models.Property.id)
+                    order_by.insert(0, fts.c.rank)
+            elif fulltext_available(db) and dialect == "postgresql":
+                tsquery_text = fulltext.pg_tsquery_expression(query_text)
+                if tsquery_text:
+                    tsquery = func.to_tsquery(fulltext.TS_CONFIG, tsquery_text)
+                    vector = fulltext.pg_search_vector()
+                    query = query.filter(vector.op("@@")(tsquery))
+                    order_by.insert(0, desc(func.ts_rank(vector, tsquery)))
+            else:
+                escaped_text = escape_like_pattern(query_text)
+                search_term = f"%{escaped_text}%"
+                query = query.filter(
+                    or_(
+                        models.Property.title.ilike(search_term, escape='\\'),
+                        models.Property.location.ilike(search_term, escape='\\'),
+                        models.Property.area.ilike(search_term, escape='\\'),
+                        models.Property.amenities.ilike(search_term, escape='\\'),
+                        models.Property.description.ilike(search_term, escape='\\'),
+                    )
                 )
-            )
         
         # Apply additional filters
         if filters:
             if filters.get("city"):
-                escaped_city = escape_like_pattern(filters['city'])
-                query = query.filter(models.Property.city.ilike(f"%{escaped_city}%", escape='\\'))
+                query = query.filter(city_filter(db, filters["city"]))
             if filters.get("property_type"):
                 query = query.filter(models.Property.property_type == filters["property_type"])
             if filters.get("bedrooms"):
                 query = query.filter(models.Property.bedrooms == filters["bedrooms"])
             if filters.get("is_available") is not None:
                 query = query.filter(models.Property.is_available == filters["is_available"])
+            if filters.get("min_price") is not None:
+                query = query.filter(models.Property.price_numeric >= filters["min_price"])
+            if filters.get("max_price") is not None:
+                query = query.filter(models.Property.price_numeric <= filters["max_price"])
+        
+        return query, order_by
+    
+    def _memory_search(
+        self,
+        db: Session,
+        query_text: Optional[str],
+        filters: Optional[dict],
+    ) -> Optional[List[int]]:
+        """
+        Ranked property IDs from the in-process search engine, or None when
+        it is not enabled (SEARCH_ENGINE=memory) or there is no text query.
+        """
+        if settings.SEARCH_ENGINE != "memory" or not query_text:
+            return None
+        search_engine.ensure_fresh(db)
+        return search_engine.search(query_text, filters)
+    
+    def search_properties(
+        self,
+        db: Session,
+        query_text: Optional[str] = None,
+        filters: Optional[dict] = None,
+        skip: int = 0,
+        limit: int = 12,
+    ) -> List[models.Property]:
+        """Search properties by text and filters, most relevant first"""
+        ranked_ids = self._memory_search(db, query_text, filters)
+        if ranked_ids is not None:
+            page_ids = ranked_ids[skip:skip + limit]
+            if not page_ids:
+                return []
+            rows = db.query(models.Property).filter(models.Property.id.in_(page_ids)).all()
+            by_id = {p.id: p for p in rows}
+            return [by_id[i] for i in page_ids if i in by_id]
+        
+        query, order_by = self._search_query(db, query_text, filters)
+        return query.order_by(*order_by).offset(skip).limit(limit).all()
+    
+    def search_properties_count(
+        self,
+        db: Session,
+        query_text: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> int:
+        """Count all matches for a search (same text query and filters)"""
+        ranked_ids = self._memory_search(db, query_text, filters)
+        if ranked_ids is not None:
+            return len(ranked_ids)
         
-        return query.offset(skip).limit(limit).all()
+        query, _ = self._search_query(db, query_text, filters)
+        return query.with_entities(func.count(models.Property.id)).scalar() or 0
     
     @invalidate_cache("properties:*")
     def create_property(self, db: Session, property_data: schemas.PropertyCreate) -> models.Property:
@@ -206,8 +856,79 @@ class PropertyService:
         db.add(db_property)
         db.commit()
         db.refresh(db_property)
+        search_engine.index_property(db_property)
         return db_property
     
+    def _numbered_slugs(self, db: Session, bases: List[str]) -> set:
+        """Existing numbered variants ("base-2") of the given slugs"""
+        P = models.Property
+        found = set()
+        # Chunked: SQLite limits expression depth, and each LIKE adds an OR level
+        for start in range(0, len(bases), BULK_SLUG_PATTERN_CHUNK):
+            patterns = [
+                P.slug.like(f"{escape_like_pattern(base)}-%", escape='\\')
+                for base in bases[start:start + BULK_SLUG_PATTERN_CHUNK]
+            ]
+            found.update(slug for (slug,) in db.query(P.slug).filter(or_(*patterns)))
+        return found
+    
+    @invalidate_cache("properties:*")
+    def bulk_upsert_properties(
+        self,
+        db: Session,
+        items: List[schemas.PropertyBulkItem],
+        upsert: bool = False,
+    ) -> List[dict]:
+        """
+        Create many properties in one transaction (invalidates cache once).
+        
+        Slugs come from one lookup of existing slugs rather than a query per
+        candidate, and all rows are flushed together so the dialect can batch
+        them into multi-row INSERTs. With upsert, an item whose slug already
+        exists (in the database or earlier in the batch) updates that property.
+        Returns {"id", "slug", "created"} per item, in request order.
+        """
+        P = models.Property
+        bases = [item.slug or generate_slug(item.title) or "property" for item in items]
+        unique_bases = list(dict.fromkeys(bases))
+        
+        by_slug: Dict[str, models.Property] = {}
+        if upsert:
+            by_slug = {p.slug: p for p in db.query(P).filter(P.slug.in_(unique_bases))}
+            taken = set(by_slug)
+        else:
+            # Only bases that are already used, or repeat in the batch, need numbered variants
+            existing = {slug for (slug,) in db.query(P.slug).filter(P.slug.in_(unique_bases))}
+            repeated = {base for base, n in Counter(bases).items() if n > 1}
+            taken = existing | self._numbered_slugs(db, sorted(existing | repeated))
+        
+        entries = []  # (property, created by this entry)
+        for item, base in zip(items, bases):
+            if upsert and base in by_slug:
+                prop = by_slug[base]
+                for field, value in item.model_dump(exclude={"slug"}, exclude_unset=True).items():
+                    setattr(prop, field, value)
+                entries.append((prop, False))
+            else:
+                slug, counter = base, 1
+                while slug in taken:
+                    slug = f"{base}-{counter}"
+                    counter += 1
+                taken.add(slug)
+                prop = P(**item.model_dump(exclude={"slug"}), slug=slug)
+                db.add(prop)
+                by_slug[slug] = prop
+                entries.append((prop, True))
+        
+        db.flush()
+        results = [{"id": p.id, "slug": p.slug, "created": created} for p, created in entries]
+        db.commit()
+        
+        if search_engine.is_built:
+            for prop in by_slug.values():
+                search_engine.index_property(prop)
+        return results
+    
     @invalidate_cache("properties:*")
     def update_property(
         self,
@@ -231,6 +952,9 @@ class PropertyService:
         
         db.commit()
         db.refresh(db_property)
+        search_engine.index_property(db_property)
+        return db_property
+    
     @invalidate_cache("properties:*")
     def delete_property(self, db: Session, property_id: int) -> bool:
         """Soft delete a property (mark as unavailable, invalidates cache)"""
@@ -240,6 +964,7 @@ class PropertyService:
         
         db_property.is_available = False
         db.commit()
+        search_engine.index_property(db_property)
         return True
     
     @invalidate_cache("properties:*")
@@ -251,34 +976,37 @@ class PropertyService:
         
         db.delete(db_property)
         db.commit()
+        search_engine.remove_property(property_id)
         return True
     
+    @cached(ttl=600, key_prefix="properties:price_distribution")
+    def get_price_distribution(self, db: Session) -> List[dict]:
+        """Property counts per price range, as one indexed GROUP BY (cached)"""
+        bucket = price_bucket_expression(PRICE_DISTRIBUTION_BUCKETS).label("bucket")
+        counts = dict(
+            db.query(bucket, func.count(models.Property.id))
+            .filter(models.Property.price_numeric.isnot(None))
+            .group_by(bucket)
+            .all()
+        )
+        return [
+            {"range": label, "count": counts.get(key, 0)}
+            for key, label, _, _ in PRICE_DISTRIBUTION_BUCKETS
+        ]
+    
     @cached(ttl=600, key_prefix="properties:stats")
     def get_property_stats(self, db: Session) -> dict:
-        """Get property statistics for dashboard (cached)"""
-        total = db.query(func.count(models.Property.id)).scalar() or 0
-        available = db.query(func.count(models.Property.id)).filter(
-            models.Property.is_available == True
-        ).scalar() or 0
-        
-        # Property type distribution
-        type_dist = db.query(
-            models.Property.property_type,
-            func.count(models.Property.id).label("count")
-        ).group_by(models.Property.property_type).all()
-        
-        # Location distribution
-        location_dist = db.query(
-            models.Property.city,
-            func.count(models.Property.id).label("count")
-        ).group_by(models.Property.city).order_by(desc("count")).limit(5).all()
+        """Get property statistics for dashboard (one grouped scan, cached)"""
+        agg = stats.property_stats(db)
+        total = agg.total()
+        available = agg.get("is_available", True)
         
         return {
             "total_properties": total,
             "available_properties": available,
             "rented_properties": total - available,
-            "property_types": [{"type": t, "count": c} for t, c in type_dist],
-            "top_locations": [{"city": c, "count": cnt} for c, cnt in location_dist],
+            "property_types": [{"type": t, "count": c} for (t,), c in agg.by("property_type")],
+            "top_locations": [{"city": city, "count": c} for (city,), c in agg.by("city")[:5]],
         }
 
 
@@ -289,9 +1017,17 @@ class PropertyService:
 class LeadService:
     """Service for Lead/Inquiry CRUD operations"""
     
-    def get_lead(self, db: Session, lead_id: int) -> Optional[models.Lead]:
-        """Get a single lead by ID"""
-        return db.query(models.Lead).filter(models.Lead.id == lead_id).first()
+    def get_lead(
+        self,
+        db: Session,
+        lead_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[models.Lead]:
+        """Get a single lead by ID (only the given columns, if any)"""
+        query = db.query(models.Lead)
+        if fields:
+            query = query.options(load_fields(models.Lead, fields))
+        return query.filter(models.Lead.id == lead_id).first()
     
     def get_leads(
         self,
@@ -300,16 +1036,61 @@ class LeadService:
         limit: int = 50,
         status: Optional[str] = None,
         source: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[models.Lead]:
-        """Get leads with optional filters"""
+        """Get leads with optional filters (only the given columns, if any)"""
+        query = db.query(models.Lead)
+        if fields:
+            query = query.options(load_fields(models.Lead, [*fields, "created_at"]))
+        
+        if status:
+            query = query.filter(models.Lead.status == status)
+        if source:
+            query = query.filter(models.Lead.source == source)
+        
+        return query.order_by(
+            desc(models.Lead.created_at), desc(models.Lead.id)
+        ).offset(skip).limit(limit).all()
+    
+    def get_leads_page(
+        self,
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        status: Optional[str] = None,
+        source: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[models.Lead], Optional[str]]:
+        """
+        Get one page of leads using keyset pagination (newest first).
+        Returns the page and the cursor for the next page.
+        """
         query = db.query(models.Lead)
+        if fields:
+            query = query.options(load_fields(models.Lead, [*fields, "created_at"]))
         
         if status:
             query = query.filter(models.Lead.status == status)
         if source:
             query = query.filter(models.Lead.source == source)
         
-        return query.order_by(desc(models.Lead.created_at)).offset(skip).limit(limit).all()
+        return paginate_keyset(query, models.Lead, cursor, limit)
+    
+    def export_leads(
+        self,
+        db: Session,
+        status: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> Query:
+        """Column query for a streaming export, with the same filters as get_leads"""
+        query = export_query(db, models.Lead, schemas.Lead)
+        
+        if status:
+            query = query.filter(models.Lead.status == status)
+        if source:
+            query = query.filter(models.Lead.source == source)
+        
+        return query
     
     def get_leads_by_property(self, db: Session, property_id: int) -> List[models.Lead]:
         """Get all leads for a specific property"""
@@ -323,8 +1104,16 @@ class LeadService:
         db.add(db_lead)
         db.commit()
         db.refresh(db_lead)
+        events.lead_created(db_lead)
         return db_lead
     
+    def bulk_create_leads(self, db: Session, items: List[schemas.LeadCreate]) -> int:
+        """Create many leads in one transaction; returns the number created"""
+        db.add_all([models.Lead(**item.model_dump(), status="new") for item in items])
+        db.commit()
+        events.leads_created(items)
+        return len(items)
+    
     def update_lead(
         self,
         db: Session,
@@ -336,12 +1125,14 @@ class LeadService:
         if not db_lead:
             return None
         
+        previous_status = db_lead.status
         update_data = lead_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_lead, field, value)
         
         db.commit()
         db.refresh(db_lead)
+        events.lead_status_changed(db_lead, previous_status)
         return db_lead
     
     def update_lead_status(self, db: Session, lead_id: int, status: str) -> Optional[models.Lead]:
@@ -350,39 +1141,34 @@ class LeadService:
         if not db_lead:
             return None
         
+        previous_status = db_lead.status
         db_lead.status = status
         db.commit()
         db.refresh(db_lead)
+        events.lead_status_changed(db_lead, previous_status)
         return db_lead
     
-    def get_lead_stats(self, db: Session) -> dict:
-        """Get lead statistics for dashboard"""
-        total = db.query(func.count(models.Lead.id)).scalar() or 0
-        
-        # Status distribution
-        status_dist = db.query(
-            models.Lead.status,
-            func.count(models.Lead.id).label("count")
-        ).group_by(models.Lead.status).all()
-        
-        # Source distribution
-        source_dist = db.query(
-            models.Lead.source,
-            func.count(models.Lead.id).label("count")
-        ).group_by(models.Lead.source).all()
-        
-        # Calculate conversion rate
-        converted = db.query(func.count(models.Lead.id)).filter(
-            models.Lead.status == "converted"
-        ).scalar() or 0
+    def get_lead_stats(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> dict:
+        """
+        Get lead statistics for dashboard, optionally for leads created in a
+        date range. Read from the hourly lead rollups, not the leads table.
+        """
+        agg = lead_rollups.aggregate(db, start_date, end_date)
+        total = agg.total()
+        converted = agg.get("status", "converted")
         
         return {
             "total_leads": total,
-            "new_leads": next((c for s, c in status_dist if s == "new"), 0),
+            "new_leads": agg.get("status", "new"),
             "converted_leads": converted,
-            "conversion_rate": round((converted / total * 100) if total > 0 else 0, 2),
-            "by_status": [{"status": s, "count": c} for s, c in status_dist],
-            "by_source": [{"source": s, "count": c} for s, c in source_dist],
+            "conversion_rate": stats.rate(converted, total),
+            "by_status": [{"status": s, "count": c} for (s,), c in agg.by("status")],
+            "by_source": [{"source": s, "count": c} for (s,), c in agg.by("source")],
         }
 
 
@@ -410,7 +1196,36 @@ class BookingService:
         if status:
             query = query.filter(models.Booking.status == status)
         
-        return query.order_by(desc(models.Booking.created_at)).offset(skip).limit(limit).all()
+        return query.order_by(
+            desc(models.Booking.created_at), desc(models.Booking.id)
+        ).offset(skip).limit(limit).all()
+    
+    def get_bookings_page(
+        self,
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        status: Optional[str] = None,
+    ) -> Tuple[List[models.Booking], Optional[str]]:
+        """
+        Get one page of bookings using keyset pagination (newest first).
+        Returns the page and the cursor for the next page.
+        """
+        query = db.query(models.Booking)
+        
+        if status:
+            query = query.filter(models.Booking.status == status)
+        
+        return paginate_keyset(query, models.Booking, cursor, limit)
+    
+    def export_bookings(self, db: Session, status: Optional[str] = None) -> Query:
+        """Column query for a streaming export, with the same filters as get_bookings"""
+        query = export_query(db, models.Booking, schemas.Booking)
+        
+        if status:
+            query = query.filter(models.Booking.status == status)
+        
+        return query
     
     def get_bookings_by_property(self, db: Session, property_id: int) -> List[models.Booking]:
         """Get all bookings for a specific property"""
@@ -431,6 +1246,8 @@ class BookingService:
         db.add(db_booking)
         db.commit()
         db.refresh(db_booking)
+        if property_obj:
+            search_engine.index_property(property_obj)
         return db_booking
     
     def update_booking(
@@ -469,6 +1286,8 @@ class BookingService:
         
         db.commit()
         db.refresh(db_booking)
+        if property_obj:
+            search_engine.index_property(property_obj)
         return db_booking
 
 
@@ -0,0 +1,217 @@
+"""
+IndoHomz Dashboard Summary
+
+Materialized counts behind GET /analytics/dashboard, stored one row per
+(metric, key) in the dashboard_counters table.
+
+A before_flush hook turns every property and lead insert, update and delete
+into counter deltas and applies them in the same transaction, so all write
+paths (services, routers, bookings) keep the summary current. Bulk Core
+statements and external writers bypass the hook; reconcile() recomputes the
+table from scratch, in migrate.py and every ANALYTICS_RECONCILE_SECONDS (one
+worker at a time, see counters.lock_for_rebuild). Days are UTC days on both
+paths.
+"""
+
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, insert, or_
+from sqlalchemy.orm import Session
+
+from app.database import models
+from app.services import counters, stats
+
+
+RECENT_DAYS = 7  # "This week" window for new properties and leads
+TOP_LOCATIONS = 5
+
+META_METRIC = "_meta"  # Holds reconciled_at; a missing row means "never reconciled"
+DAILY_METRICS = ("property_created_on", "lead_created_on")
+
+_counters = models.DashboardCounter.__table__
+
+CounterKey = Tuple[str, str]
+
+
+def _key(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _day(value: Optional[datetime]) -> str:
+    # UTC day, as reconcile() computes it; rows being inserted (no created_at yet) are new today
+    return counters.hour_key(value)[:10]
+
+
+def _property_counters(get: Callable[[str], object]) -> List[CounterKey]:
+    keys = [
+        ("properties", "total"),
+        ("property_type", _key(get("property_type"))),
+        ("property_city", _key(get("city"))),
+        ("property_created_on", _day(get("created_at"))),
+    ]
+    if get("is_available"):
+        keys.append(("properties", "available"))
+    return keys
+
+
+def _lead_counters(get: Callable[[str], object]) -> List[CounterKey]:
+    return [
+        ("leads", "total"),
+        ("lead_status", _key(get("status"))),
+        ("lead_source", _key(get("source"))),
+        ("lead_created_on", _day(get("created_at"))),
+    ]
+
+
+# Model -> (counter keys for one row, attributes those keys depend on)
+_TRACKED = {
+    models.Property: (_property_counters, ("is_available", "property_type", "city")),
+    models.Lead: (_lead_counters, ("status", "source")),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _track_counter_deltas(session, flush_context, instances):
+    """Translate pending property/lead changes into counter deltas"""
+    deltas = Counter()
+
+    with session.no_autoflush:
+        for obj in session.new:
+            tracked = _TRACKED.get(type(obj))
+            if tracked:
+                for key in tracked[0](lambda attr: counters.current_value(obj, attr)):
+                    deltas[key] += 1
+
+        for obj in session.deleted:
+            tracked = _TRACKED.get(type(obj))
+            if tracked:
+                for key in tracked[0](lambda attr: counters.previous_value(obj, attr)):
+                    deltas[key] -= 1
+
+        for obj in session.dirty:
+            tracked = _TRACKED.get(type(obj))
+            if not tracked:
+                continue
+            keys_for, attrs = tracked
+            if not counters.changed(obj, attrs):
+                continue
+            for key in keys_for(lambda attr: counters.previous_value(obj, attr)):
+                deltas[key] -= 1
+            for key in keys_for(lambda attr: counters.current_value(obj, attr)):
+                deltas[key] += 1
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if deltas:
+        connection = session.connection()
+        if counters.table_present(connection, _counters):
+            counters.add_counts(connection, _counters, ["metric", "key"], deltas)
+
+
+class DashboardSummary:
+    """Reads and rebuilds the materialized dashboard counters"""
+
+    @staticmethod
+    def _window_start() -> str:
+        return (datetime.utcnow().date() - timedelta(days=RECENT_DAYS - 1)).isoformat()
+
+    def reconcile(self, db: Session) -> bool:
+        """
+        Recompute every counter from the properties and leads tables.
+        Returns False if another worker is already reconciling.
+        """
+        if not counters.lock_for_rebuild(db, _counters):
+            db.rollback()
+            return False
+        db.execute(_counters.delete())
+
+        since = self._window_start()
+        counts = Counter()
+
+        properties = stats.property_stats(db)
+        counts[("properties", "total")] = properties.total()
+        counts[("properties", "available")] = properties.get("is_available", True)
+        for (property_type,), n in properties.by("property_type"):
+            counts[("property_type", _key(property_type))] += n
+        for (city,), n in properties.by("city"):
+            counts[("property_city", _key(city))] += n
+
+        leads = stats.lead_stats(db)
+        counts[("leads", "total")] = leads.total()
+        for (status,), n in leads.by("status"):
+            counts[("lead_status", _key(status))] += n
+        for (source,), n in leads.by("source"):
+            counts[("lead_source", _key(source))] += n
+
+        for metric, model in (("property_created_on", models.Property), ("lead_created_on", models.Lead)):
+            # Same UTC day as _day(); the created_at bound (a day early, for time zones) uses the index
+            day = func.substr(counters.hour_expression(db, model.created_at), 1, 10)
+            for created_on, n in (
+                db.query(day, func.count(model.id))
+                .filter(model.created_at >= datetime.fromisoformat(since) - timedelta(days=1), day >= since)
+                .group_by(day)
+            ):
+                counts[(metric, str(created_on))] += n
+
+        rows = [
+            {"metric": metric, "key": key, "count": n}
+            for (metric, key), n in counts.items()
+            if n
+        ]
+        rows.append({"metric": META_METRIC, "key": "reconciled_at", "count": int(time.time())})
+
+        db.execute(insert(_counters), rows)
+        db.commit()
+        return True
+
+    def get_summary(self, db: Session) -> dict:
+        """
+        Dashboard totals and breakdowns in one indexed read.
+        Reconciles first if the counters have never been built.
+        """
+        since = self._window_start()
+        C = models.DashboardCounter
+        query = db.query(C.metric, C.key, C.count).filter(
+            or_(C.metric.notin_(DAILY_METRICS), C.key >= since)
+        )
+        rows = query.all()
+        if not any(metric == META_METRIC for metric, _, _ in rows):
+            self.reconcile(db)
+            rows = query.all()
+
+        values: Dict[str, Dict[str, int]] = {}
+        for metric, key, count in rows:
+            if count:
+                values.setdefault(metric, {})[key] = count
+
+        def breakdown(metric: str, label: str) -> List[dict]:
+            items = sorted(values.get(metric, {}).items(), key=lambda item: (-item[1], item[0]))
+            return [{label: key or None, "count": count} for key, count in items]
+
+        total_properties = values.get("properties", {}).get("total", 0)
+        available = values.get("properties", {}).get("available", 0)
+        total_leads = values.get("leads", {}).get("total", 0)
+        converted = values.get("lead_status", {}).get("converted", 0)
+
+        return {
+            "total_properties": total_properties,
+            "available_properties": available,
+            "rented_properties": total_properties - available,
+            "property_types": breakdown("property_type", "type"),
+            "top_locations": breakdown("property_city", "city")[:TOP_LOCATIONS],
+            "total_leads": total_leads,
+            "new_leads": values.get("lead_status", {}).get("new", 0),
+            "converted_leads": converted,
+            "conversion_rate": stats.rate(converted, total_leads),
+            "by_status": breakdown("lead_status", "status"),
+            "by_source": breakdown("lead_source", "source"),
+            "new_properties_this_week": sum(values.get("property_created_on", {}).values()),
+            "new_leads_this_week": sum(values.get("lead_created_on", {}).values()),
+        }
+
+
+# Global dashboard summary instance
+dashboard_summary = DashboardSummary()
+
@@ -0,0 +1,205 @@
+"""
+IndoHomz Live Events
+
+Lead events pushed to admin dashboards over Server-Sent Events, so they
+no longer poll /analytics/dashboard and /leads/ for changes.
+
+LeadService publishes after each commit:
+    lead.created         a new lead (id, name, source, status, property_id)
+    lead.status_changed  lead id, previous and new status
+    counters.delta       dashboard counter changes, e.g. {"lead_status:new": 1}
+
+With Redis enabled, events are published to one pub/sub channel and every
+worker relays that channel to its own subscribers, so a dashboard connected
+to any worker sees writes made on all of them. Without Redis, events reach
+the subscribers of the publishing process only.
+
+Publishing never waits on Redis: publish() (called from request handlers,
+worker threads and flush hooks) only queues the message, and a task on the
+event loop sends queued messages in order with the async client.
+
+Each subscriber has a bounded queue; a subscriber that falls behind loses
+its oldest events rather than holding memory. The outgoing queue is bounded
+the same way.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as redis_async
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+LEAD_EVENTS_CHANNEL = "indohomz:lead-events"
+SUBSCRIBER_QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+RECONNECT_SECONDS = 2
+
+
+def sse_message(message: str) -> str:
+    """A published message ({"event", "data"} JSON) as an SSE frame"""
+    payload = json.loads(message)
+    return f"event: {payload['event']}\ndata: {json.dumps(payload['data'], default=str)}\n\n"
+
+
+class EventBroker:
+    """Publishes events to local subscribers, through Redis pub/sub when enabled"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._publisher = None  # Async Redis client, used by the _send task only
+        self._outbox: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> bool:
+        """Relay the Redis channel to local subscribers; returns whether Redis is used"""
+        if not (settings.REDIS_ENABLED and REDIS_AVAILABLE):
+            return False
+        try:
+            client = redis_async.from_url(settings.REDIS_URL, decode_responses=True, socket_connect_timeout=2)
+            await client.ping()
+        except Exception as e:
+            print(f"⚠ Live events: Redis unavailable, events stay in-process: {e}")
+            return False
+        self._tasks.append(asyncio.create_task(self._relay(client)))
+        self._start_publisher(client)
+        return True
+
+    def _start_publisher(self, client):
+        self._publisher = client
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._tasks.append(asyncio.create_task(self._send()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._publisher = self._outbox = self._loop = None
+
+    async def _relay(self, client):
+        while True:
+            try:
+                pubsub = client.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._deliver(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠ Live events relay error, reconnecting: {e}")
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def _send(self):
+        while True:
+            message = await self._outbox.get()
+            try:
+                await self._publisher.publish(self.channel, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠ Live events publish failed, delivering locally: {e}")
+                self._deliver(message)
+
+    def publish(self, event: str, data: dict):
+        """Publish an event to every subscriber (callable from sync code and threads; never blocks)"""
+        loop, outbox = self._loop, self._outbox
+        if loop is None and not self._subscribers:
+            return
+        message = json.dumps({"event": event, "data": data}, default=str)
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, outbox, message)
+                return
+            except RuntimeError:  # Loop already closed (shutting down)
+                pass
+        self._deliver(message)
+
+    def _deliver(self, message: str):
+        for loop, queue in list(self._subscribers):
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, message)
+            except RuntimeError:  # Subscriber's loop already closed
+                self._subscribers.discard((loop, queue))
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, message: str):
+        if queue.full():
+            queue.get_nowait()  # Drop the oldest event for a slow subscriber
+        queue.put_nowait(message)
+
+    async def subscribe(self, heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[Optional[str]]:
+        """Published messages as they arrive; None after each idle heartbeat period"""
+        entry = (asyncio.get_running_loop(), asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+        self._subscribers.add(entry)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(entry[1].get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._subscribers.discard(entry)
+
+    async def stream(self) -> AsyncIterator[str]:
+        """SSE body: the reconnect delay, then events and keep-alive comments"""
+        yield f"retry: {RECONNECT_SECONDS * 1000}\n\n"
+        async for message in self.subscribe():
+            yield sse_message(message) if message is not None else ": keep-alive\n\n"
+
+
+# Global lead events broker
+lead_events = EventBroker(LEAD_EVENTS_CHANNEL)
+
+
+# =============================================================================
+# LEAD EVENTS
+# =============================================================================
+
+def _lead_counters(status: Optional[str], source: Optional[str]) -> Dict[str, int]:
+    return {"leads:total": 1, f"lead_status:{status or ''}": 1, f"lead_source:{source or ''}": 1}
+
+
+def lead_created(lead):
+    lead_events.publish("lead.created", {
+        "id": lead.id,
+        "name": lead.name,
+        "source": lead.source,
+        "status": lead.status,
+        "property_id": lead.property_id,
+        "created_at": lead.created_at,
+    })
+    lead_events.publish("counters.delta", _lead_counters(lead.status, lead.source))
+
+
+def leads_created(items):
+    """Counter deltas for a batch of new leads, given as LeadCreate items (no per-lead events)"""
+    deltas = Counter()
+    for item in items:
+        deltas.update(_lead_counters("new", item.source))
+    if deltas:
+        lead_events.publish("counters.delta", dict(deltas))
+
+
+def lead_status_changed(lead, previous_status: Optional[str]):
+    if previous_status == lead.status:
+        return
+    lead_events.publish("lead.status_changed", {
+        "id": lead.id,
+        "previous_status": previous_status,
+        "status": lead.status,
+    })
+    lead_events.publish("counters.delta", {
+        f"lead_status:{previous_status or ''}": -1,
+        f"lead_status:{lead.status or ''}": 1,
+    })
@@ -0,0 +1,119 @@
+"""
+IndoHomz Exports
+
+Streaming CSV / NDJSON exports of leads, properties and bookings.
+
+An export is one SELECT of plain columns (no ORM objects, no response model
+validation), executed with yield_per so the driver streams rows from a
+server-side cursor where it can (psycopg2), and encoded one batch of
+EXPORT_BATCH_SIZE rows at a time. Memory stays flat however many rows the
+export returns.
+
+Exports run on their own session: the response body is streamed after the
+endpoint returns, when the request's session (Depends(get_db)) may already
+have been closed.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import desc
+from sqlalchemy.orm import Query, Session
+
+
+EXPORT_BATCH_SIZE = 1000
+
+# format -> media type
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_query(db: Session, model, schema: Type[BaseModel]) -> Query:
+    """
+    Query for the columns of model that schema (the API response model)
+    exposes, newest first, so exports carry the same fields as the API.
+    """
+    table = model.__table__
+    names = sorted((name for name in schema.model_fields if name in table.c), key=lambda name: name != "id")
+    columns = [table.c[name] for name in names]
+    return db.query(*columns).order_by(desc(table.c.created_at), desc(table.c.id))
+
+
+# Spreadsheets evaluate cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        # Text anyone can submit (lead names, messages...): keep it text
+        return "'" + value
+    return value
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(names: List[str], batches) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # Header only: no rows matched
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(names: List[str], batches) -> Iterator[str]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(names, map(_json_value, row))), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+def stream_export(query: Query, export_format: str) -> Iterator[str]:
+    """
+    Encoded chunks of query's rows, one per EXPORT_BATCH_SIZE rows, read on
+    a session of their own (on the same database as query's session)
+    """
+    statement = query.statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    return _stream_rows(query.session.get_bind(), statement, export_format)
+
+
+def _stream_rows(bind, statement, export_format: str) -> Iterator[str]:
+    db = Session(bind=bind)
+    try:
+        result = db.execute(statement)
+        try:
+            names = list(result.keys())
+            batches = result.partitions()
+            if export_format == "csv":
+                yield from _csv_chunks(names, batches)
+            else:
+                yield from _ndjson_chunks(names, batches)
+        finally:
+            result.close()
+    finally:
+        db.close()
+
+
+def export_filename(name: str, export_format: str) -> str:
+    return f"{name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{export_format}"
@@ -0,0 +1,229 @@
+"""
+IndoHomz Imports
+
+Server-side CSV imports of properties and leads.
+
+The upload is read row by row (csv.DictReader over the spooled upload file,
+so the file is never held in memory), validated against the create schemas
+IMPORT_CHUNK_SIZE rows at a time, and each chunk's valid rows are written in
+one transaction through the same bulk paths as the API (slugs, derived
+columns, counters and cache invalidation included). Invalid rows are skipped
+and reported with their row number and field errors.
+
+Property files may use either layout in the repo: properties_template.csv
+(comma-separated image file names, no image_url) or properties_9.csv (a JSON
+array of images and an explicit image_url).
+"""
+
+import codecs
+import csv
+import json
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.security import normalize_phone_number, sanitize_html, validate_phone_number
+from app.database import models
+from app.schemas import schemas
+from app.services.crud import property_service, lead_service
+
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+PROPERTY_REQUIRED_COLUMNS = {"title", "price"}
+LEAD_REQUIRED_COLUMNS = {"name", "phone"}
+
+Row = Tuple[int, dict]
+
+
+class InvalidField(ValueError):
+    """A row check beyond schema validation failed"""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+
+
+class ImportReport:
+    """Running totals and per-row errors of one import"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def fail(self, row: int, errors: List[dict]):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def read_csv_rows(file: BinaryIO, required: set) -> Iterator[Row]:
+    """
+    (row number, cleaned row) pairs from an uploaded CSV, read lazily.
+    Raises ValueError when the header lacks a required column.
+    """
+    text = codecs.getreader("utf-8-sig")(file)  # Excel adds a BOM
+    reader = csv.DictReader(text)
+    number = 0
+    try:
+        columns = {name.strip() for name in reader.fieldnames or [] if name}
+        missing = required - columns
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+
+        for number, row in enumerate(reader, 1):
+            # Empty cells fall back to schema defaults; surplus cells (None key) are dropped
+            yield number, {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+    except UnicodeDecodeError:
+        raise ValueError(f"CSV is not UTF-8 encoded (after row {number})")
+    except csv.Error as e:
+        raise ValueError(f"Malformed CSV after row {number}: {e}")
+
+
+def _field_errors(error: ValidationError) -> List[dict]:
+    return [
+        {"field": ".".join(str(part) for part in e["loc"]) or "row", "message": e["msg"]}
+        for e in error.errors()
+    ]
+
+
+def _chunks(rows: Iterator[Row]) -> Iterator[List[Row]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == IMPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _run_import(
+    db: Session,
+    rows: Iterator[Row],
+    validate: Callable[[dict], object],
+    write: Callable[[Session, list], Tuple[int, int]],
+    check: Optional[Callable[[Session, list, ImportReport], list]] = None,
+) -> dict:
+    """
+    Validate and write rows chunk by chunk. check(db, valid, report) may
+    reject rows that need a database lookup (once per chunk); write(db, items)
+    returns (created, updated). A failed write fails only its own chunk.
+    """
+    report = ImportReport()
+    for chunk in _chunks(rows):
+        report.rows += len(chunk)
+        valid = []
+        for number, row in chunk:
+            try:
+                valid.append((number, validate(row)))
+            except ValidationError as e:
+                report.fail(number, _field_errors(e))
+            except InvalidField as e:
+                report.fail(number, [{"field": e.field, "message": str(e)}])
+        if check and valid:
+            valid = check(db, valid, report)
+        if not valid:
+            continue
+        try:
+            created, updated = write(db, [item for _, item in valid])
+            report.created += created
+            report.updated += updated
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = f"Database error: {e.__class__.__name__}"
+            for number, _ in valid:
+                report.fail(number, [{"field": "row", "message": message}])
+    return report.as_dict()
+
+
+# =============================================================================
+# PROPERTIES
+# =============================================================================
+
+def _property_fields(row: dict) -> dict:
+    """Map either repo CSV layout onto PropertyBulkItem fields"""
+    images = row.get("images")
+    if images and not images.startswith("["):
+        # Template layout: "a.jpg,b.jpg" -> JSON array, first image as the cover
+        names = [name.strip() for name in images.split(",") if name.strip()]
+        row["images"] = json.dumps(names)
+        if names and not row.get("image_url"):
+            row["image_url"] = names[0]
+    return row
+
+
+def import_properties(db: Session, file: BinaryIO, upsert: bool = False) -> dict:
+    """Import properties from a CSV upload; returns an ImportResponse dict"""
+    def validate(row: dict) -> schemas.PropertyBulkItem:
+        return schemas.PropertyBulkItem(**_property_fields(row))
+
+    def write(db: Session, items: List[schemas.PropertyBulkItem]) -> Tuple[int, int]:
+        results = property_service.bulk_upsert_properties(db, items, upsert=upsert)
+        created = sum(1 for r in results if r["created"])
+        return created, len(results) - created
+
+    return _run_import(db, read_csv_rows(file, PROPERTY_REQUIRED_COLUMNS), validate, write)
+
+
+# =============================================================================
+# LEADS
+# =============================================================================
+
+def _lead(row: dict) -> schemas.LeadCreate:
+    """Validate a lead row with the same checks as POST /leads/"""
+    lead = schemas.LeadCreate(**row)
+    if not validate_phone_number(lead.phone):
+        raise InvalidField("phone", "Invalid phone number format")
+    lead.phone = normalize_phone_number(lead.phone)
+    lead.name = sanitize_html(lead.name)
+    if lead.message:
+        lead.message = sanitize_html(lead.message)
+    return lead
+
+
+def _check_lead_properties(db: Session, valid: List[Tuple[int, schemas.LeadCreate]], report: ImportReport):
+    """Reject leads for unknown properties, with one lookup per chunk"""
+    property_ids = {lead.property_id for _, lead in valid if lead.property_id is not None}
+    if not property_ids:
+        return valid
+    known = {
+        pid for (pid,) in db.query(models.Property.id).filter(models.Property.id.in_(property_ids))
+    }
+    kept = []
+    for number, lead in valid:
+        if lead.property_id is not None and lead.property_id not in known:
+            report.fail(number, [{"field": "property_id", "message": "Property not found"}])
+        else:
+            kept.append((number, lead))
+    return kept
+
+
+def import_leads(db: Session, file: BinaryIO) -> dict:
+    """Import leads from a CSV upload; returns an ImportResponse dict"""
+    def write(db: Session, leads: List[schemas.LeadCreate]) -> Tuple[int, int]:
+        return lead_service.bulk_create_leads(db, leads), 0
+
+    return _run_import(
+        db, read_csv_rows(file, LEAD_REQUIRED_COLUMNS), _lead, write, check=_check_lead_properties,
+    )
@@ -0,0 +1,214 @@
+"""
+IndoHomz Lead Rollups
+
+Hourly lead counts keyed by status, source and property, for lead analytics
+whose cost does not grow with the number of leads.
+
+A before_flush hook applies +1/-1 deltas to the lead_rollups row of each
+lead created, deleted, or re-assigned (status, source or property change),
+in the same transaction as the write. Counts for any date range are then
+summed from at most one row per hour and key, and bucketed by hour, day,
+ISO week or month.
+
+A full rebuild backfills history from the leads table once, in migrate.py
+(or on the first read if that never ran), and records it with a marker row
+(hour "_meta"); rows the hook writes before then do not count as a backfill.
+reconcile_recent() rebuilds the last RECONCILE_HOURS, for writes that
+bypassed the ORM.
+"""
+
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
+from app.database import models
+from app.services import counters
+from app.services.stats import Aggregate
+
+
+BUCKETS = ("hour", "day", "week", "month")
+GROUP_BY = ("status", "source", "property_id")
+RECONCILE_HOURS = 48
+
+META_HOUR = "_meta"  # Marker row: count is the last full rebuild's time; missing means "never backfilled"
+
+# Bucket -> length of the "YYYY-MM-DDTHH" hour key prefix it groups on
+_BUCKET_PREFIX = {"hour": 13, "day": 10, "week": 10, "month": 7}
+
+_rollups = models.LeadRollup.__table__
+_KEY_COLUMNS = ["hour", "status", "source", "property_id"]
+
+
+def _rollup_key(get: Callable[[str], object]) -> tuple:
+    return (
+        counters.hour_key(get("created_at")),
+        get("status") or "",
+        get("source") or "",
+        get("property_id") or 0,
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _track_lead_rollups(session, flush_context, instances):
+    """Translate pending lead changes into rollup deltas"""
+    deltas = Counter()
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, models.Lead):
+                deltas[_rollup_key(lambda attr: counters.current_value(obj, attr))] += 1
+
+        for obj in session.deleted:
+            if isinstance(obj, models.Lead):
+                deltas[_rollup_key(lambda attr: counters.previous_value(obj, attr))] -= 1
+
+        for obj in session.dirty:
+            if isinstance(obj, models.Lead) and counters.changed(obj, GROUP_BY):
+                deltas[_rollup_key(lambda attr: counters.previous_value(obj, attr))] -= 1
+                deltas[_rollup_key(lambda attr: counters.current_value(obj, attr))] += 1
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if deltas:
+        connection = session.connection()
+        if counters.table_present(connection, _rollups):
+            counters.add_counts(connection, _rollups, _KEY_COLUMNS, deltas)
+
+
+class LeadRollups:
+    """Reads and rebuilds the hourly lead rollups"""
+
+    def __init__(self):
+        self._built = set()  # Engines whose rollups are known to be backfilled
+
+    def rebuild(self, db: Session, since: Optional[datetime] = None) -> bool:
+        """
+        Recompute rollups from the leads table (all hours, or from since
+        onwards). Returns False if another worker is already rebuilding them.
+        """
+        if not counters.lock_for_rebuild(db, _rollups):
+            db.rollback()
+            return False
+        L = models.Lead
+        R = models.LeadRollup
+        hour = counters.hour_expression(db, L.created_at)
+
+        query = db.query(
+            hour, func.coalesce(L.status, ""), func.coalesce(L.source, ""),
+            func.coalesce(L.property_id, 0), func.count(L.id),
+        )
+        delete = db.query(R)
+        if since is not None:
+            start = counters.hour_key(since)
+            # The created_at bound (a day early, for time zones) uses the index; the hour bound is exact
+            query = query.filter(L.created_at >= since - timedelta(days=1), hour >= start)
+            delete = delete.filter(R.hour >= start, R.hour != META_HOUR)
+
+        delete.delete(synchronize_session=False)
+        rows = [
+            dict(zip(_KEY_COLUMNS + ["count"], row))
+            for row in query.group_by(hour, L.status, L.source, L.property_id)
+        ]
+        if since is None:
+            rows.append({"hour": META_HOUR, "status": "", "source": "", "property_id": 0, "count": int(time.time())})
+        if rows:
+            db.execute(insert(_rollups), rows)
+        db.commit()
+        if since is None:
+            self._built.add(db.get_bind())
+        return True
+
+    def reconcile_recent(self, db: Session):
+        """Rebuild the last RECONCILE_HOURS of rollups"""
+        self.rebuild(db, since=datetime.utcnow() - timedelta(hours=RECONCILE_HOURS))
+
+    def ensure_built(self, db: Session) -> bool:
+        """Backfill all history unless the marker row says it was done; returns whether it ran"""
+        bind = db.get_bind()
+        if bind in self._built:
+            return False
+        R = models.LeadRollup
+        if db.query(R.hour).filter(R.hour == META_HOUR).first() is not None:
+            self._built.add(bind)
+            return False
+        return self.rebuild(db)
+
+    def _query(
+        self,
+        db: Session,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        bucket: Optional[str],
+        group_by: Sequence[str],
+        filters: Dict[str, object],
+    ) -> List[tuple]:
+        """(bucket?, *group_by values, count) rows with NULLs restored"""
+        self.ensure_built(db)
+        R = models.LeadRollup
+
+        columns = [getattr(R, name) for name in group_by]
+        if bucket:
+            columns.insert(0, func.substr(R.hour, 1, _BUCKET_PREFIX[bucket]))
+        query = db.query(*columns, func.sum(R.count)).filter(R.hour != META_HOUR)
+
+        if start is not None:
+            query = query.filter(R.hour >= counters.hour_key(start))
+        if end is not None:
+            query = query.filter(R.hour <= counters.hour_key(end))
+        for name, value in filters.items():
+            if value is not None:
+                query = query.filter(getattr(R, name) == value)
+        if columns:
+            query = query.group_by(*columns)
+
+        totals = Counter()
+        for row in query.all():
+            key = list(row[:-1])
+            if bucket == "week":
+                day = date.fromisoformat(key[0])
+                key[0] = (day - timedelta(days=day.weekday())).isoformat()  # ISO week's Monday
+            for i in range(len(key) - len(group_by), len(key)):
+                if key[i] in ("", 0):
+                    key[i] = None
+            totals[tuple(key)] += row[-1] or 0
+        return [(*key, count) for key, count in totals.items() if count]
+
+    def counts(
+        self,
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: Optional[str] = None,
+        group_by: Sequence[str] = (),
+        status: Optional[str] = None,
+        source: Optional[str] = None,
+        property_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Lead counts for leads created between start and end (inclusive, to
+        the hour), optionally per time bucket and per status/source/property.
+        """
+        names = (["bucket"] if bucket else []) + list(group_by)
+        rows = self._query(db, start, end, bucket, group_by, {
+            "status": status, "source": source, "property_id": property_id,
+        })
+        result = [dict(zip(names + ["count"], row)) for row in rows]
+        return sorted(result, key=lambda r: (r.get("bucket") or "", -r["count"]))
+
+    def aggregate(
+        self,
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        group_by: Sequence[str] = ("status", "source"),
+    ) -> Aggregate:
+        """Rollup counts as a stats.Aggregate, for the shared stats helpers"""
+        rows = self._query(db, start, end, None, group_by, {})
+        return Aggregate(list(group_by), ["count"], rows)
+
+
+# Global lead rollups instance
+lead_rollups = LeadRollups()
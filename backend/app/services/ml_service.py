@@ -1,10 +1,5 @@
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-import joblib
+from __future__ import annotations  # pd.DataFrame annotations stay unevaluated
+
 import os
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -13,11 +8,21 @@ from typing import Dict, Any, List
 from app.database import models
 from app.schemas.schemas import PredictionResponse
 from app.core.config import settings
+from app.utils.lazy import lazy_import
+
+# pandas / numpy / scikit-learn load on first use, not when the app starts
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+joblib = lazy_import("joblib")
+ensemble = lazy_import("sklearn.ensemble")
+sk_metrics = lazy_import("sklearn.metrics")
+model_selection = lazy_import("sklearn.model_selection")
+preprocessing = lazy_import("sklearn.preprocessing")
 
 class MLService:
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None  # Set by load_model() or train_model()
         self.label_encoders = {}
         self.model_version = "1.0.0"
         self.last_trained = None
@@ -140,7 +145,7 @@ class MLService:
             if col in df.columns:
                 if fit:
                     if col not in self.label_encoders:
-                        self.label_encoders[col] = LabelEncoder()
+                        self.label_encoders[col] = preprocessing.LabelEncoder()
                     df[f'{col}_encoded'] = self.label_encoders[col].fit_transform(df[col].astype(str))
                 else:
                     if col in self.label_encoders:
@@ -178,15 +183,16 @@ class MLService:
         y = df['quantity']
         
         # Scale features
+        self.scaler = preprocessing.StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(
             X_scaled, y, test_size=0.2, random_state=42
         )
         
         # Train model
-        self.model = RandomForestRegressor(
+        self.model = ensemble.RandomForestRegressor(
             n_estimators=100,
             max_depth=10,
             random_state=42,
@@ -204,9 +210,9 @@ class MLService:
         # Return training metrics
         y_pred = self.model.predict(X_test)
         return {
-            "mae": mean_absolute_error(y_test, y_pred),
-            "mse": mean_squared_error(y_test, y_pred),
-            "r2": r2_score(y_test, y_pred),
+            "mae": sk_metrics.mean_absolute_error(y_test, y_pred),
+            "mse": sk_metrics.mean_squared_error(y_test, y_pred),
+            "r2": sk_metrics.r2_score(y_test, y_pred),
             "training_samples": len(X_train),
             "test_samples": len(X_test)
         }
@@ -338,9 +344,9 @@ class MLService:
         y_pred = self.model.predict(X_test_scaled)
         
         return {
-            "mae": float(mean_absolute_error(y_test, y_pred)),
-            "mse": float(mean_squared_error(y_test, y_pred)),
-            "r2": float(r2_score(y_test, y_pred)),
+            "mae": float(sk_metrics.mean_absolute_error(y_test, y_pred)),
+            "mse": float(sk_metrics.mean_squared_error(y_test, y_pred)),
+            "r2": float(sk_metrics.r2_score(y_test, y_pred)),
             "samples": len(y_test)
         }
     
@@ -0,0 +1,260 @@
+"""
+IndoHomz In-Process Search Engine
+
+Tokenized inverted index over property text with BM25 ranking.
+
+Used by PropertyService.search_properties when SEARCH_ENGINE=memory, for
+deployments without a database full-text index. The index is built lazily
+from the database on the first search, updated incrementally by the property
+write paths in this process, and rebuilt every SEARCH_INDEX_REFRESH_SECONDS
+to pick up writes made by other workers.
+"""
+
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import models
+from app.core.config import settings
+
+
+# Field boosts: a title hit counts as much as three amenity hits
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "location": 2.0,
+    "area": 2.0,
+    "amenities": 1.0,
+    "highlights": 1.0,
+    "description": 0.5,
+}
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class _Doc:
+    """Indexed state for one property: weighted term frequencies plus filter attributes"""
+    __slots__ = ("id", "tf", "length", "city", "property_type", "bedrooms", "is_available", "price_numeric")
+
+    def __init__(self, prop):
+        self.id = prop.id
+        self.tf: Dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(prop, field, None)):
+                self.tf[token] += weight
+        self.length = sum(self.tf.values())
+        self.city = (prop.city or "").strip().lower()
+        self.property_type = prop.property_type
+        self.bedrooms = prop.bedrooms
+        self.is_available = prop.is_available
+        self.price_numeric = prop.price_numeric
+
+
+class PropertySearchEngine:
+    """Inverted index of property text, ranked with BM25"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs: Dict[int, _Doc] = {}
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._vocabulary: List[str] = []  # Sorted, for prefix lookups
+        self._cities: Dict[str, int] = defaultdict(int)  # Lowercase city -> document count
+        self._total_length = 0.0
+        self._built_at: Optional[datetime] = None
+
+    # -------------------------------------------------------------------------
+    # Index maintenance
+    # -------------------------------------------------------------------------
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def rebuild(self, db: Session):
+        """Rebuild the whole index from the database"""
+        rows = db.query(
+            models.Property.id,
+            models.Property.title,
+            models.Property.location,
+            models.Property.area,
+            models.Property.amenities,
+            models.Property.highlights,
+            models.Property.description,
+            models.Property.city,
+            models.Property.property_type,
+            models.Property.bedrooms,
+            models.Property.is_available,
+            models.Property.price_numeric,
+        ).all()
+
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._cities.clear()
+            self._total_length = 0.0
+            for row in rows:
+                self._add(_Doc(row))
+            self._vocabulary = sorted(self._postings)
+            self._built_at = datetime.now()
+
+    def ensure_fresh(self, db: Session):
+        """Build the index if missing, or rebuild it if older than the refresh interval"""
+        max_age = timedelta(seconds=settings.SEARCH_INDEX_REFRESH_SECONDS)
+        if self._built_at is None or datetime.now() - self._built_at > max_age:
+            self.rebuild(db)
+
+    def index_property(self, prop):
+        """Add or replace one property (no-op until the index is first built)"""
+        if not self.is_built:
+            return
+        with self._lock:
+            self._remove(prop.id)
+            new_terms = self._add(_Doc(prop))
+            for term in new_terms:
+                bisect.insort(self._vocabulary, term)
+
+    def remove_property(self, property_id: int):
+        """Drop one property from the index"""
+        if not self.is_built:
+            return
+        with self._lock:
+            for term in self._remove(property_id):
+                index = bisect.bisect_left(self._vocabulary, term)
+                if index < len(self._vocabulary) and self._vocabulary[index] == term:
+                    del self._vocabulary[index]
+
+    def _add(self, doc: _Doc) -> List[str]:
+        """Insert a document; returns terms that are new to the vocabulary"""
+        new_terms = []
+        self._docs[doc.id] = doc
+        self._total_length += doc.length
+        self._cities[doc.city] += 1
+        for term, tf in doc.tf.items():
+            postings = self._postings[term]
+            if not postings:
+                new_terms.append(term)
+            postings[doc.id] = tf
+        return new_terms
+
+    def _remove(self, property_id: int) -> List[str]:
+        """Delete a document; returns terms that left the vocabulary"""
+        doc = self._docs.pop(property_id, None)
+        if doc is None:
+            return []
+        dropped = []
+        self._total_length -= doc.length
+        self._cities[doc.city] -= 1
+        if not self._cities[doc.city]:
+            del self._cities[doc.city]
+        for term in doc.tf:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(property_id, None)
+            if not postings:
+                del self._postings[term]
+                dropped.append(term)
+        return dropped
+
+    # -------------------------------------------------------------------------
+    # Querying
+    # -------------------------------------------------------------------------
+
+    def _expand(self, token: str) -> List[str]:
+        """All vocabulary terms starting with token (prefix match, like the FTS path)"""
+        index = bisect.bisect_left(self._vocabulary, token)
+        terms = []
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(token):
+            terms.append(self._vocabulary[index])
+            index += 1
+        return terms
+
+    def _matches_filters(self, doc: _Doc, filters: dict) -> bool:
+        city = (filters.get("city") or "").strip().lower()
+        if city:
+            # Same rule as crud.city_filter: exact for known cities, substring otherwise
+            if city in self._cities:
+                if doc.city != city:
+                    return False
+            elif city not in doc.city:
+                return False
+        if filters.get("property_type") and doc.property_type != filters["property_type"]:
+            return False
+        if filters.get("bedrooms") and doc.bedrooms != filters["bedrooms"]:
+            return False
+        if filters.get("is_available") is not None and doc.is_available != filters["is_available"]:
+            return False
+        if filters.get("min_price") is not None and (doc.price_numeric is None or doc.price_numeric < filters["min_price"]):
+            return False
+        if filters.get("max_price") is not None and (doc.price_numeric is None or doc.price_numeric > filters["max_price"]):
+            return False
+        return True
+
+    def search(self, query_text: str, filters: Optional[dict] = None) -> Optional[List[int]]:
+        """
+        Rank properties matching every query token (as a prefix) by BM25.
+
+        Returns property IDs, most relevant first, or None if the query has
+        no searchable tokens.
+        """
+        tokens = tokenize(query_text)
+        if not tokens:
+            return None
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if n_docs == 0:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+
+            scores: Optional[Dict[int, float]] = None
+            for token in dict.fromkeys(tokens):
+                # A document matching several expansions of a token scores its best one
+                token_scores: Dict[int, float] = {}
+                for term in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, tf in postings.items():
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._docs[doc_id].length / avg_length)
+                        score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        if score > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = score
+
+                # Every token must match
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {
+                        doc_id: score + token_scores[doc_id]
+                        for doc_id, score in scores.items()
+                        if doc_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+            if filters:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if self._matches_filters(self._docs[doc_id], filters)
+                }
+
+            # Best score first; newer (higher ID) properties break ties
+            return sorted(scores, key=lambda doc_id: (-scores[doc_id], -doc_id))
+
+
+# Global search engine instance
+search_engine = PropertySearchEngine()
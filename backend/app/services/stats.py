@@ -0,0 +1,94 @@
+"""
+IndoHomz Stats Engine
+
+Shared aggregation for dashboard, analytics and report statistics.
+
+Each family of stats is one grouped scan: the table is grouped by every
+dimension the caller needs (e.g. lead status and source), and extra measures
+such as "created in this period" are conditional aggregates on the same scan.
+Totals and per-dimension breakdowns are then rolled up in Python from the
+(small) grouped result instead of issuing a query per figure.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.database import models
+
+
+class Aggregate:
+    """Grouped counts from one scan, with helpers to roll them up"""
+
+    def __init__(self, dimensions: List[str], measures: List[str], rows: List[tuple]):
+        self.dimensions = dimensions
+        self.measures = measures
+        self.rows = rows
+
+    def _measure_index(self, measure: str) -> int:
+        return len(self.dimensions) + self.measures.index(measure)
+
+    def total(self, measure: str = "count") -> int:
+        index = self._measure_index(measure)
+        return sum(row[index] or 0 for row in self.rows)
+
+    def by(self, *dimensions: str, measure: str = "count") -> List[Tuple[tuple, int]]:
+        """(dimension values, count) pairs, largest first"""
+        keys = [self.dimensions.index(d) for d in dimensions]
+        index = self._measure_index(measure)
+        counts = Counter()
+        for row in self.rows:
+            counts[tuple(row[k] for k in keys)] += row[index] or 0
+        return sorted(counts.items(), key=lambda item: -item[1])
+
+    def get(self, dimension: str, value, measure: str = "count") -> int:
+        return next((c for (v,), c in self.by(dimension, measure=measure) if v == value), 0)
+
+
+def aggregate(
+    db: Session,
+    dimensions: Dict[str, object],
+    measures: Optional[Dict[str, object]] = None,
+    filters: Optional[list] = None,
+) -> Aggregate:
+    """
+    Group by the given columns and count rows, in one query.
+
+    measures maps a name to a boolean SQL condition; each becomes
+    SUM(CASE WHEN condition THEN 1 ELSE 0 END) alongside COUNT(*).
+    """
+    measures = measures or {}
+    columns = [column.label(name) for name, column in dimensions.items()]
+    query = db.query(
+        *columns,
+        func.count().label("count"),
+        *[func.sum(case((condition, 1), else_=0)).label(name) for name, condition in measures.items()],
+    )
+    if filters:
+        query = query.filter(*filters)
+    rows = query.group_by(*dimensions.values()).all()
+    return Aggregate(list(dimensions), ["count", *measures], [tuple(row) for row in rows])
+
+
+def property_stats(db: Session) -> Aggregate:
+    """Property counts by type, city and availability"""
+    return aggregate(db, {
+        "property_type": models.Property.property_type,
+        "city": models.Property.city,
+        "is_available": models.Property.is_available,
+    })
+
+
+def lead_stats(db: Session) -> Aggregate:
+    """Lead counts by status and source (date ranges are served by lead_rollups)"""
+    return aggregate(db, {
+        "status": models.Lead.status,
+        "source": models.Lead.source,
+    })
+
+
+def rate(part: int, whole: int) -> float:
+    """Percentage rounded to two places (0 when whole is 0)"""
+    return round(part / whole * 100, 2) if whole > 0 else 0
@@ -0,0 +1,130 @@
+"""
+IndoHomz Geospatial Utilities
+
+Geohash encoding, cell coverings and great-circle distance for map search.
+
+Properties store a geohash of their coordinates in an indexed column. A region
+(radius or bounding box) is covered by a handful of geohash cells, and each
+cell becomes a range scan on that index: every geohash inside a cell starts
+with the cell's prefix, so `prefix <= geohash < prefix + "{"` finds them.
+Results are then trimmed to the exact region in Python.
+
+The range scan assumes the geohash column compares byte by byte: SQLite's
+default BINARY collation does, and on Postgres the column is declared
+COLLATE "C" (see models.Property.geohash). Under a locale collation such as
+en_US.UTF-8 the range would miss or wrongly include rows.
+
+Note: regions crossing the antimeridian (±180° longitude) are not supported.
+"""
+
+from math import asin, ceil, cos, floor, radians, sin, sqrt
+from typing import List, Optional, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# "{" sorts right after "z", the last geohash character (in byte order)
+PREFIX_RANGE_END = "{"
+
+GEOHASH_PRECISION = 9  # ~4.8m x 4.8m cells
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode coordinates as a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Geohash bits alternate longitude, latitude, starting with longitude
+
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height in degrees latitude, width in degrees longitude) of a geohash cell"""
+    total_bits = 5 * precision
+    lng_bits = ceil(total_bits / 2)
+    lat_bits = floor(total_bits / 2)
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def covering_cells(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    max_cells: int = 16,
+) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover the bounding box.
+
+    Uses the finest precision that needs at most max_cells cells, so the
+    index scans stay tight without issuing too many ranges.
+    """
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    min_lng, max_lng = max(min_lng, -180.0), min(max_lng, 180.0)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = floor(max_lat / height) - floor(min_lat / height) + 1
+        cols = floor(max_lng / width) - floor(min_lng / width) + 1
+        if rows * cols > max_cells:
+            continue
+
+        cells = set()
+        for row in range(rows):
+            lat = min(min_lat + row * height, max_lat)
+            for col in range(cols):
+                lng = min(min_lng + col * width, max_lng)
+                cells.add(encode_geohash(lat, lng, precision))
+        # Corners can fall in a cell the stepping skipped
+        cells.add(encode_geohash(max_lat, max_lng, precision))
+        return sorted(cells)
+
+    # Region larger than a top-level cell: no prefix narrows it
+    return [""]
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) of a box enclosing a circle"""
+    lat_delta = radius_km / 111.32
+    cos_lat = max(cos(radians(latitude)), 1e-6)
+    lng_delta = radius_km / (111.32 * cos_lat)
+    return (
+        latitude - lat_delta,
+        longitude - lng_delta,
+        latitude + lat_delta,
+        longitude + lng_delta,
+    )
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    d_lat = radians(lat2 - lat1)
+    d_lng = radians(lng2 - lng1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def geohash_for(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    """Geohash for optional coordinates (None if either is missing)"""
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(latitude, longitude)
@@ -0,0 +1,26 @@
+"""
+IndoHomz Lazy Imports
+
+lazy_import("pandas") returns a stand-in module that imports the real one on
+first attribute access, so heavy optional libraries (pandas, scikit-learn,
+...) cost nothing at startup in processes that never use them. A library
+that is not installed raises ImportError on first use, not at import time.
+"""
+
+import importlib
+from types import ModuleType
+
+
+class _LazyModule(ModuleType):
+    def __getattr__(self, attr):
+        try:
+            module = importlib.import_module(self.__name__)
+        except ImportError as e:
+            raise ImportError(f"{self.__name__} is not installed (needed for {attr})") from e
+        self.__dict__.update(module.__dict__)  # Later lookups skip __getattr__
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """The named module (or submodule, e.g. "sklearn.metrics"), imported on first use"""
+    return _LazyModule(name)
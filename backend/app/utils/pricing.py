@@ -0,0 +1,57 @@
+"""
+IndoHomz Price Parsing
+
+Converts display prices ("₹26,000/month (meals included)", "1.5L", "45K")
+into numbers for the indexed price_numeric column.
+"""
+
+import re
+from typing import Optional
+
+# Indian numbering suffixes
+_MULTIPLIERS = {
+    "k": 1_000,
+    "thousand": 1_000,
+    "l": 100_000,
+    "lac": 100_000,
+    "lacs": 100_000,
+    "lakh": 100_000,
+    "lakhs": 100_000,
+    "cr": 10_000_000,
+    "crore": 10_000_000,
+    "crores": 10_000_000,
+}
+
+# First number in the string, with optional thousands separators (Western or
+# Indian grouping) and decimals, followed by an optional unit suffix
+_PRICE_RE = re.compile(
+    r"(?P<number>\d+(?:,\d+)*(?:\.\d+)?)\s*(?P<unit>[a-z]+)?",
+    re.IGNORECASE,
+)
+
+
+def parse_price(price: Optional[str]) -> Optional[float]:
+    """
+    Parse a display price into a number of rupees.
+
+    Uses the first number in the string and an optional unit right after it
+    (K, L/Lac/Lakh, Cr/Crore). Anything after that ("/month", "(meals
+    included)") is ignored. Returns None when no number is found.
+
+    >>> parse_price("₹26,000/month (meals included)")
+    26000.0
+    >>> parse_price("1.5L")
+    150000.0
+    >>> parse_price("45K")
+    45000.0
+    """
+    if not price:
+        return None
+
+    match = _PRICE_RE.search(price)
+    if not match:
+        return None
+
+    value = float(match.group("number").replace(",", ""))
+    unit = (match.group("unit") or "").lower()
+    return value * _MULTIPLIERS.get(unit, 1)
@@ -0,0 +1,81 @@
+"""
+Backfill price_numeric for existing properties
+Parses the display price of every property and stores the number used by
+price filters and the price distribution.
+
+Usage:
+    python backfill_price_numeric.py            # Update all properties
+    python backfill_price_numeric.py --dry-run  # Report changes without saving
+"""
+
+import argparse
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.database.connection import engine
+from app.database import models
+from app.utils.pricing import parse_price
+
+BATCH_SIZE = 500
+
+properties = models.Property.__table__
+
+
+def backfill(dry_run: bool = False):
+    """Recompute price_numeric in batches of BATCH_SIZE rows"""
+    print(f"\n{'='*60}")
+    print(f"💰 Backfilling price_numeric{' (dry run)' if dry_run else ''}")
+    print(f"{'='*60}\n")
+
+    changed = 0
+    unparsed = []
+    last_id = 0
+
+    with Session(engine) as db:
+        while True:
+            rows = (
+                db.query(models.Property.id, models.Property.price, models.Property.price_numeric)
+                .filter(models.Property.id > last_id)
+                .order_by(models.Property.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            for row in rows:
+                value = parse_price(row.price)
+                if value is None:
+                    unparsed.append((row.id, row.price))
+                if value != row.price_numeric:
+                    updates.append({"row_id": row.id, "value": value})
+
+            changed += len(updates)
+            if updates and not dry_run:
+                # Core executemany UPDATE: one statement per batch, no ORM loading
+                db.execute(
+                    update(properties)
+                    .where(properties.c.id == bindparam("row_id"))
+                    .values(price_numeric=bindparam("value")),
+                    updates,
+                )
+                db.commit()
+
+    print(f"✅ {changed} properties {'would be ' if dry_run else ''}updated")
+    if unparsed:
+        print(f"⚠ {len(unparsed)} prices could not be parsed:")
+        for property_id, price in unparsed[:20]:
+            print(f"   - #{property_id}: {price!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill price_numeric from price")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without saving")
+    args = parser.parse_args()
+    backfill(dry_run=args.dry_run)
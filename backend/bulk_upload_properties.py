@@ -4,7 +4,20 @@ BULK PROPERTY UPLOAD SCRIPT
 How to use:
 1. Create a CSV file with property details (template below)
 2. Put all property images in backend/uploads/properties/ folder
-3. Run: python bulk_upload_properties.py properties.csv
+3. Run: python bulk_upload_properties.py properties.csv --token <access token>
+
+For large files, add --concurrent: rows are sent in batches to
+POST /properties/bulk (or one by one to POST /properties/ on servers without
+it) over a pooled connection, several requests at a time, retrying network
+errors, 429 and 5xx responses with backoff. Finished rows are recorded in a
+checkpoint file (<csv>.checkpoint.json), so re-running the same command after
+an interruption only uploads what is left.
+
+    python bulk_upload_properties.py properties.csv --concurrent --upsert
+
+--upsert updates properties whose slug (from an optional "slug" column, or
+generated from the title) already exists, which also makes a retried batch
+that did reach the server harmless.
 
 CSV Template (properties.csv):
 title,location,area,city,price,bedrooms,bathrooms,area_sqft,property_type,furnishing,amenities,description,images
@@ -12,16 +25,32 @@ title,location,area,city,price,bedrooms,bathrooms,area_sqft,property_type,furnis
 
 """
 
+import argparse
+import asyncio
 import csv
 import json
-import sys
+import os
+import random
+import time
 from pathlib import Path
-import requests
+from typing import Dict, List, Optional
+
+import httpx
 
 # Configuration
 API_BASE_URL = "http://localhost:8000/api/v1"
 UPLOAD_FOLDER = Path(__file__).parent / "uploads" / "properties"
 
+# Concurrent mode defaults
+DEFAULT_CONCURRENCY = 4
+DEFAULT_BATCH_SIZE = 200  # POST /properties/bulk accepts up to 1000
+DEFAULT_RETRIES = 5
+RETRY_BASE_DELAY = 0.5  # Seconds; doubled on each attempt, with jitter
+RETRY_MAX_DELAY = 30
+REQUEST_TIMEOUT = 60
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ERRORS_SHOWN = 20
+
 
 def read_csv_properties(csv_file: str):
     """Read properties from CSV file"""
@@ -50,22 +79,30 @@ def read_csv_properties(csv_file: str):
                 "image_url": images[0] if images else "",  # First image as main
                 "is_available": True
             }
+            if row.get('slug'):
+                property_data["slug"] = row['slug']
             
             properties.append(property_data)
     
     return properties
 
 
-def upload_property(property_data: dict):
+def auth_headers(token: Optional[str]) -> dict:
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def upload_property(client: httpx.Client, property_data: dict):
     """Upload a single property via API"""
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/properties/",
-            json=property_data,
-            headers={"Content-Type": "application/json"}
+        response = client.post(
+            "/properties/",
+            json={k: v for k, v in property_data.items() if k != "slug"},
         )
         
-        if response.status_code == 200:
+        if response.status_code in (200, 201):
             property_id = response.json()['id']
             print(f"   ✅ Uploaded: {property_data['title']} (ID: {property_id})")
             return True
@@ -78,14 +115,271 @@ def upload_property(property_data: dict):
         return False
 
 
+# =============================================================================
+# CONCURRENT MODE
+# =============================================================================
+
+class Checkpoint:
+    """
+    Rows already uploaded, persisted as JSON after every batch.
+
+    Keyed by CSV row number; a checkpoint written for a file with a different
+    row count is ignored rather than trusted.
+    """
+
+    def __init__(self, path: Path, csv_file: str, total_rows: int):
+        self.path = path
+        self.csv_file = str(Path(csv_file).resolve())
+        self.total_rows = total_rows
+        self.done: Dict[str, dict] = {}
+        self.failed: Dict[str, str] = {}
+
+    def load(self) -> "Checkpoint":
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  Ignoring unreadable checkpoint {self.path}: {e}")
+            return self
+        if data.get("csv_file") != self.csv_file or data.get("total_rows") != self.total_rows:
+            print(f"   ⚠️  Checkpoint {self.path} belongs to another file; starting over")
+            return self
+        self.done = data.get("done", {})
+        return self
+
+    def save(self):
+        data = {
+            "csv_file": self.csv_file,
+            "total_rows": self.total_rows,
+            "done": self.done,
+            "failed": self.failed,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        # Write-then-rename so an interrupted save never leaves a truncated file
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+    def is_done(self, row: int) -> bool:
+        return str(row) in self.done
+
+    def mark_done(self, row: int, result: dict):
+        self.done[str(row)] = result
+        self.failed.pop(str(row), None)
+
+    def mark_failed(self, row: int, error: str):
+        self.failed[str(row)] = error
+
+
+async def post_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    retries: int,
+) -> httpx.Response:
+    """
+    POST payload, retrying network errors and retryable statuses with
+    exponential backoff and jitter (Retry-After is honoured when sent).
+    The last response, or the last network error, is returned/raised.
+    """
+    for attempt in range(retries + 1):
+        try:
+            response = await client.post(url, json=payload)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+            retry_after = None
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            retry_after = response.headers.get("Retry-After")
+
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+
+class ConcurrentUploader:
+    """Uploads (row, property) pairs with bounded parallelism over one pooled client"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        checkpoint: Checkpoint,
+        concurrency: int,
+        retries: int,
+        upsert: bool,
+    ):
+        self.client = client
+        self.checkpoint = checkpoint
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.retries = retries
+        self.upsert = upsert
+        self.bulk_supported = True  # Until the server answers 404/405
+        self.aborted: Optional[str] = None  # Set on 401/403: every other request would fail too
+        self.success = 0
+        self.failed = 0
+        self.remaining = 0
+
+    def _record(self, row: int, result: Optional[dict] = None, error: Optional[str] = None):
+        if error is None:
+            self.checkpoint.mark_done(row, result)
+            self.success += 1
+        else:
+            self.checkpoint.mark_failed(row, error)
+            self.failed += 1
+        self.remaining -= 1
+
+    async def _upload_one(self, row: int, prop: dict):
+        """
+        Upload one row: alone through /properties/bulk (keeping its slug and
+        --upsert) when the server has it, else through POST /properties/
+        """
+        if self.bulk_supported:
+            url, payload = "/properties/bulk", {"properties": [prop], "upsert": self.upsert}
+        else:
+            url, payload = "/properties/", {k: v for k, v in prop.items() if k != "slug"}
+        try:
+            response = await post_with_retry(self.client, url, payload, self.retries)
+        except httpx.TransportError as e:
+            self._record(row, error=f"network error: {e}")
+            return
+        if response.status_code in (401, 403):
+            self.aborted = f"{response.status_code} - {response.text[:500]}"
+            return
+        if response.status_code in (200, 201):
+            body = response.json()
+            if self.bulk_supported:
+                body = body["results"][0]
+            self._record(row, {"id": body["id"], "slug": body.get("slug")})
+        else:
+            self._record(row, error=f"{response.status_code} - {response.text[:500]}")
+
+    async def _upload_batch(self, batch: List[tuple]):
+        """One bulk request; falls back to per-row uploads to isolate bad rows"""
+        if self.bulk_supported:
+            payload = {"properties": [prop for _, prop in batch], "upsert": self.upsert}
+            try:
+                response = await post_with_retry(self.client, "/properties/bulk", payload, self.retries)
+            except httpx.TransportError as e:
+                for row, _ in batch:
+                    self._record(row, error=f"network error: {e}")
+                return
+
+            if response.status_code in (401, 403):
+                self.aborted = f"{response.status_code} - {response.text[:500]}"
+                return
+            if response.status_code == 200:
+                for (row, _), result in zip(batch, response.json()["results"]):
+                    self._record(row, {"id": result["id"], "slug": result["slug"]})
+                return
+            if response.status_code in (404, 405):
+                print("   ℹ️  Server has no bulk endpoint; uploading one property per request")
+                if self.upsert:
+                    print("   ⚠️  --upsert needs the bulk endpoint; existing properties will be created again")
+                self.bulk_supported = False
+            elif response.status_code != 422:
+                for row, _ in batch:
+                    self._record(row, error=f"{response.status_code} - {response.text[:500]}")
+                return
+
+        # No bulk endpoint, or the batch was rejected (422): send rows individually,
+        # in order, so each batch still holds at most one connection
+        for row, prop in batch:
+            if self.aborted:
+                return
+            await self._upload_one(row, prop)
+
+    async def run_batch(self, number: int, total: int, batch: List[tuple]):
+        async with self.semaphore:
+            if self.aborted:
+                return
+            started = time.perf_counter()
+            failed_before = self.failed
+            await self._upload_batch(batch)
+            self.checkpoint.save()
+            if self.aborted:
+                return
+            failures = self.failed - failed_before
+            mark = "✅" if not failures else "⚠️ "
+            print(
+                f"   {mark} Batch {number}/{total}: {len(batch) - failures}/{len(batch)} uploaded "
+                f"in {time.perf_counter() - started:.1f}s ({self.remaining} rows left)"
+            )
+
+
+async def upload_concurrent(
+    properties: List[dict],
+    checkpoint: Checkpoint,
+    api_url: str,
+    token: Optional[str],
+    concurrency: int,
+    batch_size: int,
+    retries: int,
+    upsert: bool,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> ConcurrentUploader:
+    """Upload every property not yet in the checkpoint (transport: for tests)"""
+    pending = [
+        (row, prop) for row, prop in enumerate(properties, 1)
+        if not checkpoint.is_done(row)
+    ]
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=api_url,
+        headers=auth_headers(token),
+        limits=limits,
+        timeout=REQUEST_TIMEOUT,
+        transport=transport,
+    ) as client:
+        uploader = ConcurrentUploader(client, checkpoint, concurrency, retries, upsert)
+        uploader.remaining = len(pending)
+        if not batches:
+            return uploader
+
+        # Probe with the first batch so a server without /bulk is detected once
+        await uploader.run_batch(1, len(batches), batches[0])
+        await asyncio.gather(*(
+            uploader.run_batch(number, len(batches), batch)
+            for number, batch in enumerate(batches[1:], 2)
+        ))
+    return uploader
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Upload properties from a CSV file")
+    parser.add_argument("csv_file", help="CSV file with one property per row")
+    parser.add_argument("--api", default=API_BASE_URL, help=f"API base URL (default: {API_BASE_URL})")
+    parser.add_argument("--token", default=os.getenv("INDOHOMZ_API_TOKEN"),
+                        help="Bearer access token (default: $INDOHOMZ_API_TOKEN)")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Batched, parallel, resumable upload")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Requests in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Properties per bulk request, max 1000 (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help=f"Retries per request (default: {DEFAULT_RETRIES})")
+    parser.add_argument("--upsert", action="store_true",
+                        help="Update properties whose slug already exists")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <csv_file>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore an existing checkpoint and upload every row")
+    args = parser.parse_args()
+    if not 1 <= args.batch_size <= 1000:
+        parser.error("--batch-size must be between 1 and 1000")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python bulk_upload_properties.py <csv_file>")
-        print("\nExample:")
-        print("  python bulk_upload_properties.py properties.csv")
-        return
-    
-    csv_file = sys.argv[1]
+    args = parse_args()
+    csv_file = args.csv_file
     
     if not Path(csv_file).exists():
         print(f"❌ File not found: {csv_file}")
@@ -100,17 +394,46 @@ def main():
     properties = read_csv_properties(csv_file)
     print(f"   Found {len(properties)} properties to upload")
     
-    # Upload each property
-    print(f"\n📤 Uploading properties...")
-    success = 0
-    failed = 0
-    
-    for i, prop in enumerate(properties, 1):
-        print(f"\n{i}/{len(properties)}: {prop['title']}")
-        if upload_property(prop):
-            success += 1
-        else:
-            failed += 1
+    started = time.perf_counter()
+    if args.concurrent:
+        checkpoint_path = Path(args.checkpoint or f"{csv_file}.checkpoint.json")
+        checkpoint = Checkpoint(checkpoint_path, csv_file, len(properties))
+        if not args.restart:
+            checkpoint.load()
+        skipped = len(checkpoint.done)
+        if skipped:
+            print(f"   Resuming: {skipped} already uploaded (checkpoint: {checkpoint_path})")
+        
+        print(f"\n📤 Uploading properties ({args.concurrency} at a time, batches of {args.batch_size})...")
+        uploader = asyncio.run(upload_concurrent(
+            properties, checkpoint, args.api, args.token,
+            args.concurrency, args.batch_size, args.retries, args.upsert,
+        ))
+        success, failed = uploader.success, uploader.failed
+        if uploader.aborted:
+            print(f"\n❌ Stopped, the server refused the request: {uploader.aborted}")
+            print("   Check --token; uploaded rows are kept in the checkpoint.")
+        errors = sorted(checkpoint.failed.items(), key=lambda item: int(item[0]))
+        for row, error in errors[:MAX_ERRORS_SHOWN]:
+            print(f"   ❌ Row {row} ({properties[int(row) - 1]['title']}): {error}")
+        if len(errors) > MAX_ERRORS_SHOWN:
+            print(f"   ... and {len(errors) - MAX_ERRORS_SHOWN} more (see {checkpoint_path})")
+        if failed:
+            print(f"\n   Re-run the same command to retry the {failed} failed rows.")
+    else:
+        # Upload each property
+        print(f"\n📤 Uploading properties...")
+        skipped = 0
+        success = 0
+        failed = 0
+        
+        with httpx.Client(base_url=args.api, headers=auth_headers(args.token), timeout=REQUEST_TIMEOUT) as client:
+            for i, prop in enumerate(properties, 1):
+                print(f"\n{i}/{len(properties)}: {prop['title']}")
+                if upload_property(client, prop):
+                    success += 1
+                else:
+                    failed += 1
     
     # Summary
     print("\n" + "=" * 60)
@@ -118,7 +441,10 @@ def main():
     print("=" * 60)
     print(f"   Success: {success}")
     print(f"   Failed: {failed}")
+    if skipped:
+        print(f"   Skipped (already uploaded): {skipped}")
     print(f"   Total: {len(properties)}")
+    print(f"   Time: {time.perf_counter() - started:.1f}s")
     print()
 
 
@@ -4,24 +4,48 @@ IndoHomz API - Luxury Real Estate PropTech Platform
 FastAPI backend for property listings, lead management, and AI-powered search.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from sqlalchemy import text
+import asyncio
+import time
 import uvicorn
 from datetime import datetime
-import time
 
 # Import routers
-from app.api.routers import properties, leads, analytics, reports, maps, auth
-from app.database.connection import get_db, engine
-from app.database import models
+from app.api.routers import properties, leads, bookings, analytics, reports, maps, auth
+from app.database.connection import get_db, engine, SessionLocal
+from app.database.setup import ADMIN_EMAIL, ensure_admin_user, migrate
+from app.services.availability import availability_history
+from app.services.counters import reconcile_periodically
+from app.services.dashboard import dashboard_summary
+from app.services.events import lead_events
+from app.services.lead_rollups import lead_rollups
 from app.core.config import settings, get_database_url
 from app.core.rate_limit import init_rate_limiting
 from app.core.cache import cache
+from app.core.responses import FastJSONResponse
+from app.core.middleware import CompressionMiddleware, SecurityHeadersMiddleware
+
+
+def _elapsed_ms(start: float) -> str:
+    return f"{(time.perf_counter() - start) * 1000:.0f} ms"
+
+
+@contextmanager
+def startup_phase(name: str):
+    """Time a startup step; a failure is logged and skipped so the app still starts"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        print(f"⚠ {name} skipped: {e}")
+    else:
+        print(f"✓ {name} ({_elapsed_ms(start)})")
 
 
 @asynccontextmanager
@@ -40,57 +64,51 @@ async def lifespan(app: FastAPI):
     print(f"   Redis Cache: {'✓ Enabled' if settings.REDIS_ENABLED else '✗ Disabled (using in-memory)'}")
     print("=" * 50)
     
-    # Create database tables
-    try:
-        models.Base.metadata.create_all(bind=engine)
-        print("✓ Database tables ready")
-    except Exception as e:
-        print(f"✗ Database initialization error: {e}")
+    startup_start = time.perf_counter()
+    
+    # Schema and admin user: `python migrate.py` runs these once per deploy;
+    # with STARTUP_MIGRATIONS off (production default) workers skip them
+    if settings.STARTUP_MIGRATIONS:
+        fts_ready = None
+        with startup_phase("Database migrated"):
+            fts_ready = migrate(engine)
+        if fts_ready is not None:
+            print(f"{'✓' if fts_ready else '⚠'} Full-text search {'ready' if fts_ready else 'unavailable (using ILIKE)'}")
+        if settings.ENVIRONMENT == "production":
+            with startup_phase("Admin user checked"):
+                db = SessionLocal()
+                try:
+                    if ensure_admin_user(db) == "created":
+                        print(f"✓ Admin user created: {ADMIN_EMAIL}")
+                finally:
+                    db.close()
     
-    # Auto-create admin user on first startup (production)
-    if settings.ENVIRONMENT == "production":
-        try:
-            from app.database.connection import SessionLocal
-            from app.core.security import get_password_hash
-            from datetime import datetime
-            
-            db = SessionLocal()
-            admin_email = "admin@indohomz.com"
-            existing_admin = db.query(models.User).filter(models.User.email == admin_email).first()
-            
-            if not existing_admin:
-                # Create new admin with bcrypt hash
-                password_hash = get_password_hash("Admin@2024")
-                
-                admin = models.User(
-                    email=admin_email,
-                    password_hash=password_hash,
-                    name="Admin User",
-                    role="admin",
-                    is_active=True,
-                    is_verified=True,
-                    created_at=datetime.utcnow()
-                )
-                db.add(admin)
-                db.commit()
-                print(f"✓ Admin user created: {admin_email}")
-            else:
-                # Update existing admin password to fix any hash issues
-                password_hash = get_password_hash("Admin@2024")
-                existing_admin.password_hash = password_hash
-                db.commit()
-                print(f"✓ Admin user password updated: {admin_email}")
-            db.close()
-        except Exception as e:
-            print(f"⚠ Admin user creation skipped: {e}")
+    # Dashboard counters rebuild themselves on first read (and in migrate.py);
+    # they and recent lead rollups are then reconciled, and finished days of
+    # availability rolled up, periodically
+    reconcile_task = asyncio.create_task(reconcile_periodically(
+        SessionLocal,
+        settings.ANALYTICS_RECONCILE_SECONDS,
+        [dashboard_summary.reconcile, lead_rollups.reconcile_recent, availability_history.roll_up],
+    ))
     
     # Initialize rate limiting (async to support Redis)
+    phase_start = time.perf_counter()
     using_redis = await init_rate_limiting()
-    print(f"✓ Rate limiting initialized {'(Redis)' if using_redis else '(in-memory)'}")
+    print(f"✓ Rate limiting initialized {'(Redis)' if using_redis else '(in-memory)'} ({_elapsed_ms(phase_start)})")
+    
+    # Live lead events (SSE), fanned out across workers through Redis pub/sub
+    phase_start = time.perf_counter()
+    events_via_redis = await lead_events.start()
+    print(f"✓ Live events ready {'(Redis pub/sub)' if events_via_redis else '(in-process)'} ({_elapsed_ms(phase_start)})")
+    
+    print(f"✓ Startup complete in {_elapsed_ms(startup_start)}")
     
     yield
     
     # Shutdown
+    await lead_events.stop()
+    reconcile_task.cancel()
     print(f"👋 Shutting down {settings.APP_NAME} API...")
 
 
@@ -100,6 +118,7 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -111,26 +130,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Security headers middleware
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    """Add security headers to all responses"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    
-    # Security headers
-    if settings.ENVIRONMENT == "production":
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    return response
+# gzip / brotli for large text responses (precompressed cached payloads pass through)
+app.add_middleware(CompressionMiddleware)
+
+# Security headers, X-Process-Time and Server-Timing (pure ASGI, outermost)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    hsts=settings.ENVIRONMENT == "production",
+)
 
 
 # =============================================================================
@@ -158,6 +168,13 @@ app.include_router(
     tags=["leads"]
 )
 
+# Booking routes (admin export)
+app.include_router(
+    bookings.router,
+    prefix="/api/v1/bookings",
+    tags=["bookings"]
+)
+
 # Analytics routes
 app.include_router(
     analytics.router, 
@@ -198,6 +215,7 @@ async def root():
             "auth": "/api/v1/auth",
             "properties": "/api/v1/properties",
             "leads": "/api/v1/leads",
+            "bookings": "/api/v1/bookings",
             "analytics": "/api/v1/analytics",
             "reports": "/api/v1/reports",
         }
@@ -244,7 +262,7 @@ async def api_info():
 async def init_database():
     """Initialize database tables - safe to call multiple times"""
     try:
-        models.Base.metadata.create_all(bind=engine)
+        migrate(engine)
         return {"status": "success", "message": "Database tables initialized"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Database migration step for IndoHomz deploys
+
+Run once per deploy, before starting the server (see render.yaml):
+
+    python migrate.py                        # tables, Alembic revisions, admin user, counters and rollups
+    python migrate.py --reset-admin-password # also reset the admin password to ADMIN_PASSWORD
+
+Production workers skip these at startup (settings.STARTUP_MIGRATIONS).
+"""
+
+import argparse
+import sys
+import time
+
+from app.core.config import settings
+from app.database.connection import SessionLocal, engine
+from app.database.setup import ADMIN_EMAIL, ensure_admin_user, migrate
+from app.services.availability import availability_history
+from app.services.dashboard import dashboard_summary
+from app.services.lead_rollups import lead_rollups
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prepare the IndoHomz database")
+    parser.add_argument("--reset-admin-password", action="store_true", help="Reset the admin password")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        fts_ready = migrate(engine)
+        print(f"✓ Database migrated (full-text search {'ready' if fts_ready else 'unavailable'})")
+
+        db = SessionLocal()
+        try:
+            if settings.ENVIRONMENT == "production" or args.reset_admin_password:
+                result = ensure_admin_user(db, reset_password=args.reset_admin_password)
+                print(f"✓ Admin user {result}: {ADMIN_EMAIL}")
+            dashboard_summary.reconcile(db)
+            print("✓ Dashboard summary reconciled")
+            if lead_rollups.ensure_built(db):
+                print("✓ Lead rollups backfilled")
+            availability_history.roll_up(db)
+            print("✓ Availability history rolled up")
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return 1
+
+    print(f"✓ Migrations done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Production server launcher for the IndoHomz API
+
+Runs main:app on several worker processes sized to the machine:
+
+    python serve.py                  # workers from CPU and memory limits (1 without Redis)
+    WEB_CONCURRENCY=4 python serve.py
+
+With gunicorn and uvicorn-worker installed (Linux), the app is imported
+once in the master (preload), the heap is frozen with gc.freeze() so the
+forked workers share it copy-on-write, and workers are uvicorn workers
+(uvloop / httptools when installed). Without them (e.g. Windows), it falls
+back to uvicorn's own multi-process mode, where each worker imports the app itself. Either way,
+access log lines leave out query strings.
+
+Settings (environment variables):
+    PORT                 listen port (8000)
+    WEB_CONCURRENCY      worker count (default: usable CPUs, capped by memory, with
+                         REDIS_ENABLED; otherwise 1, as workers share state via Redis)
+    WORKER_MEMORY_MB     memory budget per worker when sizing (160)
+    MAX_REQUESTS         recycle a worker after this many requests (10000; 0 = never)
+    MAX_REQUESTS_JITTER  random extra requests so workers do not recycle together (1000)
+    KEEP_ALIVE           idle keep-alive seconds; above the load balancer's idle timeout (75)
+    BACKLOG              pending connection queue length (2048)
+    GRACEFUL_TIMEOUT     seconds a worker gets to finish requests on restart (30)
+"""
+
+import copy
+import gc
+import importlib.util
+import logging
+import os
+import sys
+
+APP = "main:app"
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _cgroup_cpu_limit():
+    """CPUs allowed by the container's cgroup CPU quota, if any"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2: "<quota> <period>" or "max <period>"
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:  # cgroup v1
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _cgroup_memory_limit_mb():
+    """Memory allowed by the container's cgroup, if limited"""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:  # v1 reports "unlimited" as a huge number
+            return int(value) // (1024 * 1024)
+    return None
+
+
+def _machine_workers() -> int:
+    """One worker per usable CPU, within the memory budget"""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_limit()
+    if quota is not None:
+        cpus = min(cpus, max(1, round(quota)))
+
+    memory_mb = _cgroup_memory_limit_mb()
+    if memory_mb is not None:
+        cpus = min(cpus, memory_mb // _env_int("WORKER_MEMORY_MB", 160))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """
+    WEB_CONCURRENCY, else one worker per usable CPU when Redis is enabled,
+    else 1. Without Redis each worker has its own cache, rate limit counters,
+    live event subscribers and rollup state, so several workers serve stale
+    or inconsistent data.
+    """
+    from app.core.config import settings
+
+    if os.environ.get("WEB_CONCURRENCY"):
+        workers = max(1, _env_int("WEB_CONCURRENCY", 1))
+        if workers > 1 and not settings.REDIS_ENABLED:
+            print(
+                f"⚠ WEB_CONCURRENCY={workers} without Redis: each worker keeps its own cache, "
+                f"rate limits and live event subscribers (enable REDIS_ENABLED or use 1 worker)",
+                file=sys.stderr,
+            )
+        return workers
+    return _machine_workers() if settings.REDIS_ENABLED else 1
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+class HideQueryString(logging.Filter):
+    """
+    Drop the query string from uvicorn access log lines: URLs can carry
+    credentials (e.g. ?ticket= on event streams) that must not reach the logs
+    """
+
+    def filter(self, record):
+        if isinstance(record.args, tuple) and len(record.args) == 5:
+            client, method, path, http_version, status = record.args
+            record.args = (client, method, path.split("?", 1)[0], http_version, status)
+        return True
+
+
+def options() -> dict:
+    return {
+        "port": _env_int("PORT", 8000),
+        "workers": worker_count(),
+        "max_requests": _env_int("MAX_REQUESTS", 10000),
+        "max_requests_jitter": _env_int("MAX_REQUESTS_JITTER", 1000),
+        "keep_alive": _env_int("KEEP_ALIVE", 75),
+        "backlog": _env_int("BACKLOG", 2048),
+        "graceful_timeout": _env_int("GRACEFUL_TIMEOUT", 30),
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+    }
+
+
+# =============================================================================
+# GUNICORN (preload + gc.freeze)
+# =============================================================================
+
+def _when_ready(server):
+    # App imported, workers not yet forked: move everything allocated so far
+    # out of the GC's generations, so collections in the workers never touch
+    # (and copy) the shared pages
+    gc.freeze()
+
+
+def _post_fork(server, worker):
+    gc.enable()
+    # Connections opened while preloading belong to the master; each worker opens its own
+    from app.database.connection import engine
+    engine.dispose(close=False)
+
+
+def run_gunicorn(opts: dict):
+    from gunicorn.app.base import BaseApplication
+    from uvicorn_worker import UvicornWorker
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": opts["loop"], "http": opts["http"]}
+
+    class Application(BaseApplication):
+        def load_config(self):
+            config = {
+                "bind": f"0.0.0.0:{opts['port']}",
+                "workers": opts["workers"],
+                "worker_class": Worker,
+                "preload_app": True,
+                "max_requests": opts["max_requests"],
+                "max_requests_jitter": opts["max_requests_jitter"],
+                "keepalive": opts["keep_alive"],
+                "backlog": opts["backlog"],
+                "graceful_timeout": opts["graceful_timeout"],
+                "timeout": 120,
+                "when_ready": _when_ready,
+                "post_fork": _post_fork,
+                "accesslog": "-",
+            }
+            for key, value in config.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from main import app
+            return app
+
+    logging.getLogger("uvicorn.access").addFilter(HideQueryString())  # Inherited by the forked workers
+    gc.disable()  # No collections while preloading: keeps objects where they were allocated
+    Application().run()
+
+
+def run_uvicorn(opts: dict):
+    import uvicorn
+    from uvicorn.config import LOGGING_CONFIG
+
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config["filters"] = {"hide_query_string": {"()": HideQueryString}}
+    log_config["loggers"]["uvicorn.access"]["filters"] = ["hide_query_string"]
+
+    uvicorn.run(
+        APP,
+        host="0.0.0.0",
+        port=opts["port"],
+        workers=opts["workers"],
+        loop=opts["loop"],
+        http=opts["http"],
+        limit_max_requests=opts["max_requests"] or None,
+        timeout_keep_alive=opts["keep_alive"],
+        timeout_graceful_shutdown=opts["graceful_timeout"],
+        backlog=opts["backlog"],
+        proxy_headers=True,
+        log_config=log_config,
+    )
+
+
+if __name__ == "__main__":
+    opts = options()
+    use_gunicorn = _installed("gunicorn") and _installed("uvicorn_worker") and sys.platform != "win32"
+    print(
+        f"Starting {APP} with {opts['workers']} worker(s) on port {opts['port']} "
+        f"({'gunicorn, preloaded' if use_gunicorn else 'uvicorn'}; loop={opts['loop']}, http={opts['http']})"
+    )
+    if use_gunicorn:
+        run_gunicorn(opts)
+    else:
+        run_uvicorn(opts)
@@ -0,0 +1,54 @@
+import sys
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# The app package lives in backend/
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND not in sys.path:
+    sys.path.insert(0, BACKEND)
+
+# Load the Alembic library now: test_logic.py later puts the repo root, whose
+# legacy alembic/ directory is a package of the same name, first on sys.path
+import alembic.command  # noqa: E402,F401
+
+from app.core import cache as cache_module
+from app.database import models
+
+
+@pytest.fixture()
+def engine():
+    """In-memory database with every table, on one shared connection (usable from worker threads)"""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    models.Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def db(engine):
+    """Session on the test database; test modules seed it by overriding db(db)"""
+    sess = sessionmaker(bind=engine)()
+    try:
+        yield sess
+    finally:
+        sess.close()
+
+
+@pytest.fixture()
+def memory_cache(monkeypatch):
+    """The app cache, enabled on a private in-memory store (no Redis, nothing shared between tests)"""
+    cache = cache_module.cache
+    monkeypatch.setattr(cache, "enabled", True)
+    monkeypatch.setattr(cache, "redis_client", None)
+    monkeypatch.setattr(cache, "redis_binary", None)
+    monkeypatch.setattr(cache_module, "_memory_cache", {})
+    monkeypatch.setattr(cache_module, "_cache_expiry", {})
+    return cache
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import models
+from app.schemas import schemas
+from app.services.crud import property_service, booking_service
+from app.services.availability import availability_history
+from app.services.dashboard import dashboard_summary
+
+
+@pytest.fixture()
+def db(db):
+    db.add_all([
+        models.Property(title="A", price="₹10,000/month", city="Gurgaon", location="Sector 57"),
+        models.Property(title="B", price="₹10,000/month", city="Delhi", location="Saket"),
+        models.Property(title="C", price="₹10,000/month", city="Delhi", location="Saket", is_available=False),
+    ])
+    db.commit()
+    return db
+
+
+def transitions(db):
+    E = models.AvailabilityEvent
+    return [
+        (e.property_id, e.was_available, e.is_available)
+        for e in db.query(E).order_by(E.id).all()
+    ]
+
+
+def backdate_events(db, days):
+    db.query(models.AvailabilityEvent).update(
+        {"created_at": datetime.utcnow() - timedelta(days=days)}
+    )
+    db.commit()
+
+
+def test_every_availability_change_is_logged(db):
+    assert transitions(db) == [(1, None, True), (2, None, True), (3, None, False)]
+
+    # Availability toggle endpoint path
+    prop = property_service.get_property(db, 1)
+    prop.is_available = False
+    db.commit()
+
+    booking = booking_service.create_booking(db, schemas.BookingCreate(
+        property_id=2, tenant_name="T", tenant_phone="9876543210", check_in="2026-10-19T00:00:00", monthly_rent=10000,
+    ))
+    booking_service.cancel_booking(db, booking.id)
+    property_service.delete_property(db, 2)
+    property_service.delete_property(db, 3)  # Already unavailable: no transition
+    property_service.hard_delete_property(db, 1)
+
+    assert transitions(db)[3:] == [
+        (1, True, False),
+        (2, True, False),
+        (2, False, True),
+        (2, True, False),
+        (1, False, None),
+    ]
+
+
+def test_trend_rolls_up_finished_days(db):
+    backdate_events(db, 3)
+    prop = property_service.get_property(db, 1)
+    prop.is_available = False
+    db.commit()
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    db.query(models.AvailabilityEvent).filter(models.AvailabilityEvent.id == 4).update(
+        {"created_at": yesterday}
+    )
+    db.commit()
+    property_service.create_property(db, schemas.PropertyCreate(
+        title="D", price="₹20,000/month", location="Powai", city="Mumbai", amenities="Wifi",
+    ))
+
+    # Reads never write history; the reconcile task rolls it up
+    assert [p["date"] for p in availability_history.get_trend(db, days=7)["trend"]] == [
+        datetime.utcnow().date().isoformat()
+    ]
+    assert db.query(models.AvailabilityDaily).count() == 0
+    availability_history.roll_up(db)
+
+    trend = availability_history.get_trend(db, days=7)
+    points = [(p["total"], p["available"]) for p in trend["trend"]]
+
+    # Three days ago through yesterday, then today's live counts
+    assert points == [(3, 2), (3, 2), (3, 1), (4, 2)]
+    assert trend["trend"][-1]["date"] == datetime.utcnow().date().isoformat()
+    assert trend["current_availability_rate"] == 50.0
+
+    # Finished days are stored once and reused
+    availability_history.roll_up(db)
+    assert db.query(models.AvailabilityDaily).count() == 3
+    assert availability_history.get_trend(db, days=7)["trend"] == trend["trend"]
+
+
+def test_roll_up_is_anchored_on_the_properties_table(db):
+    backdate_events(db, 2)
+    dashboard_summary.get_summary(db)
+    db.query(models.DashboardCounter).filter(models.DashboardCounter.metric == "properties").update(
+        {"count": 99}
+    )
+    db.commit()
+
+    availability_history.roll_up(db)
+    D = models.AvailabilityDaily
+    assert db.query(D.day, D.total, D.available).order_by(D.day).all()[-1][1:] == (3, 2)
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import event
+
+from app.database import models
+from app.schemas import schemas
+from app.services.crud import property_service
+
+
+@pytest.fixture()
+def db(db):
+    db.add_all([
+        models.Property(title="Sunny Flat", slug="sunny-flat", price="₹10,000/month", city="Gurgaon", location="Sector 57"),
+        models.Property(title="Sunny Flat", slug="sunny-flat-1", price="₹10,000/month", city="Gurgaon", location="Sector 57"),
+    ])
+    db.commit()
+    return db
+
+
+def item(title, **fields):
+    return schemas.PropertyBulkItem(title=title, price=fields.pop("price", "₹20,000/month"), **fields)
+
+
+def test_bulk_create_allocates_unique_slugs(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    results = property_service.bulk_upsert_properties(db, [
+        item("Sunny Flat"), item("Sunny Flat"), item("Garden Villa"), item("Garden Villa"), item("Loft"),
+    ])
+
+    assert [r["slug"] for r in results] == [
+        "sunny-flat-2", "sunny-flat-3", "garden-villa", "garden-villa-1", "loft",
+    ]
+    assert all(r["created"] for r in results)
+    slug_lookups = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(slug_lookups) == 2  # Existing slugs, then numbered variants of the clashing ones
+
+    prop = property_service.get_property_by_slug(db, "loft")
+    assert prop.price_numeric == 20000  # Derived columns are filled as for single creates
+
+
+def test_bulk_upsert_updates_by_slug(db):
+    results = property_service.bulk_upsert_properties(db, [
+        item("Renamed", slug="sunny-flat", price="₹12,000/month"),
+        item("New Place", slug="new-place"),
+        item("New Place Again", slug="new-place", bedrooms=2),
+    ], upsert=True)
+
+    assert [(r["slug"], r["created"]) for r in results] == [
+        ("sunny-flat", False), ("new-place", True), ("new-place", False),
+    ]
+    assert results[1]["id"] == results[2]["id"]
+
+    updated = property_service.get_property_by_slug(db, "sunny-flat")
+    assert (updated.title, updated.price_numeric) == ("Renamed", 12000)
+    assert property_service.get_property_by_slug(db, "new-place").bedrooms == 2
+    assert db.query(models.Property).count() == 3
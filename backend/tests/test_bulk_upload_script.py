@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import bulk_upload_properties as script
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    """Record backoff delays instead of sleeping"""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(script.asyncio, "sleep", sleep)
+    monkeypatch.setattr(script.random, "uniform", lambda low, high: 1.0)
+    return delays
+
+
+def props(count):
+    return [{"title": f"Home {i}", "slug": f"home-{i}", "price": "10000"} for i in range(1, count + 1)]
+
+
+def fake_server(respond):
+    """MockTransport calling respond(path, body) and logging every request"""
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        return respond(request.url.path, body)
+
+    return httpx.MockTransport(handler), requests
+
+
+def bulk_ok(path, body):
+    return httpx.Response(200, json={"results": [
+        {"id": 100 + int(p["slug"].split("-")[1]), "slug": p["slug"], "created": True}
+        for p in body["properties"]
+    ]})
+
+
+def upload(tmp_path, properties, transport, batch_size=2, upsert=False, checkpoint=None):
+    checkpoint = checkpoint or script.Checkpoint(tmp_path / "ck.json", str(tmp_path / "p.csv"), len(properties))
+    uploader = asyncio.run(script.upload_concurrent(
+        properties, checkpoint, "http://api/api/v1", None,
+        concurrency=2, batch_size=batch_size, retries=3, upsert=upsert, transport=transport,
+    ))
+    return uploader, checkpoint
+
+
+def test_resume_skips_rows_in_the_checkpoint(tmp_path):
+    properties = props(5)
+    first = script.Checkpoint(tmp_path / "ck.json", str(tmp_path / "p.csv"), 5)
+    first.mark_done(1, {"id": 101, "slug": "home-1"})
+    first.mark_done(2, {"id": 102, "slug": "home-2"})
+    first.save()
+
+    transport, requests = fake_server(bulk_ok)
+    resumed = script.Checkpoint(tmp_path / "ck.json", str(tmp_path / "p.csv"), 5).load()
+    uploader, checkpoint = upload(tmp_path, properties, transport, checkpoint=resumed)
+
+    sent = [p["slug"] for _, body in requests for p in body["properties"]]
+    assert sent == ["home-3", "home-4", "home-5"]
+    assert uploader.success == 3 and uploader.failed == 0
+    saved = json.loads((tmp_path / "ck.json").read_text())
+    assert sorted(saved["done"], key=int) == ["1", "2", "3", "4", "5"]
+
+
+def test_checkpoint_for_another_file_is_ignored(tmp_path):
+    script.Checkpoint(tmp_path / "ck.json", str(tmp_path / "p.csv"), 5).save()
+    other = script.Checkpoint(tmp_path / "ck.json", str(tmp_path / "p.csv"), 6)
+    assert other.load().done == {}
+
+
+def test_retryable_responses_back_off_and_honour_retry_after(no_backoff_sleep):
+    statuses = iter([503, 429, 200])
+
+    def respond(path, body):
+        status = next(statuses)
+        return httpx.Response(status, headers={"Retry-After": "7"} if status == 429 else {}, json={})
+
+    transport, requests = fake_server(respond)
+
+    async def run():
+        async with httpx.AsyncClient(base_url="http://api", transport=transport) as client:
+            return await script.post_with_retry(client, "/properties/bulk", {"properties": []}, retries=3)
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(requests) == 3
+    assert no_backoff_sleep == [script.RETRY_BASE_DELAY, 7]
+
+
+def test_retries_stop_at_the_limit():
+    transport, requests = fake_server(lambda path, body: httpx.Response(502, json={}))
+
+    async def run():
+        async with httpx.AsyncClient(base_url="http://api", transport=transport) as client:
+            return await script.post_with_retry(client, "/properties/bulk", {}, retries=2)
+
+    assert asyncio.run(run()).status_code == 502
+    assert len(requests) == 3
+
+
+def test_rejected_batch_is_retried_row_by_row_with_upsert(tmp_path):
+    def respond(path, body):
+        if any(p["slug"] == "home-2" for p in body["properties"]):
+            return httpx.Response(422, json={"detail": "bad row"})
+        return bulk_ok(path, body)
+
+    transport, requests = fake_server(respond)
+    uploader, checkpoint = upload(tmp_path, props(3), transport, batch_size=3, upsert=True)
+
+    assert [path for path, _ in requests] == ["/api/v1/properties/bulk"] * 4
+    assert [body["properties"] for _, body in requests[1:]] == [[p] for p in props(3)]
+    assert all(body["upsert"] is True for _, body in requests)
+    assert uploader.success == 2 and uploader.failed == 1
+    assert checkpoint.done["3"] == {"id": 103, "slug": "home-3"}
+    assert checkpoint.failed["2"].startswith("422")
+
+
+def test_server_without_bulk_endpoint_gets_single_creates(tmp_path):
+    def respond(path, body):
+        if path.endswith("/bulk"):
+            return httpx.Response(404, json={"detail": "Not Found"})
+        return httpx.Response(201, json={"id": 7, "slug": "x"})
+
+    transport, requests = fake_server(respond)
+    uploader, _ = upload(tmp_path, props(3), transport)
+
+    assert [path for path, _ in requests].count("/api/v1/properties/bulk") == 1
+    singles = [body for path, body in requests if path == "/api/v1/properties/"]
+    assert len(singles) == 3 and all("slug" not in body for body in singles)
+    assert uploader.success == 3
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.security import create_access_token, create_stream_ticket, get_current_user_for_stream
+from app.schemas import schemas
+from app.services import events
+from app.services.crud import lead_service
+
+
+def collect(count, action):
+    """Run action while subscribed; return the first count SSE frames"""
+    async def run():
+        stream = events.lead_events.stream()
+        frames = [await stream.__anext__()]  # retry: line, subscribes
+        subscriber = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        await asyncio.to_thread(action)  # Services publish from worker threads too
+        frames.append(await asyncio.wait_for(subscriber, 1))
+        while len(frames) < count + 1:
+            frames.append(await asyncio.wait_for(stream.__anext__(), 1))
+        await stream.aclose()
+        return frames[1:]
+    return asyncio.run(run())
+
+
+def parse(frame):
+    event, data = frame.strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+def test_lead_writes_publish_events_and_counter_deltas(db):
+    lead = lead_service.create_lead(db, schemas.LeadCreate(name="Asha", phone="9876543210", source="website"))
+
+    frames = collect(2, lambda: lead_service.update_lead_status(db, lead.id, "contacted"))
+    assert [parse(f) for f in frames] == [
+        ("lead.status_changed", {"id": lead.id, "previous_status": "new", "status": "contacted"}),
+        ("counters.delta", {"lead_status:new": -1, "lead_status:contacted": 1}),
+    ]
+
+
+def test_new_lead_event(db):
+    frames = collect(2, lambda: lead_service.create_lead(db, schemas.LeadCreate(name="Ravi", phone="9876543210")))
+    event, data = parse(frames[0])
+    assert event == "lead.created"
+    assert data["name"] == "Ravi" and data["status"] == "new"
+    assert parse(frames[1]) == ("counters.delta", {"leads:total": 1, "lead_status:new": 1, "lead_source:website": 1})
+    assert not events.lead_events._subscribers  # Closing the stream unsubscribes
+
+
+def stream_user(headers=None, ticket=None):
+    scope = {"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]}
+    return asyncio.run(get_current_user_for_stream(Request(scope), ticket=ticket))
+
+
+def test_stream_accepts_a_ticket_in_the_url_but_not_an_access_token():
+    user = {"user_id": 1, "email": "admin@example.com", "role": "admin"}
+    access_token = create_access_token(user)
+    ticket = create_stream_ticket(user)
+
+    assert stream_user(ticket=ticket)["user_id"] == 1
+    assert stream_user(headers={"Authorization": f"Bearer {access_token}"})["type"] == "access"
+    for headers, query in [({}, access_token), ({"Authorization": f"Bearer {ticket}"}, None), ({}, None)]:
+        with pytest.raises(HTTPException) as e:
+            stream_user(headers=headers, ticket=query)
+        assert e.value.status_code == 401
+
+
+def test_redis_publishing_is_queued_and_sent_in_order_off_the_caller():
+    sent = []
+
+    class SlowRedis:
+        async def publish(self, channel, message):
+            await asyncio.sleep(0.01)  # A network round trip
+            sent.append(json.loads(message)["event"])
+
+    async def run():
+        broker = events.EventBroker("test")
+        broker._start_publisher(SlowRedis())
+        for i in range(3):
+            broker.publish(f"e{i}", {})
+        queued_only = sent == []  # publish() returned without a round trip
+        await asyncio.to_thread(broker.publish, "e3", {})  # From a worker thread too
+        while len(sent) < 4:
+            await asyncio.sleep(0.01)
+        await broker.stop()
+        return queued_only
+
+    assert asyncio.run(run())
+    assert sent == ["e0", "e1", "e2", "e3"]
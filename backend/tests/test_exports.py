@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.database import models
+from app.services import exports
+from app.services.crud import property_service, lead_service, booking_service
+
+
+@pytest.fixture()
+def db(db):
+    db.add_all([
+        models.Property(title="Flat, with comma", price="₹10,000/month", city="Gurgaon", location="Sector 57"),
+        models.Property(title="Villa", price="₹50,000/month", city="Delhi", location="Saket", is_available=False),
+    ])
+    db.add_all([
+        models.Lead(name=f"L{i}", phone=f"98765432{i:02d}", source="whatsapp" if i % 2 else "website",
+                    created_at=datetime(2026, 10, 1, 9, i))
+        for i in range(25)
+    ])
+    db.commit()
+    return db
+
+
+def test_lead_export_streams_batches_from_one_query(db, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 10)
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    chunks = list(exports.stream_export(lead_service.export_leads(db, source="whatsapp"), "csv"))
+
+    assert len(statements) == 1
+    assert len(chunks) == 2  # 12 rows in batches of 10
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [r["name"] for r in rows[:2]] == ["L23", "L21"]  # Newest first, like GET /leads/
+    assert rows[0]["created_at"].startswith("2026-10-01T09:23")
+    assert rows[0]["email"] == ""
+    assert {r["source"] for r in rows} == {"whatsapp"}
+
+
+def test_property_export_ndjson_uses_listing_filters(db):
+    query = property_service.export_properties(db, city="Gurgaon")
+    lines = "".join(exports.stream_export(query, "ndjson")).splitlines()
+
+    assert len(lines) == 1
+    row = json.loads(lines[0])
+    assert row["title"] == "Flat, with comma"
+    assert row["is_available"] is True
+    assert "price_numeric" not in row  # Only fields the API exposes
+
+
+def test_empty_csv_export_has_header(db):
+    chunks = list(exports.stream_export(booking_service.export_bookings(db), "csv"))
+    assert "".join(chunks).startswith("id,property_id,")
+    assert len("".join(chunks).splitlines()) == 1
+
+
+def test_export_streams_after_the_request_session_is_closed(db):
+    chunks = exports.stream_export(lead_service.export_leads(db), "ndjson")
+    db.close()  # The response body is only read after the endpoint (and get_db) returned
+    assert len("".join(chunks).splitlines()) == 25
+
+
+def test_csv_cells_that_look_like_formulas_stay_text(db):
+    db.add(models.Lead(name='=HYPERLINK("http://x","y")', phone="+919876543210", message="@SUM(A1)",
+                       created_at=datetime(2026, 10, 2)))
+    db.commit()
+    row = next(csv.DictReader(io.StringIO("".join(exports.stream_export(lead_service.export_leads(db), "csv")))))
+    assert row["name"] == '\'=HYPERLINK("http://x","y")'
+    assert row["phone"] == "'+919876543210"
+    assert row["message"] == "'@SUM(A1)"
+    assert row["id"] == "26"
@@ -0,0 +1,49 @@
+import pytest
+
+from app.database import models
+from app.database.fulltext import ensure_fulltext_index, sqlite_match_expression
+from app.services.crud import property_service
+
+
+@pytest.fixture()
+def db(db, engine):
+    # Existing rows must be picked up when the index is first built
+    db.add(models.Property(title="Old Villa", price="₹50,000/month", description="garden pool"))
+    db.commit()
+    ensure_fulltext_index(engine)
+    return db
+
+
+def test_match_expression_strips_operators():
+    assert sqlite_match_expression('villa OR "pool" -x') == '"villa"* "or"* "pool"* "x"*'
+    assert sqlite_match_expression("!!!") is None
+
+
+def test_search_ranks_title_matches_first(db):
+    db.add_all([
+        models.Property(title="Studio near Cyberhub", price="₹20,000/month", description="has a pool"),
+        models.Property(title="Pool Villa in Sector 57", price="₹90,000/month"),
+        models.Property(title="Co-Living PG", price="₹10,000/month", amenities="Wifi, AC"),
+    ])
+    db.commit()
+
+    results = property_service.search_properties(db, query_text="pool")
+    assert [p.title for p in results][0] == "Pool Villa in Sector 57"
+    assert {p.title for p in results} == {"Pool Villa in Sector 57", "Studio near Cyberhub", "Old Villa"}
+    assert property_service.search_properties_count(db, query_text="pool") == 3
+
+
+def test_index_follows_updates_and_deletes(db):
+    prop = models.Property(title="Penthouse", price="₹2L/month", amenities="Jacuzzi")
+    db.add(prop)
+    db.commit()
+    assert property_service.search_properties_count(db, query_text="jacuzzi") == 1
+
+    prop.amenities = "Gym"
+    db.commit()
+    assert property_service.search_properties_count(db, query_text="jacuzzi") == 0
+    assert property_service.search_properties_count(db, query_text="gym") == 1
+
+    db.delete(prop)
+    db.commit()
+    assert property_service.search_properties_count(db, query_text="penthouse") == 0
@@ -0,0 +1,55 @@
+import pytest
+
+from app.database import models
+from app.services.crud import property_service
+from app.utils import geo
+
+
+@pytest.fixture()
+def db(db):
+    # Coordinates from properties_9.csv, plus one in Delhi
+    db.add_all([
+        models.Property(title="DLF Phase 4", price="₹26,000/month", latitude=28.4675, longitude=77.0839),
+        models.Property(title="Sushant Lok 2", price="₹10,000/month", latitude=28.4401, longitude=77.0819),
+        models.Property(title="Malibu Town", price="₹25,000/month", latitude=28.4123, longitude=77.0567),
+        models.Property(title="Saket", price="₹40,000/month", latitude=28.5245, longitude=77.2066),
+        models.Property(title="No coordinates", price="₹9,000/month"),
+    ])
+    db.commit()
+    return db
+
+
+def test_encode_geohash_known_value():
+    # Reference example from the geohash specification
+    assert geo.encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_covering_cells_contain_box_corners():
+    box = (28.40, 77.03, 28.48, 77.10)
+    cells = geo.covering_cells(*box)
+    assert 1 <= len(cells) <= 16
+    for lat in (box[0], box[2]):
+        for lng in (box[1], box[3]):
+            assert any(geo.encode_geohash(lat, lng).startswith(c) for c in cells)
+
+
+def test_geohash_is_kept_in_sync(db):
+    prop = db.query(models.Property).filter_by(title="Saket").one()
+    assert prop.geohash == geo.encode_geohash(28.5245, 77.2066)
+
+    prop.latitude, prop.longitude = None, None
+    db.commit()
+    assert prop.geohash is None
+
+
+def test_nearby_sorted_by_distance(db):
+    pairs, total = property_service.get_properties_near(db, 28.4401, 77.0819, radius_km=5)
+    assert [p.title for p, _ in pairs] == ["Sushant Lok 2", "DLF Phase 4", "Malibu Town"]
+    assert total == 3
+    assert pairs[0][1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_bounding_box(db):
+    pairs, total = property_service.get_properties_in_bounds(db, 28.43, 77.07, 28.47, 77.09)
+    assert {p.title for p, _ in pairs} == {"Sushant Lok 2", "DLF Phase 4"}
+    assert total == 2
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app.database import models
+from app.services import imports
+from app.services.crud import property_service
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture()
+def db(db):
+    db.add(models.Property(title="Existing", slug="existing", price="₹10,000/month"))
+    db.commit()
+    return db
+
+
+def upload(path):
+    with open(os.path.join(BACKEND, path), "rb") as f:
+        return io.BytesIO(f.read())
+
+
+def test_imports_both_repo_csv_layouts(db):
+    report = imports.import_properties(db, upload("properties_template.csv"))
+    assert (report["rows"], report["created"], report["failed"]) == (1, 1, 0)
+    prop = property_service.get_property_by_slug(db, "luxury-3bhk-in-sushant-lok")
+    assert json.loads(prop.images)[0] == "sushant_lok_1.jpg"
+    assert prop.image_url == "sushant_lok_1.jpg"
+    assert prop.price_numeric == 45000
+
+    report = imports.import_properties(db, upload("properties_9.csv"))
+    assert (report["rows"], report["created"], report["failed"]) == (4, 4, 0)
+
+    report = imports.import_properties(db, upload("properties_9.csv"), upsert=True)
+    assert (report["created"], report["updated"]) == (0, 4)
+
+
+def test_invalid_rows_are_reported_and_skipped(db, monkeypatch):
+    monkeypatch.setattr(imports, "IMPORT_CHUNK_SIZE", 2)
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+    csv_text = (
+        "title,price,bedrooms\n"
+        "Flat A,₹20000,2\n"
+        ",₹20000,2\n"          # Missing title
+        "Flat B,₹30000,99\n"   # Too many bedrooms
+        "Flat C,₹40000,\n"
+        "Flat D,₹50000,3\n"
+    )
+
+    report = imports.import_properties(db, io.BytesIO(csv_text.encode()))
+
+    assert (report["rows"], report["created"], report["failed"]) == (5, 3, 2)
+    assert [(e["row"], e["errors"][0]["field"]) for e in report["errors"]] == [(2, "title"), (3, "bedrooms")]
+    assert len(commits) == 3  # One write per chunk that had valid rows
+
+
+def test_lead_import_checks_phone_and_property(db):
+    csv_text = (
+        "﻿name,phone,property_id,source\n"
+        "Asha,+91 98765 43210,1,referral\n"
+        "Ravi,12345,,\n"
+        "Meera,9876543211,42,\n"
+    )
+
+    report = imports.import_leads(db, io.BytesIO(csv_text.encode()))
+
+    assert (report["created"], report["failed"]) == (1, 2)
+    assert [(e["row"], e["errors"][0]["field"]) for e in report["errors"]] == [(2, "phone"), (3, "property_id")]
+    lead = db.query(models.Lead).one()
+    assert (lead.phone, lead.property_id, lead.status) == ("9876543210", 1, "new")
+
+
+def test_missing_required_columns_are_rejected(db):
+    with pytest.raises(ValueError, match="name, phone"):
+        imports.import_leads(db, io.BytesIO(b"email\na@b.com\n"))
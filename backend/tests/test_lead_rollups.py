@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.database import models
+from app.schemas import schemas
+from app.services.crud import lead_service
+from app.services.lead_rollups import META_HOUR, LeadRollups, lead_rollups
+
+
+@pytest.fixture()
+def db(db):
+    db.add(models.Property(title="A", price="₹10,000/month", city="Gurgaon", location="Sector 57"))
+    db.add_all([
+        models.Lead(name="L1", phone="1", source="whatsapp", created_at=datetime(2026, 10, 5, 9, 15)),
+        models.Lead(name="L2", phone="2", property_id=1, created_at=datetime(2026, 10, 5, 9, 45)),
+        models.Lead(name="L3", phone="3", property_id=1, created_at=datetime(2026, 10, 6, 18, 0)),
+        models.Lead(name="L4", phone="4", status="converted", created_at=datetime(2026, 10, 13, 10, 0)),
+        models.Lead(name="L5", phone="5", created_at=datetime(2026, 11, 2, 10, 0)),
+    ])
+    db.commit()
+    return db
+
+
+def rollup_rows(db):
+    R = models.LeadRollup
+    return sorted(db.query(R.hour, R.status, R.source, R.property_id, R.count).filter(R.hour != META_HOUR).all())
+
+
+def test_rollups_track_lead_writes(db):
+    assert rollup_rows(db)[:2] == [
+        ("2026-10-05T09", "new", "website", 1, 1),
+        ("2026-10-05T09", "new", "whatsapp", 0, 1),
+    ]
+
+    lead_service.update_lead_status(db, 1, "contacted")
+    db.delete(lead_service.get_lead(db, 5))
+    db.commit()
+    incremental = [row for row in rollup_rows(db) if row[-1]]
+
+    LeadRollups().rebuild(db)
+    assert rollup_rows(db) == incremental
+
+
+def test_counts_by_bucket(db):
+    assert lead_rollups.counts(db, bucket="day", start=datetime(2026, 10, 1), end=datetime(2026, 10, 31)) == [
+        {"bucket": "2026-10-05", "count": 2},
+        {"bucket": "2026-10-06", "count": 1},
+        {"bucket": "2026-10-13", "count": 1},
+    ]
+    assert lead_rollups.counts(db, bucket="week") == [
+        {"bucket": "2026-10-05", "count": 3},  # Monday of the ISO week
+        {"bucket": "2026-10-12", "count": 1},
+        {"bucket": "2026-11-02", "count": 1},
+    ]
+    assert lead_rollups.counts(db, bucket="month", group_by=["status"]) == [
+        {"bucket": "2026-10", "status": "new", "count": 3},
+        {"bucket": "2026-10", "status": "converted", "count": 1},
+        {"bucket": "2026-11", "status": "new", "count": 1},
+    ]
+    assert lead_rollups.counts(db, group_by=["property_id"], status="new") == [
+        {"property_id": None, "count": 2},
+        {"property_id": 1, "count": 2},
+    ]
+
+
+def test_lead_stats_read_rollups_not_leads(db):
+    statements = []
+    lead_service.get_lead_stats(db)  # First read checks the rollups are populated
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    result = lead_service.get_lead_stats(db, datetime(2026, 10, 1), datetime(2026, 10, 31))
+    assert len(statements) == 1 and "leads " not in statements[0]
+    assert result["total_leads"] == 4
+    assert result["conversion_rate"] == 25.0
+
+
+def test_first_read_builds_missing_rollups(db):
+    db.query(models.LeadRollup).delete()
+    db.commit()
+
+    assert LeadRollups().counts(db, bucket="month") == [
+        {"bucket": "2026-10", "count": 4},
+        {"bucket": "2026-11", "count": 1},
+    ]
+
+
+def test_history_is_backfilled_even_after_a_hook_write(db):
+    # Leads that predate the rollups table, then one written through the hook before the first read
+    db.query(models.LeadRollup).delete()
+    db.commit()
+    lead_service.create_lead(db, schemas.LeadCreate(name="L6", phone="9876543216"))
+    assert len(rollup_rows(db)) == 1
+
+    rollups = LeadRollups()
+    assert sum(row["count"] for row in rollups.counts(db)) == 6
+    assert lead_service.get_lead_stats(db)["total_leads"] == 6
+    assert LeadRollups().ensure_built(db) is False  # The marker row records the backfill
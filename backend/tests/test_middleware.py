@@ -0,0 +1,122 @@
+import gzip
+import json
+from unittest.mock import Mock
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core import compression, responses, timing
+from app.core.middleware import CompressionMiddleware, SecurityHeadersMiddleware
+
+
+def make_client(**options):
+    engine = create_engine("sqlite:///:memory:")
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware, **options)
+
+    @app.get("/sync")
+    def sync_endpoint():  # Runs in the threadpool
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with timing.timed("cache"):
+            pass
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_security_and_timing_headers():
+    response = make_client().get("/sync")
+
+    assert response.json() == {"ok": True}
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert "Strict-Transport-Security" not in response.headers
+    assert float(response.headers["X-Process-Time"]) >= 0
+    metrics = [part.split(";")[0] for part in response.headers["Server-Timing"].split(", ")]
+    assert "db" in metrics and "total" in metrics
+
+
+def test_hsts_only_when_enabled():
+    response = make_client(hsts=True).get("/missing")
+    assert response.status_code == 404
+    assert response.headers["Strict-Transport-Security"].startswith("max-age=")
+
+
+def test_recording_outside_a_request_is_a_noop():
+    assert timing.current_timings() is None
+    timing.record("db", 1.0)
+    with timing.timed("cache"):
+        pass
+    assert timing.current_timings() is None
+
+
+def make_compressed_client(payload):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    calls = []
+
+    @app.get("/payload")
+    def payload_endpoint(request: Request):
+        def render():
+            calls.append(1)
+            return payload
+        return responses.cached_payload_response(request, "test:payload", 60, render)
+
+    @app.get("/plain")
+    def plain_endpoint(size: int = 1000):
+        return {"text": "x" * size}
+
+    @app.get("/stream")
+    def stream_endpoint():
+        return StreamingResponse((("row %d\n" % i) * 50 for i in range(20)), media_type="text/csv")
+
+    return TestClient(app), calls
+
+
+def test_negotiate_prefers_supported_accepted_encodings():
+    assert compression.negotiate("gzip, deflate") == "gzip"
+    assert compression.negotiate("gzip;q=0, identity") is None
+    assert compression.negotiate(None) is None
+    assert compression.negotiate("*") == compression.supported_encodings()[0]
+
+
+def test_large_responses_are_compressed_and_small_ones_are_not():
+    client, _ = make_compressed_client(b"")
+    large = client.get("/plain", headers={"Accept-Encoding": "gzip"})
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert large.json() == {"text": "x" * 1000}  # httpx decodes gzip
+    assert "Accept-Encoding" in large.headers["Vary"]
+
+    small = client.get("/plain?size=10", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+    identity = client.get("/plain", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in identity.headers
+
+
+def test_streamed_responses_are_compressed_per_chunk():
+    client, _ = make_compressed_client(b"")
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == "".join(("row %d\n" % i) * 50 for i in range(20))
+
+
+def test_cached_payloads_store_the_compressed_variant(monkeypatch, memory_cache):
+    payload = json.dumps({"items": ["flat"] * 500}).encode()
+    client, calls = make_compressed_client(payload)
+    compress = Mock(wraps=compression.compress)
+    monkeypatch.setattr(responses, "compress", compress)
+
+    for _ in range(3):
+        response = client.get("/payload", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.content == payload
+    assert len(calls) == 1
+    assert compress.call_count == 1
+    assert gzip.decompress(memory_cache.get_bytes("test:payload:gzip")) == payload
+
+    assert client.get("/payload", headers={"Accept-Encoding": "identity"}).content == payload
+    assert len(calls) == 1
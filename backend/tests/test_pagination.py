@@ -0,0 +1,100 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import models
+from app.services.crud import (
+    encode_cursor,
+    decode_cursor,
+    property_service,
+    lead_service,
+)
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 1, 2, 3, 4, 5, 678)
+    token = encode_cursor(ts, 42)
+    assert "=" not in token
+    assert decode_cursor(token) == (ts, 42)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_property_pages_cover_all_rows_with_timestamp_ties(db):
+    # Server-default timestamps put every row in the same second
+    db.add_all([models.Property(title=f"Home {i}", price="₹10,000/month") for i in range(7)])
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = property_service.get_properties_page(db, cursor=cursor, limit=3)
+        seen.extend(p["id"] for p in items)
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_cached_property_pages_are_json_payloads(db, memory_cache):
+    db.add_all([models.Property(title=f"Home {i}", price="₹10,000/month") for i in range(3)])
+    db.commit()
+
+    first = property_service.get_properties_page(db, limit=2, fields=("id", "title"))
+    json.dumps(first[0])  # Storable in Redis as is
+    assert first[0] == [{"id": 3, "title": "Home 2"}, {"id": 2, "title": "Home 1"}]
+    assert property_service.get_properties_page(db, limit=2, fields=("id", "title")) == first
+
+
+def test_lead_pages_follow_created_at_then_id(db):
+    base = datetime(2026, 5, 1, 12, 0, 0)
+    db.add_all([
+        models.Lead(name=f"Lead {i}", phone="9876543210", created_at=base + timedelta(minutes=i % 3))
+        for i in range(6)
+    ])
+    db.add(models.Lead(name="Other", phone="9876543210", status="lost", created_at=base))
+    db.commit()
+
+    first, cursor = lead_service.get_leads_page(db, limit=4, status="new")
+    second, end = lead_service.get_leads_page(db, cursor=cursor, limit=4, status="new")
+
+    assert end is None
+    ordered = [(lead.created_at, lead.id) for lead in first + second]
+    assert ordered == sorted(ordered, reverse=True)
+    assert len(ordered) == 6
+
+
+def test_window_count_returns_page_and_total(db):
+    db.add_all([
+        models.Property(title=f"Home {i}", price="₹10,000/month", city="Gurgaon" if i % 2 else "Delhi")
+        for i in range(9)
+    ])
+    db.commit()
+
+    items, total = property_service.get_properties(db, skip=2, limit=2, city="gurgaon")
+    assert total == 4
+    assert [p.city for p in items] == ["Gurgaon", "Gurgaon"]
+
+    items, total = property_service.get_properties(db, skip=20, limit=2, city="gurgaon")
+    assert items == [] and total == 4
+
+
+def test_total_is_bounded_by_count_cap(db, monkeypatch):
+    from app.core.config import settings
+    from app.services.crud import bounded_count_limit
+
+    monkeypatch.setattr(settings, "LIST_COUNT_CAP", 5)
+    db.add_all([models.Property(title=f"Home {i}", price="₹10,000/month") for i in range(12)])
+    db.commit()
+
+    items, total = property_service.get_properties(db, skip=0, limit=2)
+    assert len(items) == 2
+    assert total == bounded_count_limit(0, 2) == 5
+
+    # Deep pages stay reachable past the cap
+    items, total = property_service.get_properties(db, skip=8, limit=2)
+    assert len(items) == 2 and total == 11
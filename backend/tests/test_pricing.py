@@ -0,0 +1,23 @@
+import pytest
+
+from app.utils.pricing import parse_price
+
+
+@pytest.mark.parametrize("price, expected", [
+    ("₹26,000/month (meals included)", 26000),
+    ("₹10,000/month", 10000),
+    ("1.5L", 150000),
+    ("₹1.2 Lakh/month", 120000),
+    ("45K", 45000),
+    ("45000", 45000),
+    ("₹1,50,000", 150000),
+    ("2 Cr", 20000000),
+    ("Rs. 15000 per month", 15000),
+])
+def test_parse_price(price, expected):
+    assert parse_price(price) == expected
+
+
+@pytest.mark.parametrize("price", [None, "", "Price on request"])
+def test_parse_price_without_number(price):
+    assert parse_price(price) is None
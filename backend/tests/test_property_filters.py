@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import event
+
+from app.database import models
+from app.services.crud import city_filter, property_service
+
+
+@pytest.fixture()
+def db(db):
+    db.add_all([
+        models.Property(title="A", price="₹10,000/month", city="Gurgaon", location="Sector 57"),
+        models.Property(title="B", price="₹10,000/month", city="New Gurgaon", location="Sector 82"),
+        models.Property(title="C", price="₹10,000/month", city="Delhi", location="Saket"),
+    ])
+    db.commit()
+    return db
+
+
+def test_known_city_is_an_exact_match(db):
+    clause = city_filter(db, " gurgaon ")
+    assert "LIKE" not in str(clause).upper()
+
+    items, total = property_service.get_properties(db, city="GURGAON")
+    assert total == 1 and items[0].title == "A"
+
+
+def test_known_city_matches_every_stored_spelling(db):
+    db.add_all([
+        models.Property(title="D", price="₹10,000/month", city="gurgaon"),
+        models.Property(title="E", price="₹10,000/month", city=" GURGAON "),
+    ])
+    db.commit()
+
+    for city in ("Gurgaon", "gurgaon", "GURGAON"):
+        items, total = property_service.get_properties(db, city=city)
+        assert total == 3
+        assert {p.title for p in items} == {"A", "D", "E"}
+
+
+def test_partial_city_is_a_substring_match(db):
+    assert "LIKE" in str(city_filter(db, "gurg")).upper()
+
+    items, total = property_service.get_properties(db, city="gurg")
+    assert total == 2
+    assert property_service.get_properties_count(db, city="gurg") == 2
+
+
+def test_location_substring_filter(db):
+    items, total = property_service.get_properties(db, location="sector")
+    assert {p.title for p in items} == {"A", "B"}
+
+
+def test_facets_count_every_dimension_in_one_pass(db):
+    db.add(models.Property(title="D", price="₹45,000/month", city="Gurgaon",
+                           property_type="villa", bedrooms=3, furnishing="semi-furnished"))
+    db.commit()
+
+    result = property_service.get_property_facets(db, city="gurgaon")
+    facets = result["facets"]
+    assert result["total"] == 2
+    assert facets["property_type"] == [{"value": "apartment", "count": 1}, {"value": "villa", "count": 1}]
+    assert facets["bedrooms"] == [{"value": 3, "count": 1}]
+    assert facets["city"] == [{"value": "Gurgaon", "count": 2}]
+    assert {f["value"]: f["count"] for f in facets["furnishing"]} == {"furnished": 1, "semi-furnished": 1}
+    price = {f["value"]: f["count"] for f in facets["price"] if f["count"]}
+    assert price == {"10k_20k": 1, "30k_50k": 1}
+
+
+def test_price_filters_use_parsed_prices(db):
+    db.add(models.Property(title="D", price="1.5L", city="Delhi"))
+    db.add(models.Property(title="E", price="Price on request", city="Delhi"))
+    db.commit()
+
+    items, total = property_service.get_properties(db, max_price=50000)
+    assert total == 3
+    items, total = property_service.get_properties(db, min_price=100000)
+    assert [p.title for p in items] == ["D"]
+
+
+def test_listings_load_only_card_columns(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    db.expunge_all()
+
+    items = property_service.get_available_properties(db, limit=2)
+    featured = property_service.get_featured_properties(db, limit=2)
+
+    assert [p.title for p in items] == ["C", "B"]
+    assert len(featured) == 2
+    selected = [s.split("FROM")[0] for s in statements]
+    assert len(selected) == 2
+    assert all("description" not in columns and "images" not in columns for columns in selected)
+
+
+def test_batch_lookup_keeps_request_order_and_caches_each_property(db, memory_cache):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    items = property_service.get_properties_by_ids(db, [3, 99, 1, 3])
+    assert [item["title"] for item in items] == ["C", "A"]
+    assert len(statements) == 1
+
+    items = property_service.get_properties_by_ids(db, [1, 2, 3])
+    assert [item["title"] for item in items] == ["A", "B", "C"]
+    assert len(statements) == 2
+    assert " IN " in statements[-1] and statements[-1].count("?") == 1  # Only the miss (2) was fetched
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from app.core import responses
+from app.database import models
+from app.schemas import schemas
+
+
+def orm_property(**fields):
+    return models.Property(
+        id=1, title="Flat", slug="flat", price="₹10,000/month", location="Sector 57", city="Gurgaon",
+        amenities="WiFi", is_available=True, created_at=datetime(2026, 10, 1, 9, 30), **fields,
+    )
+
+
+def test_model_response_matches_default_serialization():
+    prop = orm_property(bedrooms=2)
+    response = responses.model_response(List[schemas.Property], [prop], headers={"X-Next-Cursor": "abc"})
+
+    expected = [schemas.Property.model_validate(prop).model_dump(mode="json")]
+    assert json.loads(response.body) == expected
+    assert response.media_type == "application/json"
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert responses.type_adapter(List[schemas.Property]) is responses.type_adapter(List[schemas.Property])
+
+
+def test_trusted_response_serializes_constructed_models():
+    item = schemas.PropertyBulkResult.model_construct(id=3, slug="loft", created=True)
+    response = responses.trusted_response(List[schemas.PropertyBulkResult], [item])
+    assert json.loads(response.body) == [{"id": 3, "slug": "loft", "created": True}]
+
+
+def test_fast_json_response_falls_back_to_stdlib(monkeypatch):
+    content = {"city": "Gurgaon", "rate": 12.5, "name": "₹"}
+    fast = responses.FastJSONResponse(content).body
+    monkeypatch.setattr(responses, "ORJSON_AVAILABLE", False)
+    assert responses.FastJSONResponse(content).body == fast
+
+
+def test_select_fields_orders_fields_and_rejects_unknown_names():
+    assert responses.select_fields(schemas.Property, None) is None
+    assert responses.select_fields(schemas.Property, "title, latitude,id,title") == ("id", "title", "latitude")
+
+    with pytest.raises(ValueError, match="owner_email"):
+        responses.select_fields(schemas.Property, "title,owner_email")
+
+
+def test_partial_model_serializes_only_selected_fields():
+    fields = responses.select_fields(schemas.Property, "title,price")
+    model = responses.partial_model(schemas.Property, fields)
+    assert model is responses.partial_model(schemas.Property, fields)
+
+    envelope = responses.with_items(schemas.PropertyListResponse, model)
+    response = responses.model_response(envelope, dict(
+        items=[orm_property(bedrooms=2)], total=1, skip=0, limit=1, has_more=False,
+    ))
+    body = json.loads(response.body)
+    assert body["items"] == [{"id": 1, "title": "Flat", "price": "₹10,000/month"}]
+    assert body["total"] == 1
@@ -0,0 +1,85 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import models
+from app.schemas import schemas
+from app.services.crud import property_service
+from app.services.search_engine import PropertySearchEngine, search_engine
+
+
+def make_prop(id, title, city="Gurgaon", **kwargs):
+    fields = dict(location="", area="", amenities="", highlights="", description="",
+                  property_type="apartment", bedrooms=2, is_available=True, price_numeric=None)
+    fields.update(kwargs)
+    return SimpleNamespace(id=id, title=title, city=city, **fields)
+
+
+@pytest.fixture()
+def engine():
+    eng = PropertySearchEngine()
+    eng._built_at = datetime.now()  # Mark as built without a database
+    for prop in [
+        make_prop(1, "Pool Villa", amenities="Gym"),
+        make_prop(2, "Studio", description="a pool nearby", city="Delhi"),
+        make_prop(3, "Co-Living PG", highlights="Meals included", property_type="pg"),
+    ]:
+        eng.index_property(prop)
+    return eng
+
+
+def test_bm25_prefers_title_hits(engine):
+    assert engine.search("pool") == [1, 2]
+    assert engine.search("poo") == [1, 2]
+    assert engine.search("pool gym") == [1]
+    assert engine.search("?!") is None
+
+
+def test_filters_apply_in_memory(engine):
+    assert engine.search("pool", {"city": "delhi"}) == [2]
+    assert engine.search("meals", {"property_type": "pg", "is_available": True}) == [3]
+    assert engine.search("meals", {"property_type": "villa"}) == []
+
+
+def test_incremental_update_and_remove(engine):
+    engine.index_property(make_prop(2, "Studio", description="rooftop terrace", city="Delhi"))
+    assert engine.search("pool") == [1]
+    assert engine.search("rooftop") == [2]
+
+    engine.remove_property(1)
+    assert engine.search("pool") == []
+    assert "gym" not in engine._vocabulary
+
+
+def test_service_uses_memory_engine_when_enabled(monkeypatch):
+    from app.core.config import settings
+
+    db_engine = create_engine("sqlite:///:memory:", echo=False)
+    models.Base.metadata.create_all(db_engine)
+    db = sessionmaker(bind=db_engine)()
+    monkeypatch.setattr(settings, "SEARCH_ENGINE", "memory")
+    monkeypatch.setattr(search_engine, "_built_at", None)
+    try:
+        property_service.create_property(db, schemas.PropertyCreate(title="Lake View", price="₹30,000/month"))
+        assert [p.title for p in property_service.search_properties(db, query_text="lake")] == ["Lake View"]
+
+        # Written after the index was built: picked up incrementally
+        created = property_service.create_property(
+            db, schemas.PropertyCreate(title="Lake Side Studio", price="₹20,000/month")
+        )
+        assert property_service.search_properties_count(db, query_text="lake") == 2
+
+        property_service.hard_delete_property(db, created.id)
+        assert property_service.search_properties_count(db, query_text="lake") == 1
+    finally:
+        db.close()
+        db_engine.dispose()
+
+
+def test_prefix_variants_do_not_stack(engine):
+    engine.index_property(make_prop(4, "Flat", description="parks parking parkway parkside"))
+    engine.index_property(make_prop(5, "Park View"))
+    assert engine.search("park") == [5, 4]
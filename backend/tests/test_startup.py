@@ -0,0 +1,101 @@
+import logging
+import sys
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database import models
+from app.database.setup import ADMIN_EMAIL, ensure_admin_user, migrate
+from app.utils.lazy import lazy_import
+
+import serve
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    migrate(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def test_migrate_creates_schema_and_is_repeatable(engine):
+    assert {"properties", "leads", "users"} <= set(inspect(engine).get_table_names())
+    assert migrate(engine) is True
+
+
+def test_migrate_upgrades_a_database_created_before_the_revisions():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX idx_property_city_key"))
+        conn.execute(text("DROP INDEX ix_properties_geohash"))
+        conn.execute(text("ALTER TABLE properties DROP COLUMN geohash"))
+
+    migrate(engine)
+    schema = inspect(engine)
+    assert "geohash" in {c["name"] for c in schema.get_columns("properties")}
+    with engine.connect() as conn:
+        indexes = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        assert {"idx_property_city_key", "ix_properties_geohash"} <= indexes
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == "011"
+    engine.dispose()
+
+
+def test_admin_user_is_created_once_and_never_rehashed(engine):
+    db = sessionmaker(bind=engine)()
+    try:
+        assert ensure_admin_user(db) == "created"
+        admin = db.query(models.User).filter(models.User.email == ADMIN_EMAIL).one()
+        original_hash = admin.password_hash
+
+        assert ensure_admin_user(db) == "exists"
+        db.refresh(admin)
+        assert admin.password_hash == original_hash
+
+        assert ensure_admin_user(db, reset_password=True) == "reset"
+        db.refresh(admin)
+        assert admin.password_hash != original_hash
+    finally:
+        db.close()
+
+
+def test_lazy_import_defers_until_first_use():
+    sys.modules.pop("colorsys", None)
+    colorsys = lazy_import("colorsys")
+    assert "colorsys" not in sys.modules
+    assert colorsys.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+    assert "colorsys" in sys.modules
+
+    missing = lazy_import("not_an_installed_module")
+    with pytest.raises(ImportError, match="not_an_installed_module is not installed"):
+        missing.anything
+
+
+def test_access_log_lines_drop_the_query_string():
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 1, '%s - "%s %s HTTP/%s" %d',
+        ("10.0.0.1:5000", "GET", "/api/v1/leads/events?ticket=secret", "1.1", 200), None,
+    )
+    assert serve.HideQueryString().filter(record)
+    assert record.getMessage() == '10.0.0.1:5000 - "GET /api/v1/leads/events HTTP/1.1" 200'
+
+
+def test_one_worker_by_default_unless_redis_shares_state(monkeypatch, capsys):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(serve, "_machine_workers", lambda: 4)
+    monkeypatch.setattr(settings, "REDIS_ENABLED", False)
+    assert serve.worker_count() == 1
+    monkeypatch.setattr(settings, "REDIS_ENABLED", True)
+    assert serve.worker_count() == 4
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert serve.worker_count() == 3
+    assert capsys.readouterr().err == ""
+    monkeypatch.setattr(settings, "REDIS_ENABLED", False)
+    assert serve.worker_count() == 3
+    assert "without Redis" in capsys.readouterr().err
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.database import models
+from app.services import stats
+from app.services.crud import property_service, lead_service
+
+
+@pytest.fixture()
+def db(db):
+    old = datetime(2020, 1, 1)
+    db.add_all([
+        models.Property(title="A", price="₹10,000/month", city="Gurgaon", location="Sector 57"),
+        models.Property(title="B", price="₹10,000/month", city="Gurgaon", location="Sector 82", is_available=False),
+        models.Property(title="C", price="₹10,000/month", city="Delhi", location="Saket", property_type="pg"),
+        models.Lead(name="L1", phone="1", status="converted", source="whatsapp"),
+        models.Lead(name="L2", phone="2", status="new", source="website"),
+        models.Lead(name="L3", phone="3", status="new", source="website", created_at=old),
+        models.Lead(name="L4", phone="4", status="lost", source="referral", created_at=old),
+    ])
+    db.commit()
+    return db
+
+
+def count_queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_lead_stats_are_one_scan(db):
+    statements = count_queries(db)
+    agg = stats.lead_stats(db)
+
+    assert len(statements) == 1
+    assert agg.total() == 4
+    assert agg.get("status", "new") == 2
+
+
+def test_lead_service_stats_match_the_table(db):
+    result = lead_service.get_lead_stats(db)
+
+    assert result["total_leads"] == 4
+    assert result["new_leads"] == 2
+    assert result["converted_leads"] == 1
+    assert result["conversion_rate"] == 25.0
+    assert result["by_status"][0] == {"status": "new", "count": 2}
+    assert {s["source"]: s["count"] for s in result["by_source"]} == {"whatsapp": 1, "website": 2, "referral": 1}
+
+
+def test_measures_are_conditional_aggregates(db):
+    since = datetime.now() - timedelta(days=30)
+    agg = stats.aggregate(db, {"status": models.Lead.status}, {"in_period": models.Lead.created_at >= since})
+    assert agg.total() == 4
+    assert agg.total("in_period") == 2
+    assert dict(agg.by("status", measure="in_period")) == {("new",): 1, ("converted",): 1, ("lost",): 0}
+
+
+def test_property_stats_are_one_scan(db):
+    statements = count_queries(db)
+    result = property_service.get_property_stats(db)
+
+    assert len(statements) == 1
+    assert result["total_properties"] == 3
+    assert result["available_properties"] == 2
+    assert result["rented_properties"] == 1
+    assert result["top_locations"] == [{"city": "Gurgaon", "count": 2}, {"city": "Delhi", "count": 1}]
+    assert {t["type"]: t["count"] for t in result["property_types"]} == {"apartment": 2, "pg": 1}
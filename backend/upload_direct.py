@@ -37,6 +37,8 @@ def upload_csv_direct(csv_file: str):
                         location=row['location'],
                         area=row['area'],
                         city=row['city'],
+                        latitude=float(row['latitude']) if row.get('latitude') else None,
+                        longitude=float(row['longitude']) if row.get('longitude') else None,
                         property_type=row['property_type'],
                         bedrooms=int(row['bedrooms']) if row['bedrooms'] else None,
                         bathrooms=int(row['bathrooms']) if row['bathrooms'] else None,
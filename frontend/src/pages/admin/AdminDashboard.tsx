@@ -66,6 +66,9 @@ interface Property {
   created_at: string
 }
 
+// Properties per list request (the API's MAX_PAGE_SIZE)
+const PAGE_SIZE = 50
+
 interface AdminStats {
   total_properties: number
   available_properties: number
@@ -103,18 +106,42 @@ export default function AdminDashboard() {
     }
   }, [navigate])
 
-  // Fetch properties
+  // Fetch properties: every cursor page, PAGE_SIZE at a time
   const fetchProperties = async () => {
     try {
-      const response = await fetch(`${API_BASE}/api/v1/properties?limit=100`, {
+      const items: Property[] = []
+      let cursor: string | null = null
+      do {
+        const query: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''
+        const response = await fetch(`${API_BASE}/api/v1/properties?limit=${PAGE_SIZE}${query}`, {
+          headers: {
+            'Authorization': `Bearer ${getToken()}`
+          }
+        })
+        if (!response.ok) throw new Error(`Failed to fetch properties (${response.status})`)
+        const data = await response.json()
+        items.push(...(data.items || []))
+        cursor = data.next_cursor
+      } while (cursor)
+      setProperties(items)
+    } catch (error) {
+      console.error('Error fetching properties:', error)
+    }
+  }
+
+  // Edit property: list items are property cards (no description, highlights,
+  // furnishing...), so load the full property before filling the form
+  const editProperty = async (propertyId: number) => {
+    try {
+      const response = await fetch(`${API_BASE}/api/v1/properties/${propertyId}`, {
         headers: {
           'Authorization': `Bearer ${getToken()}`
         }
       })
-      const data = await response.json()
-      setProperties(data.items || [])
+      if (!response.ok) throw new Error(`Failed to load property (${response.status})`)
+      setEditingProperty(await response.json())
     } catch (error) {
-      console.error('Error fetching properties:', error)
+      showNotification('error', 'Failed to load property')
     }
   }
 
@@ -447,7 +474,7 @@ export default function AdminDashboard() {
                   {/* Actions */}
                   <div className="flex items-center gap-2 pt-3 border-t border-gray-100">
                     <button
-                      onClick={() => setEditingProperty(property)}
+                      onClick={() => editProperty(property.id)}
                       className="flex-1 flex items-center justify-center gap-1 px-3 py-2 text-sm text-indigo-600 hover:bg-indigo-50 rounded-lg transition-colors"
                     >
                       <Edit2 className="h-4 w-4" />
@@ -518,7 +545,7 @@ export default function AdminDashboard() {
                     <td className="px-4 py-4">
                       <div className="flex items-center gap-2">
                         <button
-                          onClick={() => setEditingProperty(property)}
+                          onClick={() => editProperty(property.id)}
                           className="p-2 text-indigo-600 hover:bg-indigo-50 rounded-lg transition-colors"
                         >
                           <Edit2 className="h-4 w-4" />